@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 
 from config import DATABASE_URL
+from database.database import async_database_url
 from database.models import Base
 
 # this is the Alembic Config object, which provides
@@ -17,6 +18,9 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# Online migrations run on the async engine, so use the asyncio driver
+config.set_main_option("sqlalchemy.url", async_database_url(DATABASE_URL).replace("%", "%%"))
+
 # add your model's MetaData object here
 # for 'autogenerate' support
 target_metadata = Base.metadata
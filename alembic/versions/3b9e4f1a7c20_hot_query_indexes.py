@@ -0,0 +1,55 @@
+"""Add indexes for hot queries
+
+Indexes are built with CREATE INDEX CONCURRENTLY outside the migration
+transaction, so they can be applied to a live database without locking
+writes. Tables are expected to exist already, as created by create_all.
+Indexes that create_all already made are skipped, so the migration also
+applies to a database created from the current models.
+
+Revision ID: 3b9e4f1a7c20
+Revises: 5d2a7c9e4b18
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e4f1a7c20'
+down_revision: Union[str, None] = '5d2a7c9e4b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_users_engagement_score', 'users', ['engagement_score']),
+    ('ix_matches_receiver_status', 'matches', ['receiver_id', 'status']),
+    ('ix_matches_sender_created_at', 'matches', ['sender_id', 'created_at']),
+    ('ix_confessions_status_created_at', 'confessions', ['status', sa.text('created_at DESC')]),
+    ('ix_confessions_user_created_at', 'confessions', ['user_id', 'created_at']),
+    ('ix_reports_status', 'reports', ['status']),
+    ('ix_reports_reported_id', 'reports', ['reported_id']),
+    ('ix_profiles_gender_university_age', 'profiles', ['gender', 'university', 'age']),
+]
+
+
+def existing_indexes(table: str) -> set:
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            if name not in existing_indexes(table):
+                op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            if name in existing_indexes(table):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,49 @@
+"""Add user engagement columns
+
+Adds the like and skip counters and the smoothed engagement score used as
+a ranking term. Columns that create_all already made are skipped.
+
+Databases upgraded before this revision was split out of 3b9e4f1a7c20
+already have the columns, so applying it to them is a no-op.
+
+Revision ID: 5d2a7c9e4b18
+Revises: 
+Create Date: 2026-10-17 08:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2a7c9e4b18'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def user_columns() -> list:
+    return [
+        sa.Column('likes_received', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('skips_received', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('engagement_score', sa.Float(), nullable=True),
+    ]
+
+
+def existing_columns(table: str) -> set:
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade() -> None:
+    # Constant defaults make these column additions metadata-only on PostgreSQL 11+
+    for column in user_columns():
+        if column.name not in existing_columns('users'):
+            op.add_column('users', column)
+
+
+def downgrade() -> None:
+    for column in reversed(user_columns()):
+        if column.name in existing_columns('users'):
+            op.drop_column('users', column.name)
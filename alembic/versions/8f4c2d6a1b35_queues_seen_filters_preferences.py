@@ -0,0 +1,115 @@
+"""Add recommendation queues, seen filters and profile match preferences
+
+Creates the recommendation_queues and seen_filters tables and the profile
+preference columns, and backfills created_at on the paged tables so every
+row has a keyset position. Tables, columns and indexes that create_all
+already made are skipped.
+
+Revision ID: 8f4c2d6a1b35
+Revises: 3b9e4f1a7c20
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from database.models import University
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f4c2d6a1b35'
+down_revision: Union[str, None] = '3b9e4f1a7c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, columns) of recommendation_queues
+QUEUE_INDEXES = [
+    ('ix_recommendation_queues_user_position', ['user_id', 'position']),
+    ('ix_recommendation_queues_candidate_id', ['candidate_id']),
+]
+
+# Tables read by the keyset-paginated getters
+PAGED_TABLES = ['matches', 'confessions', 'reports']
+
+
+def profile_columns() -> list:
+    return [
+        sa.Column('preferred_age_min', sa.Integer(), nullable=True),
+        sa.Column('preferred_age_max', sa.Integer(), nullable=True),
+        # The enum type already exists for profiles.university
+        sa.Column('preferred_university', sa.Enum(University), nullable=True),
+    ]
+
+
+def existing_tables() -> set:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def existing_columns(table: str) -> set:
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def existing_indexes(table: str) -> set:
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    tables = existing_tables()
+
+    if 'recommendation_queues' not in tables:
+        op.create_table(
+            'recommendation_queues',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+            sa.Column('candidate_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+            sa.Column('position', sa.Integer(), nullable=False),
+            sa.Column('score', sa.Float(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.UniqueConstraint('user_id', 'candidate_id', name='unique_recommendation'),
+        )
+
+    if 'seen_filters' not in tables:
+        op.create_table(
+            'seen_filters',
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), primary_key=True),
+            sa.Column('data', sa.LargeBinary(), nullable=False),
+            sa.Column('item_count', sa.Integer(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+        )
+
+    for column in profile_columns():
+        if column.name not in existing_columns('profiles'):
+            op.add_column('profiles', column)
+
+    # Rows without created_at are left out of keyset pages
+    now = datetime.utcnow()
+    for name in PAGED_TABLES:
+        table = sa.table(name, sa.column('created_at', sa.DateTime()), sa.column('updated_at', sa.DateTime()))
+        op.execute(
+            table.update()
+            .where(table.c.created_at.is_(None))
+            .values(created_at=sa.func.coalesce(table.c.updated_at, now))
+        )
+
+    # Queues created before the candidate index existed get it without locking writes
+    with op.get_context().autocommit_block():
+        for name, columns in QUEUE_INDEXES:
+            if name not in existing_indexes('recommendation_queues'):
+                op.create_index(name, 'recommendation_queues', columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    tables = existing_tables()
+
+    for column in reversed(profile_columns()):
+        if column.name in existing_columns('profiles'):
+            op.drop_column('profiles', column.name)
+
+    if 'seen_filters' in tables:
+        op.drop_table('seen_filters')
+
+    if 'recommendation_queues' in tables:
+        op.drop_table('recommendation_queues')
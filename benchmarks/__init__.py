@@ -0,0 +1 @@
+"""Match engine benchmark package initialization."""
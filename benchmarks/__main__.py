@@ -0,0 +1,52 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime
+
+DEFAULT_SIZES = "1000,10000,100000,1000000"
+
+def main() -> None:
+    """Benchmark the match engine at several population sizes and write JSON results.
+
+    Each size runs in its own process so in-memory indexes and caches start
+    empty and memory is released between sizes.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the match engine.")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help="Comma-separated population sizes")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--samples', type=int, default=20, help="Sampled users per timed operation")
+    parser.add_argument('--database-url', default='sqlite:///benchmark.db')
+    parser.add_argument('--output', help="Write results to this file instead of stdout")
+    args = parser.parse_args()
+
+    results = []
+    for size in (int(size) for size in args.sizes.split(',') if size):
+        print(f"Benchmarking {size} users...", file=sys.stderr)
+        completed = subprocess.run(
+            [
+                sys.executable, '-m', 'benchmarks.match_engine',
+                '--size', str(size), '--seed', str(args.seed),
+                '--samples', str(args.samples), '--database-url', args.database_url
+            ],
+            stdout=subprocess.PIPE,
+            check=True
+        )
+        results.append(json.loads(completed.stdout))
+
+    report = {
+        'generated_at': datetime.utcnow().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'database_url': args.database_url.split('@')[-1],
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+# Placeholders so ``config`` imports outside a deployment; real values win
+BENCHMARK_ENVIRONMENT = {
+    'BOT_TOKEN': 'benchmark',
+    'OFFICIAL_CHANNEL': '@benchmark_official',
+    'CONFESSION_CHANNEL': '@benchmark_confessions',
+    'ADMIN_IDS': '1'
+}
+
+def configure_environment(database_url: str) -> None:
+    """Point the app configuration at the benchmark database.
+
+    Must run before any app module is imported.
+
+    Args:
+        database_url: SQLAlchemy database URL
+    """
+    os.environ['DATABASE_URL'] = database_url
+    for key, value in BENCHMARK_ENVIRONMENT.items():
+        os.environ.setdefault(key, value)
+
+def summarize(durations: List[float]) -> Dict[str, float]:
+    """Summarize call durations in milliseconds."""
+    durations_ms = sorted(duration * 1000 for duration in durations)
+    return {
+        'runs': len(durations_ms),
+        'mean_ms': statistics.fmean(durations_ms),
+        'median_ms': statistics.median(durations_ms),
+        'p95_ms': durations_ms[min(len(durations_ms) - 1, int(len(durations_ms) * 0.95))],
+        'min_ms': durations_ms[0],
+        'max_ms': durations_ms[-1]
+    }
+
+def timed(function: Callable, *args) -> float:
+    """Run a function once and return its duration in seconds."""
+    started = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started
+
+class _FakeBot:
+    """Bot stand-in whose API calls do nothing."""
+
+    def __getattr__(self, name):
+        async def call(*args, **kwargs):
+            return None
+        return call
+
+class _FakeMessage:
+    """Message stand-in for the chat a match card is sent to."""
+
+    def __init__(self, chat_id: int, bot: _FakeBot):
+        self.chat = SimpleNamespace(id=chat_id)
+        self.bot = bot
+
+    async def answer(self, *args, **kwargs):
+        return None
+
+    async def answer_photo(self, *args, **kwargs):
+        return None
+
+class _FakeCallback:
+    """Callback query stand-in for a like/skip button press."""
+
+    def __init__(self, data: str, telegram_id: int, bot: _FakeBot):
+        self.data = data
+        self.from_user = SimpleNamespace(id=telegram_id)
+        self.bot = bot
+        self.message = _FakeMessage(telegram_id, bot)
+
+    async def answer(self, *args, **kwargs):
+        return None
+
+async def _time_match_choices(actors, feeds: Dict[int, List[int]]) -> List[float]:
+    from aiogram.fsm.context import FSMContext
+    from aiogram.fsm.storage.base import StorageKey
+    from aiogram.fsm.storage.memory import MemoryStorage
+
+    from database.connection import async_db
+    from handlers.match import process_match_choice
+
+    storage = MemoryStorage()
+    bot = _FakeBot()
+    durations = []
+    for position, actor in enumerate(actors):
+        feed = feeds.get(actor.id)
+        if not feed:
+            continue
+        state = FSMContext(
+            storage=storage,
+            key=StorageKey(bot_id=0, chat_id=actor.telegram_id, user_id=actor.telegram_id)
+        )
+        await state.set_data({
+            'user_id': actor.id,
+            'match_ids': feed[1:],
+            'match_cursor': 0,
+            'feed_exhausted': True
+        })
+        action = 'like' if position % 2 == 0 else 'skip'
+        callback = _FakeCallback(f"{action}:{feed[0]}", actor.telegram_id, bot)
+
+        # One session per update, as DatabaseMiddleware provides
+        started = time.perf_counter()
+        async with async_db.get_session() as session:
+            await process_match_choice(callback, state, session)
+        durations.append(time.perf_counter() - started)
+    await async_db.dispose()
+    return durations
+
+def run(size: int, seed: int, samples: int) -> Dict:
+    """Benchmark the match engine against a freshly loaded population.
+
+    Args:
+        size: Number of synthetic users
+        seed: Random seed for the population and the sampled users
+        samples: Number of sampled users per timed operation
+
+    Returns:
+        Timings for this population size
+    """
+    from database.database import get_database, get_session
+    from database.models import Base, User
+    from handlers.match import calculate_match_score, get_potential_matches
+    from matching.decisions import decision_buffer
+    from matching.index import candidate_index, hobby_index
+    from matching.likes import like_index, pending_likes
+    from matching.scoring import bio_similarity
+    from .population import load_population
+
+    database = get_database()
+    Base.metadata.drop_all(database.engine)
+    Base.metadata.create_all(database.engine)
+
+    result = {'users': size, 'seed': seed}
+    with database.get_session() as session:
+        result['load_seconds'] = timed(load_population, session, size, seed)
+
+    with get_session() as session:
+        started = time.perf_counter()
+        candidate_index.build(session)
+        hobby_index.build(session)
+        bio_similarity.build(session)
+        asyncio.run(like_index.build(pending_likes(session)))
+        result['index_build_seconds'] = time.perf_counter() - started
+
+    rng = random.Random(seed)
+    sample_ids = rng.sample(range(1, size + 1), min(samples, size))
+    operations = {}
+    with get_session() as session:
+        actors = session.query(User).filter(User.id.in_(sample_ids)).all()
+        partners = session.query(User).filter(
+            User.id.in_(rng.sample(range(1, size + 1), min(samples, size)))
+        ).all()
+
+        operations['calculate_match_score'] = summarize([
+            timed(calculate_match_score, actor, partner)
+            for actor in actors for partner in partners
+        ])
+
+        feeds = {}
+        durations = []
+        for actor in actors:
+            started = time.perf_counter()
+            matches = get_potential_matches(session, actor)
+            durations.append(time.perf_counter() - started)
+            feeds[actor.id] = [match.id for match in matches]
+        operations['get_potential_matches'] = summarize(durations)
+        result['empty_feeds'] = sum(1 for feed in feeds.values() if not feed)
+
+    durations = asyncio.run(_time_match_choices(actors, feeds))
+    if durations:
+        operations['process_match_choice'] = summarize(durations)
+    pending = len(decision_buffer)
+    operations['decision_flush'] = dict(summarize([timed(decision_buffer.flush_events)]), decisions=pending)
+
+    result['operations'] = operations
+    return result
+
+def main() -> None:
+    """Benchmark one population size and print the result as JSON."""
+    parser = argparse.ArgumentParser(description="Benchmark the match engine at one population size.")
+    parser.add_argument('--size', type=int, required=True)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--samples', type=int, default=20)
+    parser.add_argument('--database-url', default='sqlite:///benchmark.db')
+    args = parser.parse_args()
+
+    configure_environment(args.database_url)
+    json.dump(run(args.size, args.seed, args.samples), sys.stdout)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import random
+from typing import Dict, Iterator, List, Tuple
+
+from config import MIN_AGE, MAX_AGE
+from database.models import Gender, University
+
+BIO_VOCABULARY = [
+    "love", "music", "coffee", "books", "football", "engineering", "medicine",
+    "friends", "family", "travel", "movies", "art", "faith", "church", "mosque",
+    "food", "injera", "buna", "ethiopia", "addis", "campus", "study", "student",
+    "software", "design", "photography", "fashion", "poetry", "history",
+    "nature", "hiking", "running", "gym", "dance", "singing", "guitar",
+    "kind", "funny", "quiet", "honest", "ambitious", "curious", "calm",
+    "looking", "for", "someone", "who", "likes", "to", "laugh", "talk",
+    "the", "a", "and", "i", "am", "my", "with", "in", "of"
+]
+
+HOBBY_VOCABULARY = [
+    "reading", "music", "football", "basketball", "chess", "dancing", "cooking",
+    "photography", "painting", "writing", "hiking", "swimming", "running",
+    "movies", "gaming", "coding", "singing", "traveling", "volunteering",
+    "fashion", "poetry", "drawing", "cycling", "volleyball", "table tennis",
+    "church choir", "language learning", "podcasts", "gardening", "theatre"
+]
+
+FIRST_NAMES = [
+    "Abebe", "Almaz", "Bethlehem", "Biniam", "Dawit", "Eden", "Elias", "Feven",
+    "Girma", "Hana", "Hiwot", "Kalkidan", "Kidus", "Liya", "Meron", "Mulugeta",
+    "Nahom", "Rahel", "Samuel", "Selam", "Tewodros", "Tigist", "Yonas", "Zewdu"
+]
+
+def _zipf_weights(size: int) -> List[float]:
+    """Weights giving earlier vocabulary entries a Zipf-like popularity."""
+    return [1.0 / rank for rank in range(1, size + 1)]
+
+def generate_population(
+    size: int,
+    seed: int = 0,
+    female_ratio: float = 0.5,
+    unfiltered_ratio: float = 0.4
+) -> Iterator[Tuple[Dict, Dict]]:
+    """Generate synthetic user rows shaped like the profiles the bot creates.
+
+    Args:
+        size: Number of users
+        seed: Random seed, so runs are reproducible
+        female_ratio: Share of female users; a small share is ``other``
+        unfiltered_ratio: Share of users without age or university preferences
+
+    Yields:
+        Column mappings for a ``User`` row and its ``Profile`` row
+    """
+    rng = random.Random(seed)
+    universities = list(University)
+    university_weights = _zipf_weights(len(universities))
+    bio_weights = _zipf_weights(len(BIO_VOCABULARY))
+    hobby_weights = _zipf_weights(len(HOBBY_VOCABULARY))
+
+    for user_id in range(1, size + 1):
+        draw = rng.random()
+        if draw < 0.02:
+            gender = Gender.OTHER
+        elif draw < 0.02 + female_ratio * 0.98:
+            gender = Gender.FEMALE
+        else:
+            gender = Gender.MALE
+
+        age = int(round(rng.triangular(MIN_AGE, MAX_AGE, MIN_AGE + 3)))
+        university = rng.choices(universities, university_weights)[0]
+        bio = " ".join(rng.choices(BIO_VOCABULARY, bio_weights, k=rng.randint(3, 25)))
+        hobbies = ",".join(sorted(set(rng.choices(HOBBY_VOCABULARY, hobby_weights, k=rng.randint(1, 6)))))
+
+        user = {
+            'id': user_id,
+            'telegram_id': 10 ** 9 + user_id,
+            'username': f"bench_user_{user_id}",
+            'first_name': rng.choice(FIRST_NAMES),
+            'last_name': None
+        }
+        profile = {
+            'id': user_id,
+            'user_id': user_id,
+            'age': age,
+            'gender': gender,
+            'university': university,
+            'bio': bio,
+            'hobbies': hobbies,
+            'photo_id': None,
+            'preferred_age_min': None,
+            'preferred_age_max': None,
+            'preferred_university': None,
+            'is_visible': True
+        }
+        if rng.random() >= unfiltered_ratio:
+            profile['preferred_age_min'] = max(MIN_AGE, age - rng.randint(1, 4))
+            profile['preferred_age_max'] = min(MAX_AGE, age + rng.randint(1, 4))
+            if rng.random() < 0.3:
+                profile['preferred_university'] = university
+        yield user, profile
+
+def load_population(session, size: int, seed: int = 0, batch_size: int = 10000) -> int:
+    """Insert a synthetic population with multi-row inserts.
+
+    Args:
+        session: SQLAlchemy session
+        size: Number of users
+        seed: Random seed
+        batch_size: Rows per insert
+
+    Returns:
+        Number of users inserted
+    """
+    from database.models import Profile, User
+
+    users, profiles = [], []
+    for user, profile in generate_population(size, seed):
+        users.append(user)
+        profiles.append(profile)
+        if len(users) >= batch_size:
+            session.bulk_insert_mappings(User, users)
+            session.bulk_insert_mappings(Profile, profiles)
+            session.flush()
+            users, profiles = [], []
+    if users:
+        session.bulk_insert_mappings(User, users)
+        session.bulk_insert_mappings(Profile, profiles)
+    return size
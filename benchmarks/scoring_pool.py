@@ -0,0 +1,94 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from .match_engine import configure_environment, summarize
+
+DEFAULT_SIZES = "2000,20000,200000"
+WEIGHTS = {"age": 0.3, "university": 0.2, "bio": 0.25, "hobbies": 0.25, "engagement": 0.1}
+
+def random_features(size: int, rng: np.random.Generator):
+    """Build candidate feature arrays shaped like the synthetic population's."""
+    from matching.scoring import CandidateFeatures
+
+    return CandidateFeatures.from_token_ids(
+        ages=rng.integers(18, 31, size).tolist(),
+        universities=[None] * size,
+        engagement=rng.random(size).tolist(),
+        bio_ids=[rng.integers(0, 2000, rng.integers(3, 26)).tolist() for _ in range(size)],
+        hobby_ids=[rng.integers(0, 30, rng.integers(1, 7)).tolist() for _ in range(size)]
+    )
+
+async def _time_with_loop_lag(score, runs: int) -> Dict:
+    """Time scoring calls made from an executor thread while the event loop ticks every millisecond."""
+    loop = asyncio.get_running_loop()
+    lags: List[float] = []
+    running = True
+
+    async def tick():
+        while running:
+            started = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - started - 0.001)
+
+    ticker = asyncio.create_task(tick())
+    durations = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await loop.run_in_executor(None, score)
+        durations.append(time.perf_counter() - started)
+    running = False
+    await ticker
+    return dict(summarize(durations), loop_lag=summarize(lags))
+
+def run(sizes: List[int], workers: int, runs: int, seed: int) -> Dict:
+    """Compare inline and pooled scoring of one candidate batch per size.
+
+    Args:
+        sizes: Candidate batch sizes
+        workers: Worker processes of the pooled variant
+        runs: Timed calls per size and variant
+        seed: Random seed for the candidate features
+
+    Returns:
+        Timings per size for both variants
+    """
+    from matching.scoring import ScoringPool
+
+    rng = np.random.default_rng(seed)
+    results = []
+    for size in sizes:
+        features = random_features(size, rng)
+        bio_scores = rng.random(size)
+        hobby_ids = np.array([1, 2, 3], dtype=np.int64)
+        result = {'candidates': size}
+        for name, pool in (('inline', ScoringPool(workers=0)), ('pooled', ScoringPool(workers=workers, threshold=1))):
+            def score():
+                pool.score(20, 1, hobby_ids, bio_scores, features, WEIGHTS)
+            score()  # Start the workers outside the timed runs
+            result[name] = asyncio.run(_time_with_loop_lag(score, runs))
+            pool.shutdown()
+        results.append(result)
+    return {'workers': workers, 'cpus': os.cpu_count(), 'results': results}
+
+def main() -> None:
+    """Benchmark inline against pooled scoring and print the result as JSON."""
+    parser = argparse.ArgumentParser(description="Compare inline and process pool match scoring.")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help="Comma-separated candidate batch sizes")
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    configure_environment(os.environ.get('DATABASE_URL', 'sqlite://'))
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    json.dump(run(sizes, args.workers, args.runs, args.seed), sys.stdout, indent=2)
+
+if __name__ == "__main__":
+    main()
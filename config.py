@@ -3,6 +3,8 @@ from dotenv import load_dotenv
 import logging
 from typing import List, Dict, Any
 
+from universities import ETHIOPIAN_UNIVERSITIES
+
 # Load environment variables
 load_dotenv()
 
@@ -30,6 +32,39 @@ MAX_CONFESSION_LENGTH = 1000
 MAX_BIO_LENGTH = 500
 MAX_HOBBIES_LENGTH = 200
 
+# Matching Configuration
+BIO_SIMILARITY_BACKEND = os.getenv("BIO_SIMILARITY_BACKEND", "overlap")  # overlap or minhash
+RANKING_BACKEND = os.getenv("RANKING_BACKEND", "python")  # python or sql
+MATCH_SCORE_WEIGHTS = {
+    "age": 0.3,
+    "university": 0.2,
+    "bio": 0.25,
+    "hobbies": 0.25,
+    "engagement": 0.1  # candidate's smoothed like rate
+}
+ENGAGEMENT_PRIOR_LIKES = float(os.getenv("ENGAGEMENT_PRIOR_LIKES", "1"))
+ENGAGEMENT_PRIOR_SKIPS = float(os.getenv("ENGAGEMENT_PRIOR_SKIPS", "4"))
+MATCH_DIVERSITY = float(os.getenv("MATCH_DIVERSITY", "0.3"))  # 0 keeps pure score order
+DIVERSITY_POOL_FACTOR = int(os.getenv("DIVERSITY_POOL_FACTOR", "3"))  # candidates re-ranked per page slot
+SCORING_POOL_WORKERS = int(os.getenv("SCORING_POOL_WORKERS", "0"))  # 0 scores everything inline
+SCORING_POOL_THRESHOLD = int(os.getenv("SCORING_POOL_THRESHOLD", "20000"))  # candidates per pooled batch, full scans only
+RECOMMENDATION_QUEUE_SIZE = int(os.getenv("RECOMMENDATION_QUEUE_SIZE", "50"))
+RECOMMENDATION_QUEUE_LOW_WATERMARK = int(os.getenv("RECOMMENDATION_QUEUE_LOW_WATERMARK", "10"))
+RECOMMENDATION_REFRESH_INTERVAL = int(os.getenv("RECOMMENDATION_REFRESH_INTERVAL", "60"))  # seconds
+SEEN_FILTER_CAPACITY = int(os.getenv("SEEN_FILTER_CAPACITY", "512"))  # IDs in the first filter layer
+SEEN_FILTER_ERROR_RATE = float(os.getenv("SEEN_FILTER_ERROR_RATE", "0.01"))
+LIKE_INDEX_BACKEND = os.getenv("LIKE_INDEX_BACKEND", "memory")  # memory or redis
+DECISION_FLUSH_INTERVAL_MS = int(os.getenv("DECISION_FLUSH_INTERVAL_MS", "200"))
+DECISION_FLUSH_SIZE = int(os.getenv("DECISION_FLUSH_SIZE", "100"))  # pending likes/skips that force a flush
+
+# Daily Limits
+DAILY_MATCH_LIMIT = int(os.getenv("DAILY_MATCH_LIMIT", "20"))
+DAILY_CONFESSION_LIMIT = int(os.getenv("DAILY_CONFESSION_LIMIT", "3"))
+MATCH_COOLDOWN_HOURS = int(os.getenv("MATCH_COOLDOWN_HOURS", "24"))
+LIMIT_STORE = os.getenv("LIMIT_STORE", "local")  # local or redis
+LIMIT_FLUSH_INTERVAL = int(os.getenv("LIMIT_FLUSH_INTERVAL", "30"))  # seconds
+REDIS_URL = os.getenv("REDIS_URL")
+
 # Age Restrictions
 MIN_AGE = 18
 MAX_AGE = 30
@@ -49,6 +84,10 @@ PORT = int(os.getenv("PORT", "8000"))
 
 # Cache Configuration
 CACHE_TTL = int(os.getenv("CACHE_TTL", "3600"))  # 1 hour
+FEATURE_CACHE_MAX_BYTES = int(os.getenv("FEATURE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # 64 MB
+PROFILE_CACHE_SIZE = int(os.getenv("PROFILE_CACHE_SIZE", "10000"))
+SEEN_FILTER_CACHE_SIZE = int(os.getenv("SEEN_FILTER_CACHE_SIZE", "10000"))
+SCORE_CACHE_SIZE = int(os.getenv("SCORE_CACHE_SIZE", "200000"))  # cached pairwise scores
 
 # Security Configuration
 ALLOWED_UPDATES = ["message", "callback_query", "my_chat_member"]
@@ -106,6 +145,8 @@ Other Commands:
     
     "error": "An error occurred. Please try again later.",
     
+    "report_submitted": "Thank you! Your report has been submitted and will be reviewed by our admins.",
+    
     "validation": {
         "age": "Age must be between 18 and 30.",
         "bio": f"Bio must be between 1 and {MAX_BIO_LENGTH} characters.",
@@ -122,7 +163,16 @@ ERROR_MESSAGES = {
     "channel_error": "Error verifying channel membership. Please try again later.",
     "match_error": "Error processing match. Please try again later.",
     "confession_error": "Error processing confession. Please try again later.",
-    "server_error": "Server error occurred. Please try again later."
+    "report_error": "Error processing report. Please try again later.",
+    "server_error": "Server error occurred. Please try again later.",
+    "profile_required": "Please create your profile first using /profile.",
+    "invalid_input": "Invalid input. Please try again.",
+    "invalid_age": f"Age must be between {MIN_AGE} and {MAX_AGE}.",
+    "invalid_gender": "Please choose a gender from the list.",
+    "invalid_university": "Please choose a university from the list.",
+    "bio_too_long": f"Bio must be at most {MAX_BIO_LENGTH} characters.",
+    "hobbies_too_long": f"Hobbies must be at most {MAX_HOBBIES_LENGTH} characters.",
+    "confession_too_long": f"Confession must be at most {MAX_CONFESSION_LENGTH} characters."
 }
 
 def validate_config() -> None:
@@ -139,8 +189,48 @@ def validate_config() -> None:
         raise ValueError("Age limits must be between 18 and 30")
     if MAX_CONFESSION_LENGTH < 1 or MAX_BIO_LENGTH < 1 or MAX_HOBBIES_LENGTH < 1:
         raise ValueError("Content length limits must be positive")
+    if BIO_SIMILARITY_BACKEND not in ("overlap", "minhash"):
+        raise ValueError("Bio similarity backend must be 'overlap' or 'minhash'")
+    if RANKING_BACKEND not in ("python", "sql"):
+        raise ValueError("Ranking backend must be 'python' or 'sql'")
+    if any(weight < 0 for weight in MATCH_SCORE_WEIGHTS.values()):
+        raise ValueError("Match score weights must be non-negative")
+    if ENGAGEMENT_PRIOR_LIKES <= 0 or ENGAGEMENT_PRIOR_SKIPS <= 0:
+        raise ValueError("Engagement priors must be positive")
+    if not 0 <= MATCH_DIVERSITY <= 1 or DIVERSITY_POOL_FACTOR < 1:
+        raise ValueError("Match diversity must be between 0 and 1 and pool factor positive")
+    if SCORING_POOL_WORKERS < 0 or SCORING_POOL_THRESHOLD < 1:
+        raise ValueError("Scoring pool workers must be non-negative and threshold positive")
+    if RECOMMENDATION_QUEUE_SIZE < 1 or RECOMMENDATION_QUEUE_LOW_WATERMARK < 0:
+        raise ValueError("Recommendation queue sizes must be positive")
+    if RECOMMENDATION_REFRESH_INTERVAL < 1:
+        raise ValueError("Recommendation refresh interval must be positive")
+    if SEEN_FILTER_CAPACITY < 1 or not 0 < SEEN_FILTER_ERROR_RATE < 1:
+        raise ValueError("Seen filter capacity must be positive and error rate between 0 and 1")
+    if LIKE_INDEX_BACKEND not in ("memory", "redis"):
+        raise ValueError("Like index backend must be 'memory' or 'redis'")
+    if LIKE_INDEX_BACKEND == "redis" and not REDIS_URL:
+        raise ValueError("REDIS_URL is required for the redis like index")
+    if DECISION_FLUSH_INTERVAL_MS < 1 or DECISION_FLUSH_SIZE < 1:
+        raise ValueError("Decision flush interval and size must be positive")
+    if DAILY_MATCH_LIMIT < 1 or DAILY_CONFESSION_LIMIT < 1 or MATCH_COOLDOWN_HOURS < 0:
+        raise ValueError("Daily limits must be positive and match cooldown non-negative")
+    if LIMIT_STORE not in ("local", "redis"):
+        raise ValueError("Limit store must be 'local' or 'redis'")
+    if LIMIT_STORE == "redis" and not REDIS_URL:
+        raise ValueError("REDIS_URL is required for the redis limit store")
+    if LIMIT_FLUSH_INTERVAL < 1:
+        raise ValueError("Limit flush interval must be positive")
     if CACHE_TTL < 0:
         raise ValueError("Cache TTL must be non-negative")
+    if FEATURE_CACHE_MAX_BYTES < 1:
+        raise ValueError("Feature cache size must be positive")
+    if PROFILE_CACHE_SIZE < 1:
+        raise ValueError("Profile cache size must be positive")
+    if SEEN_FILTER_CACHE_SIZE < 1:
+        raise ValueError("Seen filter cache size must be positive")
+    if SCORE_CACHE_SIZE < 1:
+        raise ValueError("Score cache size must be positive")
     if MAX_CONNECTIONS < 1:
         raise ValueError("Max connections must be positive")
 
@@ -1 +1,18 @@
- 
\ No newline at end of file
+"""Async database sessions shared by the aiogram middleware."""
+from typing import AsyncGenerator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import DATABASE_URL
+from .database import AsyncDatabase
+
+async_db = AsyncDatabase(DATABASE_URL)
+
+async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    """Yield an async session committed when the caller is done with it.
+
+    Yields:
+        SQLAlchemy async session
+    """
+    async with async_db.get_session() as session:
+        yield session
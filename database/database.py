@@ -1,15 +1,106 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, delete, insert, or_, select, tuple_, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, scoped_session
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from sqlalchemy.exc import SQLAlchemyError
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime
+import base64
+import json
 import logging
-from typing import Generator, Optional
+from typing import AsyncGenerator, AsyncIterator, Generator, Iterable, Optional, Tuple
+from config import DATABASE_URL
 from .models import Base
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Connection pool limits, shared by the sync and async engines
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+
+# Rows per page of the paginated getters
+DEFAULT_PAGE_SIZE = 50
+# Rows buffered per fetch by the streaming getters
+STREAM_BATCH_SIZE = 500
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode a ``(created_at, id)`` keyset as an opaque page cursor."""
+    keyset = json.dumps([created_at.isoformat(), row_id])
+    return base64.urlsafe_b64encode(keyset.encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a page cursor back into its ``(created_at, id)`` keyset.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid page cursor: {cursor!r}") from e
+
+def _status(table_name: str, status):
+    """Coerce a status given by name or value (``"pending"``) to the column's enum member.
+
+    Raises:
+        ValueError: If the status is not one of the column's
+    """
+    enum_class = Base.metadata.tables[table_name].c.status.type.enum_class
+    if isinstance(status, enum_class):
+        return status
+    try:
+        return enum_class(str(status).lower())
+    except ValueError:
+        raise ValueError(f"Unknown {table_name} status: {status!r}") from None
+
+def _filters(table_name: str, user_id: int = None, reported_user_id: int = None, status=None, **filters) -> list:
+    """Build the WHERE criteria of the listing getters from their keyword filters.
+
+    ``user_id`` selects the matches a user sent or received, and
+    ``reported_user_id`` filters reports on ``reported_id``. Any other
+    non-empty value filters the column of the same name.
+    """
+    table = Base.metadata.tables[table_name]
+    criteria = []
+    if user_id and table_name == 'matches':
+        criteria.append(or_(table.c.sender_id == user_id, table.c.receiver_id == user_id))
+    elif user_id:
+        criteria.append(table.c.user_id == user_id)
+    if reported_user_id:
+        criteria.append(table.c.reported_id == reported_user_id)
+    if status:
+        criteria.append(table.c.status == _status(table_name, status))
+    criteria.extend(table.c[column] == value for column, value in filters.items() if value)
+    return criteria
+
+def _filtered_query(table_name: str, **filters):
+    """Select from a table, filtering on every given non-empty value, newest first."""
+    table = Base.metadata.tables[table_name]
+    query = select(table).where(*_filters(table_name, **filters))
+    return query.order_by(table.c.created_at.desc(), table.c.id.desc())
+
+def _page_query(table_name: str, query, cursor: Optional[str], limit: int):
+    """Restrict a newest-first query to the page after a cursor, plus one look-ahead row.
+
+    Rows without ``created_at`` have no keyset position and are left out of pages.
+    """
+    table = Base.metadata.tables[table_name]
+    query = query.where(table.c.created_at.isnot(None))
+    if cursor:
+        query = query.where(tuple_(table.c.created_at, table.c.id) < decode_cursor(cursor))
+    return query.limit(limit + 1)
+
+def _page_result(rows: Iterable, limit: int) -> Tuple[list, Optional[str]]:
+    """Split fetched rows into a page and the cursor of the next page."""
+    page = [dict(row) for row in rows]
+    if len(page) <= limit:
+        return page, None
+    page = page[:limit]
+    return page, encode_cursor(page[-1]['created_at'], page[-1]['id'])
+
 class Database:
     """Database connection and session management."""
     
@@ -22,8 +113,8 @@ class Database:
         self.engine = create_engine(
             database_url,
             poolclass=QueuePool,
-            pool_size=5,
-            max_overflow=10,
+            pool_size=POOL_SIZE,
+            max_overflow=MAX_OVERFLOW,
             pool_timeout=30,
             pool_recycle=1800,
             echo=False
@@ -50,7 +141,8 @@ class Database:
         Yields:
             SQLAlchemy session
         """
-        session = self.Session()
+        # A fresh session per call, so nested get_session() blocks don't close each other's
+        session = self.SessionFactory()
         try:
             yield session
             session.commit()
@@ -72,14 +164,52 @@ class Database:
         """
         try:
             with self.get_session() as session:
-                user = session.query(Base.metadata.tables['users']).filter_by(
-                    telegram_id=telegram_id
-                ).first()
+                user = session.execute(
+                    select(Base.metadata.tables['users']).filter_by(telegram_id=telegram_id)
+                ).mappings().first()
                 return dict(user) if user else None
         except SQLAlchemyError as e:
             logger.error(f"Error getting user by Telegram ID: {e}")
             return None
 
+    def get_user(self, user_id: int) -> Optional[dict]:
+        """Get user by ID.
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            User data dictionary or None if not found
+        """
+        try:
+            with self.get_session() as session:
+                user = session.execute(
+                    select(Base.metadata.tables['users']).filter_by(id=user_id)
+                ).mappings().first()
+                return dict(user) if user else None
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting user by ID: {e}")
+            return None
+
+    def get_user_by_username(self, username: str) -> Optional[dict]:
+        """Get user by username.
+        
+        Args:
+            username: User's Telegram username
+            
+        Returns:
+            User data dictionary or None if not found
+        """
+        try:
+            with self.get_session() as session:
+                user = session.execute(
+                    select(Base.metadata.tables['users']).filter_by(username=username)
+                ).mappings().first()
+                return dict(user) if user else None
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting user by username: {e}")
+            return None
+
     def create_user(self, user_data: dict) -> Optional[dict]:
         """Create a new user.
         
@@ -91,10 +221,9 @@ class Database:
         """
         try:
             with self.get_session() as session:
-                user = Base.metadata.tables['users'](**user_data)
-                session.add(user)
-                session.flush()
-                return dict(user)
+                table = Base.metadata.tables['users']
+                result = session.execute(insert(table).values(**user_data).returning(table))
+                return dict(result.mappings().one())
         except SQLAlchemyError as e:
             logger.error(f"Error creating user: {e}")
             return None
@@ -111,10 +240,10 @@ class Database:
         """
         try:
             with self.get_session() as session:
-                result = session.query(Base.metadata.tables['users']).filter_by(
-                    telegram_id=telegram_id
-                ).update(user_data)
-                return bool(result)
+                result = session.execute(
+                    update(Base.metadata.tables['users']).filter_by(telegram_id=telegram_id).values(**user_data)
+                )
+                return bool(result.rowcount)
         except SQLAlchemyError as e:
             logger.error(f"Error updating user: {e}")
             return False
@@ -130,10 +259,10 @@ class Database:
         """
         try:
             with self.get_session() as session:
-                result = session.query(Base.metadata.tables['users']).filter_by(
-                    telegram_id=telegram_id
-                ).delete()
-                return bool(result)
+                result = session.execute(
+                    delete(Base.metadata.tables['users']).filter_by(telegram_id=telegram_id)
+                )
+                return bool(result.rowcount)
         except SQLAlchemyError as e:
             logger.error(f"Error deleting user: {e}")
             return False
@@ -150,16 +279,39 @@ class Database:
         """
         try:
             with self.get_session() as session:
-                query = session.query(Base.metadata.tables['matches']).filter_by(
-                    user_id=user_id
-                )
-                if status:
-                    query = query.filter_by(status=status)
-                return [dict(match) for match in query.all()]
-        except SQLAlchemyError as e:
+                query = _filtered_query('matches', user_id=user_id, status=status)
+                return [dict(match) for match in session.execute(query).mappings()]
+        except (SQLAlchemyError, ValueError) as e:
             logger.error(f"Error getting matches: {e}")
             return []
 
+    def get_matches_page(
+        self,
+        user_id: int,
+        status: str = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE
+    ) -> Tuple[list, Optional[str]]:
+        """Get one page of matches, newest first.
+
+        Args:
+            user_id: User ID
+            status: Match status filter
+            cursor: Cursor returned with the previous page, if any
+            limit: Maximum number of matches per page
+
+        Returns:
+            Matches of the page and the cursor of the next page, or None on the last page
+        """
+        try:
+            with self.get_session() as session:
+                query = _filtered_query('matches', user_id=user_id, status=status)
+                query = _page_query('matches', query, cursor, limit)
+                return _page_result(session.execute(query).mappings(), limit)
+        except (SQLAlchemyError, ValueError) as e:
+            logger.error(f"Error getting matches page: {e}")
+            return [], None
+
     def create_match(self, match_data: dict) -> Optional[dict]:
         """Create a new match.
         
@@ -171,10 +323,9 @@ class Database:
         """
         try:
             with self.get_session() as session:
-                match = Base.metadata.tables['matches'](**match_data)
-                session.add(match)
-                session.flush()
-                return dict(match)
+                table = Base.metadata.tables['matches']
+                result = session.execute(insert(table).values(**match_data).returning(table))
+                return dict(result.mappings().one())
         except SQLAlchemyError as e:
             logger.error(f"Error creating match: {e}")
             return None
@@ -191,10 +342,10 @@ class Database:
         """
         try:
             with self.get_session() as session:
-                result = session.query(Base.metadata.tables['matches']).filter_by(
-                    id=match_id
-                ).update(match_data)
-                return bool(result)
+                result = session.execute(
+                    update(Base.metadata.tables['matches']).filter_by(id=match_id).values(**match_data)
+                )
+                return bool(result.rowcount)
         except SQLAlchemyError as e:
             logger.error(f"Error updating match: {e}")
             return False
@@ -211,16 +362,39 @@ class Database:
         """
         try:
             with self.get_session() as session:
-                query = session.query(Base.metadata.tables['confessions'])
-                if user_id:
-                    query = query.filter_by(user_id=user_id)
-                if status:
-                    query = query.filter_by(status=status)
-                return [dict(confession) for confession in query.all()]
-        except SQLAlchemyError as e:
+                query = _filtered_query('confessions', user_id=user_id, status=status)
+                return [dict(confession) for confession in session.execute(query).mappings()]
+        except (SQLAlchemyError, ValueError) as e:
             logger.error(f"Error getting confessions: {e}")
             return []
 
+    def get_confessions_page(
+        self,
+        user_id: int = None,
+        status: str = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE
+    ) -> Tuple[list, Optional[str]]:
+        """Get one page of confessions, newest first.
+
+        Args:
+            user_id: User ID filter
+            status: Confession status filter
+            cursor: Cursor returned with the previous page, if any
+            limit: Maximum number of confessions per page
+
+        Returns:
+            Confessions of the page and the cursor of the next page, or None on the last page
+        """
+        try:
+            with self.get_session() as session:
+                query = _filtered_query('confessions', user_id=user_id, status=status)
+                query = _page_query('confessions', query, cursor, limit)
+                return _page_result(session.execute(query).mappings(), limit)
+        except (SQLAlchemyError, ValueError) as e:
+            logger.error(f"Error getting confessions page: {e}")
+            return [], None
+
     def create_confession(self, confession_data: dict) -> Optional[dict]:
         """Create a new confession.
         
@@ -232,10 +406,9 @@ class Database:
         """
         try:
             with self.get_session() as session:
-                confession = Base.metadata.tables['confessions'](**confession_data)
-                session.add(confession)
-                session.flush()
-                return dict(confession)
+                table = Base.metadata.tables['confessions']
+                result = session.execute(insert(table).values(**confession_data).returning(table))
+                return dict(result.mappings().one())
         except SQLAlchemyError as e:
             logger.error(f"Error creating confession: {e}")
             return None
@@ -252,10 +425,10 @@ class Database:
         """
         try:
             with self.get_session() as session:
-                result = session.query(Base.metadata.tables['confessions']).filter_by(
-                    id=confession_id
-                ).update(confession_data)
-                return bool(result)
+                result = session.execute(
+                    update(Base.metadata.tables['confessions']).filter_by(id=confession_id).values(**confession_data)
+                )
+                return bool(result.rowcount)
         except SQLAlchemyError as e:
             logger.error(f"Error updating confession: {e}")
             return False
@@ -273,18 +446,60 @@ class Database:
         """
         try:
             with self.get_session() as session:
-                query = session.query(Base.metadata.tables['reports'])
-                if reporter_id:
-                    query = query.filter_by(reporter_id=reporter_id)
-                if reported_user_id:
-                    query = query.filter_by(reported_user_id=reported_user_id)
-                if status:
-                    query = query.filter_by(status=status)
-                return [dict(report) for report in query.all()]
-        except SQLAlchemyError as e:
+                query = _filtered_query('reports', reporter_id=reporter_id, reported_user_id=reported_user_id, status=status)
+                return [dict(report) for report in session.execute(query).mappings()]
+        except (SQLAlchemyError, ValueError) as e:
             logger.error(f"Error getting reports: {e}")
             return []
 
+    def get_reports_page(
+        self,
+        reporter_id: int = None,
+        reported_user_id: int = None,
+        status: str = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE
+    ) -> Tuple[list, Optional[str]]:
+        """Get one page of reports, newest first.
+
+        Args:
+            reporter_id: Reporter ID filter
+            reported_user_id: Reported user ID filter
+            status: Report status filter
+            cursor: Cursor returned with the previous page, if any
+            limit: Maximum number of reports per page
+
+        Returns:
+            Reports of the page and the cursor of the next page, or None on the last page
+        """
+        try:
+            with self.get_session() as session:
+                query = _filtered_query('reports', reporter_id=reporter_id, reported_user_id=reported_user_id, status=status)
+                query = _page_query('reports', query, cursor, limit)
+                return _page_result(session.execute(query).mappings(), limit)
+        except (SQLAlchemyError, ValueError) as e:
+            logger.error(f"Error getting reports page: {e}")
+            return [], None
+
+    def get_report(self, report_id: int) -> Optional[dict]:
+        """Get a report by ID.
+        
+        Args:
+            report_id: Report ID
+            
+        Returns:
+            Report data dictionary or None if not found
+        """
+        try:
+            with self.get_session() as session:
+                report = session.execute(
+                    select(Base.metadata.tables['reports']).filter_by(id=report_id)
+                ).mappings().first()
+                return dict(report) if report else None
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting report: {e}")
+            return None
+
     def create_report(self, report_data: dict) -> Optional[dict]:
         """Create a new report.
         
@@ -296,10 +511,9 @@ class Database:
         """
         try:
             with self.get_session() as session:
-                report = Base.metadata.tables['reports'](**report_data)
-                session.add(report)
-                session.flush()
-                return dict(report)
+                table = Base.metadata.tables['reports']
+                result = session.execute(insert(table).values(**report_data).returning(table))
+                return dict(result.mappings().one())
         except SQLAlchemyError as e:
             logger.error(f"Error creating report: {e}")
             return None
@@ -316,10 +530,593 @@ class Database:
         """
         try:
             with self.get_session() as session:
-                result = session.query(Base.metadata.tables['reports']).filter_by(
-                    id=report_id
-                ).update(report_data)
-                return bool(result)
+                result = session.execute(
+                    update(Base.metadata.tables['reports']).filter_by(id=report_id).values(**report_data)
+                )
+                return bool(result.rowcount)
+        except SQLAlchemyError as e:
+            logger.error(f"Error updating report: {e}")
+            return False
+
+# Process-wide database, connected on first use
+_database: Optional[Database] = None
+
+def get_database() -> Database:
+    """Get the process-wide database for DATABASE_URL."""
+    global _database
+    if _database is None:
+        _database = Database(DATABASE_URL)
+    return _database
+
+@contextmanager
+def get_session() -> Generator:
+    """Get a session of the process-wide database, committed on exit.
+
+    Yields:
+        SQLAlchemy session
+    """
+    with get_database().get_session() as session:
+        yield session
+
+async def init_db() -> None:
+    """Create any missing tables in the process-wide database."""
+    get_database().create_tables()
+
+def close_db() -> None:
+    """Close all pooled connections of the process-wide database."""
+    if _database is not None:
+        _database.engine.dispose()
+
+def async_database_url(database_url: str) -> str:
+    """Switch a PostgreSQL or SQLite URL to its asyncio driver.
+
+    Args:
+        database_url: SQLAlchemy database URL
+
+    Returns:
+        Database URL with an asyncio driver
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() == 'postgresql':
+        url = url.set(drivername='postgresql+asyncpg')
+    elif url.get_backend_name() == 'sqlite':
+        url = url.set(drivername='sqlite+aiosqlite')
+    return url.render_as_string(hide_password=False)
+
+class AsyncDatabase:
+    """Async database connection and session management.
+
+    Mirrors the CRUD methods of ``Database`` as coroutines, so handlers can
+    query without blocking the event loop.
+    """
+
+    def __init__(self, database_url: str):
+        """Initialize async database connection.
+
+        Args:
+            database_url: SQLAlchemy database URL, switched to its asyncio driver
+        """
+        self.engine = create_async_engine(
+            async_database_url(database_url),
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=POOL_SIZE,
+            max_overflow=MAX_OVERFLOW,
+            pool_timeout=30,
+            pool_recycle=1800,
+            echo=False
+        )
+        self.SessionFactory = async_sessionmaker(
+            bind=self.engine,
+            expire_on_commit=False
+        )
+
+    async def create_tables(self) -> None:
+        """Create all database tables."""
+        try:
+            async with self.engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all)
+            logger.info("Database tables created successfully")
+        except SQLAlchemyError as e:
+            logger.error(f"Error creating database tables: {e}")
+            raise
+
+    async def dispose(self) -> None:
+        """Close all pooled connections."""
+        await self.engine.dispose()
+
+    @asynccontextmanager
+    async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
+        """Get an async database session.
+
+        Yields:
+            SQLAlchemy async session
+        """
+        session = self.SessionFactory()
+        try:
+            yield session
+            await session.commit()
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logger.error(f"Database session error: {e}")
+            raise
+        finally:
+            await session.close()
+
+    async def get_user_by_telegram_id(self, telegram_id: int) -> Optional[dict]:
+        """Get user by Telegram ID.
+
+        Args:
+            telegram_id: User's Telegram ID
+
+        Returns:
+            User data dictionary or None if not found
+        """
+        try:
+            async with self.get_session() as session:
+                result = await session.execute(
+                    select(Base.metadata.tables['users']).filter_by(telegram_id=telegram_id)
+                )
+                user = result.mappings().first()
+                return dict(user) if user else None
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting user by Telegram ID: {e}")
+            return None
+
+    async def get_user(self, user_id: int) -> Optional[dict]:
+        """Get user by ID.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            User data dictionary or None if not found
+        """
+        try:
+            async with self.get_session() as session:
+                result = await session.execute(
+                    select(Base.metadata.tables['users']).filter_by(id=user_id)
+                )
+                user = result.mappings().first()
+                return dict(user) if user else None
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting user by ID: {e}")
+            return None
+
+    async def get_user_by_username(self, username: str) -> Optional[dict]:
+        """Get user by username.
+
+        Args:
+            username: User's Telegram username
+
+        Returns:
+            User data dictionary or None if not found
+        """
+        try:
+            async with self.get_session() as session:
+                result = await session.execute(
+                    select(Base.metadata.tables['users']).filter_by(username=username)
+                )
+                user = result.mappings().first()
+                return dict(user) if user else None
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting user by username: {e}")
+            return None
+
+    async def create_user(self, user_data: dict) -> Optional[dict]:
+        """Create a new user.
+
+        Args:
+            user_data: User data dictionary
+
+        Returns:
+            Created user data dictionary or None if failed
+        """
+        try:
+            async with self.get_session() as session:
+                table = Base.metadata.tables['users']
+                result = await session.execute(insert(table).values(**user_data).returning(table))
+                return dict(result.mappings().one())
+        except SQLAlchemyError as e:
+            logger.error(f"Error creating user: {e}")
+            return None
+
+    async def update_user(self, telegram_id: int, user_data: dict) -> bool:
+        """Update user data.
+
+        Args:
+            telegram_id: User's Telegram ID
+            user_data: Updated user data dictionary
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            async with self.get_session() as session:
+                result = await session.execute(
+                    update(Base.metadata.tables['users']).filter_by(
+                        telegram_id=telegram_id
+                    ).values(**user_data)
+                )
+                return bool(result.rowcount)
+        except SQLAlchemyError as e:
+            logger.error(f"Error updating user: {e}")
+            return False
+
+    async def delete_user(self, telegram_id: int) -> bool:
+        """Delete user.
+
+        Args:
+            telegram_id: User's Telegram ID
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            async with self.get_session() as session:
+                result = await session.execute(
+                    delete(Base.metadata.tables['users']).filter_by(telegram_id=telegram_id)
+                )
+                return bool(result.rowcount)
+        except SQLAlchemyError as e:
+            logger.error(f"Error deleting user: {e}")
+            return False
+
+    async def get_matches(self, user_id: int, status: str = None) -> list:
+        """Get user matches.
+
+        Args:
+            user_id: User ID
+            status: Match status filter
+
+        Returns:
+            List of matches
+        """
+        try:
+            async with self.get_session() as session:
+                query = _filtered_query('matches', user_id=user_id, status=status)
+                result = await session.execute(query)
+                return [dict(match) for match in result.mappings()]
+        except (SQLAlchemyError, ValueError) as e:
+            logger.error(f"Error getting matches: {e}")
+            return []
+
+    async def get_matches_page(
+        self,
+        user_id: int,
+        status: str = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE
+    ) -> Tuple[list, Optional[str]]:
+        """Get one page of matches, newest first.
+
+        Args:
+            user_id: User ID
+            status: Match status filter
+            cursor: Cursor returned with the previous page, if any
+            limit: Maximum number of matches per page
+
+        Returns:
+            Matches of the page and the cursor of the next page, or None on the last page
+        """
+        try:
+            async with self.get_session() as session:
+                query = _filtered_query('matches', user_id=user_id, status=status)
+                query = _page_query('matches', query, cursor, limit)
+                result = await session.execute(query)
+                return _page_result(result.mappings(), limit)
+        except (SQLAlchemyError, ValueError) as e:
+            logger.error(f"Error getting matches page: {e}")
+            return [], None
+
+    async def stream_matches(
+        self,
+        user_id: int,
+        status: str = None,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[dict]:
+        """Stream matches, newest first, holding at most one batch in memory.
+
+        Args:
+            user_id: User ID
+            status: Match status filter
+            batch_size: Rows fetched from the server per round trip
+
+        Yields:
+            Match data dictionaries; the stream ends early, after logging
+            the error, if the query fails or a filter is invalid
+        """
+        try:
+            async with self.get_session() as session:
+                query = _filtered_query('matches', user_id=user_id, status=status)
+                result = await session.stream(query.execution_options(yield_per=batch_size))
+                async for row in result.mappings():
+                    yield dict(row)
+        except (SQLAlchemyError, ValueError) as e:
+            logger.error(f"Error streaming matches: {e}")
+
+    async def create_match(self, match_data: dict) -> Optional[dict]:
+        """Create a new match.
+
+        Args:
+            match_data: Match data dictionary
+
+        Returns:
+            Created match data dictionary or None if failed
+        """
+        try:
+            async with self.get_session() as session:
+                table = Base.metadata.tables['matches']
+                result = await session.execute(insert(table).values(**match_data).returning(table))
+                return dict(result.mappings().one())
+        except SQLAlchemyError as e:
+            logger.error(f"Error creating match: {e}")
+            return None
+
+    async def update_match(self, match_id: int, match_data: dict) -> bool:
+        """Update match data.
+
+        Args:
+            match_id: Match ID
+            match_data: Updated match data dictionary
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            async with self.get_session() as session:
+                result = await session.execute(
+                    update(Base.metadata.tables['matches']).filter_by(id=match_id).values(**match_data)
+                )
+                return bool(result.rowcount)
+        except SQLAlchemyError as e:
+            logger.error(f"Error updating match: {e}")
+            return False
+
+    async def get_confessions(self, user_id: int = None, status: str = None) -> list:
+        """Get confessions.
+
+        Args:
+            user_id: User ID filter
+            status: Confession status filter
+
+        Returns:
+            List of confessions
+        """
+        try:
+            async with self.get_session() as session:
+                query = _filtered_query('confessions', user_id=user_id, status=status)
+                result = await session.execute(query)
+                return [dict(confession) for confession in result.mappings()]
+        except (SQLAlchemyError, ValueError) as e:
+            logger.error(f"Error getting confessions: {e}")
+            return []
+
+    async def get_confessions_page(
+        self,
+        user_id: int = None,
+        status: str = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE
+    ) -> Tuple[list, Optional[str]]:
+        """Get one page of confessions, newest first.
+
+        Args:
+            user_id: User ID filter
+            status: Confession status filter
+            cursor: Cursor returned with the previous page, if any
+            limit: Maximum number of confessions per page
+
+        Returns:
+            Confessions of the page and the cursor of the next page, or None on the last page
+        """
+        try:
+            async with self.get_session() as session:
+                query = _filtered_query('confessions', user_id=user_id, status=status)
+                query = _page_query('confessions', query, cursor, limit)
+                result = await session.execute(query)
+                return _page_result(result.mappings(), limit)
+        except (SQLAlchemyError, ValueError) as e:
+            logger.error(f"Error getting confessions page: {e}")
+            return [], None
+
+    async def stream_confessions(
+        self,
+        user_id: int = None,
+        status: str = None,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[dict]:
+        """Stream confessions, newest first, holding at most one batch in memory.
+
+        Args:
+            user_id: User ID filter
+            status: Confession status filter
+            batch_size: Rows fetched from the server per round trip
+
+        Yields:
+            Confession data dictionaries; the stream ends early, after logging
+            the error, if the query fails or a filter is invalid
+        """
+        try:
+            async with self.get_session() as session:
+                query = _filtered_query('confessions', user_id=user_id, status=status)
+                result = await session.stream(query.execution_options(yield_per=batch_size))
+                async for row in result.mappings():
+                    yield dict(row)
+        except (SQLAlchemyError, ValueError) as e:
+            logger.error(f"Error streaming confessions: {e}")
+
+    async def create_confession(self, confession_data: dict) -> Optional[dict]:
+        """Create a new confession.
+
+        Args:
+            confession_data: Confession data dictionary
+
+        Returns:
+            Created confession data dictionary or None if failed
+        """
+        try:
+            async with self.get_session() as session:
+                table = Base.metadata.tables['confessions']
+                result = await session.execute(insert(table).values(**confession_data).returning(table))
+                return dict(result.mappings().one())
+        except SQLAlchemyError as e:
+            logger.error(f"Error creating confession: {e}")
+            return None
+
+    async def update_confession(self, confession_id: int, confession_data: dict) -> bool:
+        """Update confession data.
+
+        Args:
+            confession_id: Confession ID
+            confession_data: Updated confession data dictionary
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            async with self.get_session() as session:
+                result = await session.execute(
+                    update(Base.metadata.tables['confessions']).filter_by(
+                        id=confession_id
+                    ).values(**confession_data)
+                )
+                return bool(result.rowcount)
+        except SQLAlchemyError as e:
+            logger.error(f"Error updating confession: {e}")
+            return False
+
+    async def get_reports(self, reporter_id: int = None, reported_user_id: int = None, status: str = None) -> list:
+        """Get reports.
+
+        Args:
+            reporter_id: Reporter ID filter
+            reported_user_id: Reported user ID filter
+            status: Report status filter
+
+        Returns:
+            List of reports
+        """
+        try:
+            async with self.get_session() as session:
+                query = _filtered_query('reports', reporter_id=reporter_id, reported_user_id=reported_user_id, status=status)
+                result = await session.execute(query)
+                return [dict(report) for report in result.mappings()]
+        except (SQLAlchemyError, ValueError) as e:
+            logger.error(f"Error getting reports: {e}")
+            return []
+
+    async def get_reports_page(
+        self,
+        reporter_id: int = None,
+        reported_user_id: int = None,
+        status: str = None,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE
+    ) -> Tuple[list, Optional[str]]:
+        """Get one page of reports, newest first.
+
+        Args:
+            reporter_id: Reporter ID filter
+            reported_user_id: Reported user ID filter
+            status: Report status filter
+            cursor: Cursor returned with the previous page, if any
+            limit: Maximum number of reports per page
+
+        Returns:
+            Reports of the page and the cursor of the next page, or None on the last page
+        """
+        try:
+            async with self.get_session() as session:
+                query = _filtered_query('reports', reporter_id=reporter_id, reported_user_id=reported_user_id, status=status)
+                query = _page_query('reports', query, cursor, limit)
+                result = await session.execute(query)
+                return _page_result(result.mappings(), limit)
+        except (SQLAlchemyError, ValueError) as e:
+            logger.error(f"Error getting reports page: {e}")
+            return [], None
+
+    async def stream_reports(
+        self,
+        reporter_id: int = None,
+        reported_user_id: int = None,
+        status: str = None,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[dict]:
+        """Stream reports, newest first, holding at most one batch in memory.
+
+        Args:
+            reporter_id: Reporter ID filter
+            reported_user_id: Reported user ID filter
+            status: Report status filter
+            batch_size: Rows fetched from the server per round trip
+
+        Yields:
+            Report data dictionaries; the stream ends early, after logging
+            the error, if the query fails or a filter is invalid
+        """
+        try:
+            async with self.get_session() as session:
+                query = _filtered_query('reports', reporter_id=reporter_id, reported_user_id=reported_user_id, status=status)
+                result = await session.stream(query.execution_options(yield_per=batch_size))
+                async for row in result.mappings():
+                    yield dict(row)
+        except (SQLAlchemyError, ValueError) as e:
+            logger.error(f"Error streaming reports: {e}")
+
+    async def get_report(self, report_id: int) -> Optional[dict]:
+        """Get a report by ID.
+
+        Args:
+            report_id: Report ID
+
+        Returns:
+            Report data dictionary or None if not found
+        """
+        try:
+            async with self.get_session() as session:
+                result = await session.execute(
+                    select(Base.metadata.tables['reports']).filter_by(id=report_id)
+                )
+                report = result.mappings().first()
+                return dict(report) if report else None
+        except SQLAlchemyError as e:
+            logger.error(f"Error getting report: {e}")
+            return None
+
+    async def create_report(self, report_data: dict) -> Optional[dict]:
+        """Create a new report.
+
+        Args:
+            report_data: Report data dictionary
+
+        Returns:
+            Created report data dictionary or None if failed
+        """
+        try:
+            async with self.get_session() as session:
+                table = Base.metadata.tables['reports']
+                result = await session.execute(insert(table).values(**report_data).returning(table))
+                return dict(result.mappings().one())
+        except SQLAlchemyError as e:
+            logger.error(f"Error creating report: {e}")
+            return None
+
+    async def update_report(self, report_id: int, report_data: dict) -> bool:
+        """Update report data.
+
+        Args:
+            report_id: Report ID
+            report_data: Updated report data dictionary
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            async with self.get_session() as session:
+                result = await session.execute(
+                    update(Base.metadata.tables['reports']).filter_by(id=report_id).values(**report_data)
+                )
+                return bool(result.rowcount)
         except SQLAlchemyError as e:
             logger.error(f"Error updating report: {e}")
-            return False 
\ No newline at end of file
+            return False
@@ -0,0 +1,284 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from config import LIMIT_FLUSH_INTERVAL, LIMIT_STORE, REDIS_URL
+from .database import get_session
+from .models import DailyLimit
+from .offload import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# Limit kind -> DailyLimit column
+LIMIT_COLUMNS = {
+    'match': 'match_count',
+    'confession': 'confession_count'
+}
+
+# Counters outlive their day by this long so late flushes still see them
+COUNTER_GRACE_SECONDS = 3600
+
+# Minimum seconds between sweeps of expired local counters
+COUNTER_SWEEP_INTERVAL = 60
+
+def _day_start(moment: Optional[datetime] = None) -> datetime:
+    moment = moment or datetime.utcnow()
+    return datetime(moment.year, moment.month, moment.day)
+
+def _seconds_until_expiry(moment: Optional[datetime] = None) -> int:
+    moment = moment or datetime.utcnow()
+    day_end = _day_start(moment) + timedelta(days=1)
+    return int((day_end - moment).total_seconds()) + COUNTER_GRACE_SECONDS
+
+def counter_key(kind: str, user_id: int, day: datetime) -> str:
+    """Build the counter key for a user's limit on a given day."""
+    return f"limit:{kind}:{day:%Y%m%d}:{user_id}"
+
+def parse_counter_key(key: str) -> Tuple[str, datetime, int]:
+    """Split a counter key into kind, day and user ID."""
+    _, kind, day, user_id = key.split(':')
+    return kind, datetime.strptime(day, "%Y%m%d"), int(user_id)
+
+class LocalCounterStore:
+    """In-process expiring counters for single-node deployments and tests.
+
+    Expired counters are swept out on writes, at most once per sweep interval.
+    """
+
+    def __init__(self, sweep_interval: float = COUNTER_SWEEP_INTERVAL):
+        """Initialize an empty store.
+
+        Args:
+            sweep_interval: Minimum seconds between sweeps of expired counters
+        """
+        self._counters: Dict[str, Tuple[int, float]] = {}
+        self.sweep_interval = sweep_interval
+        self._next_sweep = time.monotonic() + sweep_interval
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    async def get_many(self, keys: List[str]) -> List[int]:
+        """Get current counter values, treating missing or expired ones as zero."""
+        now = time.monotonic()
+        values = []
+        for key in keys:
+            value, expires_at = self._counters.get(key, (0, now))
+            values.append(value if expires_at > now else 0)
+        return values
+
+    async def incr_if_below(self, key: str, limit: int, ttl: int) -> Tuple[bool, int]:
+        """Increment a counter unless it already reached the limit."""
+        now = time.monotonic()
+        self._sweep(now)
+        value, expires_at = self._counters.get(key, (0, now + ttl))
+        if expires_at <= now:
+            value, expires_at = 0, now + ttl
+        if value >= limit:
+            return False, value
+        self._counters[key] = (value + 1, expires_at)
+        return True, value + 1
+
+    async def set_at_least(self, key: str, value: int, ttl: int) -> None:
+        """Raise a counter to at least the given value."""
+        self._sweep(time.monotonic())
+        current, = await self.get_many([key])
+        if value > current:
+            self._counters[key] = (value, time.monotonic() + ttl)
+
+    def _sweep(self, now: float) -> None:
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + self.sweep_interval
+        expired = [key for key, (_, expires_at) in self._counters.items() if expires_at <= now]
+        for key in expired:
+            del self._counters[key]
+
+class RedisCounterStore:
+    """Redis-backed expiring counters shared by all workers."""
+
+    INCR_IF_BELOW = """
+        local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+        if current >= tonumber(ARGV[1]) then
+            return {0, current}
+        end
+        current = redis.call('INCR', KEYS[1])
+        if current == 1 then
+            redis.call('EXPIRE', KEYS[1], ARGV[2])
+        end
+        return {1, current}
+    """
+
+    SET_AT_LEAST = """
+        local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+        if tonumber(ARGV[1]) > current then
+            redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+        end
+        return 1
+    """
+
+    def __init__(self, url: str):
+        """Connect to Redis.
+
+        Args:
+            url: Redis connection URL
+        """
+        # Imported here so the local store works without the redis package
+        from redis import asyncio as aioredis
+
+        self.redis = aioredis.from_url(url)
+        self._incr_if_below = self.redis.register_script(self.INCR_IF_BELOW)
+        self._set_at_least = self.redis.register_script(self.SET_AT_LEAST)
+
+    async def get_many(self, keys: List[str]) -> List[int]:
+        """Get current counter values, treating missing ones as zero."""
+        if not keys:
+            return []
+        return [int(value or 0) for value in await self.redis.mget(keys)]
+
+    async def incr_if_below(self, key: str, limit: int, ttl: int) -> Tuple[bool, int]:
+        """Atomically increment a counter unless it already reached the limit."""
+        allowed, value = await self._incr_if_below(keys=[key], args=[limit, ttl])
+        return bool(allowed), int(value)
+
+    async def set_at_least(self, key: str, value: int, ttl: int) -> None:
+        """Atomically raise a counter to at least the given value."""
+        await self._set_at_least(keys=[key], args=[value, ttl])
+
+class DailyLimitService:
+    """Per-user daily limits checked against fast counters and flushed to DailyLimit."""
+
+    def __init__(self, store, flush_interval: float = LIMIT_FLUSH_INTERVAL):
+        """Initialize the service.
+
+        Args:
+            store: Counter store
+            flush_interval: Seconds between flushes to the database
+        """
+        self.store = store
+        self.flush_interval = flush_interval
+        self._dirty: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    async def count(self, user_id: int, kind: str) -> int:
+        """Get how many actions of a kind a user has performed today.
+
+        Args:
+            user_id: User ID
+            kind: Limit kind, ``match`` or ``confession``
+
+        Returns:
+            Today's count
+        """
+        value, = await self.store.get_many([counter_key(kind, user_id, _day_start())])
+        return value
+
+    async def try_consume(self, user_id: int, kind: str, limit: int) -> bool:
+        """Count one action if the user is still below today's limit.
+
+        Args:
+            user_id: User ID
+            kind: Limit kind, ``match`` or ``confession``
+            limit: Daily limit
+
+        Returns:
+            True if the action was counted, False if the limit is reached
+        """
+        key = counter_key(kind, user_id, _day_start())
+        allowed, _ = await self.store.incr_if_below(key, limit, _seconds_until_expiry())
+        if allowed:
+            self._dirty.add(key)
+        return allowed
+
+    async def load(self) -> None:
+        """Seed today's counters from DailyLimit rows."""
+        rows = await run_blocking(self._read_today)
+        ttl = _seconds_until_expiry()
+        for user_id, day, counts in rows:
+            for kind, column in LIMIT_COLUMNS.items():
+                if counts[column]:
+                    await self.store.set_at_least(counter_key(kind, user_id, day), counts[column], ttl)
+        logger.info(f"Loaded daily limits for {len(rows)} users")
+
+    async def flush(self) -> int:
+        """Write counters changed since the last flush to DailyLimit.
+
+        Returns:
+            Number of counters written
+        """
+        keys, self._dirty = list(self._dirty), set()
+        if not keys:
+            return 0
+
+        values = await self.store.get_many(keys)
+        rows: Dict[Tuple[int, datetime], Dict[str, int]] = {}
+        for key, value in zip(keys, values):
+            kind, day, user_id = parse_counter_key(key)
+            rows.setdefault((user_id, day), {})[LIMIT_COLUMNS[kind]] = value
+
+        try:
+            await run_blocking(self._write, rows)
+        except Exception as e:
+            logger.error(f"Error flushing daily limits: {e}")
+            self._dirty.update(keys)
+            return 0
+        return len(keys)
+
+    async def run(self) -> None:
+        """Flush counters periodically."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def start(self) -> None:
+        """Seed counters and start the periodic flush on the running event loop."""
+        await self.load()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush and write any pending counters."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def _read_today(self) -> List[Tuple[int, datetime, Dict[str, int]]]:
+        today = _day_start()
+        with get_session() as session:
+            return [
+                (row.user_id, today, {column: getattr(row, column) or 0 for column in LIMIT_COLUMNS.values()})
+                for row in session.query(DailyLimit).filter(DailyLimit.date == today)
+            ]
+
+    def _write(self, rows: Dict[Tuple[int, datetime], Dict[str, int]]) -> None:
+        with get_session() as session:
+            for day in {day for _, day in rows}:
+                user_ids = [user_id for user_id, row_day in rows if row_day == day]
+                existing = {
+                    limit.user_id: limit for limit in session.query(DailyLimit).filter(
+                        DailyLimit.date == day,
+                        DailyLimit.user_id.in_(user_ids)
+                    )
+                }
+                for user_id in user_ids:
+                    limit = existing.get(user_id)
+                    if limit is None:
+                        limit = DailyLimit(user_id=user_id, date=day, match_count=0, confession_count=0)
+                        session.add(limit)
+                    for column, value in rows[(user_id, day)].items():
+                        setattr(limit, column, max(value, getattr(limit, column) or 0))
+
+def create_counter_store():
+    """Create the counter store selected by LIMIT_STORE."""
+    if LIMIT_STORE == 'redis':
+        return RedisCounterStore(REDIS_URL)
+    return LocalCounterStore()
+
+daily_limits = DailyLimitService(create_counter_store())
@@ -5,13 +5,17 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     Enum,
+    Float,
     Table,
     UniqueConstraint
 )
+from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import relationship, declarative_base
 import enum
 
@@ -51,6 +55,10 @@ class ReportStatus(enum.Enum):
     APPROVED = "approved"
     REJECTED = "rejected"
 
+def _profile_field(name: str):
+    """Proxy a profile column on the user, creating the profile on first assignment."""
+    return association_proxy("profile", name, creator=lambda value: Profile(**{name: value}))
+
 class User(Base):
     """User model for storing user information."""
     __tablename__ = "users"
@@ -61,17 +69,33 @@ class User(Base):
     first_name = Column(String(64))
     last_name = Column(String(64))
     is_admin = Column(Boolean, default=False)
+    likes_received = Column(Integer, default=0, nullable=False)
+    skips_received = Column(Integer, default=0, nullable=False)
+    engagement_score = Column(Float, index=True)  # smoothed like rate, NULL until first reaction
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    profile = relationship("Profile", back_populates="user", uselist=False)
+    profile = relationship(
+        "Profile", back_populates="user", uselist=False, lazy="selectin", cascade="all, delete-orphan"
+    )
     sent_matches = relationship("Match", foreign_keys="Match.sender_id", back_populates="sender")
     received_matches = relationship("Match", foreign_keys="Match.receiver_id", back_populates="receiver")
     confessions = relationship("Confession", back_populates="user")
     sent_reports = relationship("Report", foreign_keys="Report.reporter_id", back_populates="reporter")
     received_reports = relationship("Report", foreign_keys="Report.reported_id", back_populates="reported")
 
+    # Profile fields, read and written through the user by the handlers and matching
+    age = _profile_field("age")
+    gender = _profile_field("gender")
+    university = _profile_field("university")
+    bio = _profile_field("bio")
+    hobbies = _profile_field("hobbies")
+    photo_id = _profile_field("photo_id")
+    preferred_age_min = _profile_field("preferred_age_min")
+    preferred_age_max = _profile_field("preferred_age_max")
+    preferred_university = _profile_field("preferred_university")
+
 class Profile(Base):
     __tablename__ = "profiles"
 
@@ -83,10 +107,18 @@ class Profile(Base):
     bio = Column(Text)
     hobbies = Column(Text)
     photo_id = Column(String(128))
+    preferred_age_min = Column(Integer)
+    preferred_age_max = Column(Integer)
+    preferred_university = Column(Enum(University))
     is_visible = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Indexes
+    __table_args__ = (
+        Index('ix_profiles_gender_university_age', gender, university, age),
+    )
+
     # Relationships
     user = relationship("User", back_populates="profile")
 
@@ -104,6 +136,8 @@ class Match(Base):
     # Constraints
     __table_args__ = (
         UniqueConstraint('sender_id', 'receiver_id', name='unique_match'),
+        Index('ix_matches_receiver_status', receiver_id, status),
+        Index('ix_matches_sender_created_at', sender_id, created_at),
     )
 
     # Relationships
@@ -121,6 +155,12 @@ class Confession(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Indexes
+    __table_args__ = (
+        Index('ix_confessions_status_created_at', status, created_at.desc()),
+        Index('ix_confessions_user_created_at', user_id, created_at),
+    )
+
     # Relationships
     user = relationship("User", back_populates="confessions")
 
@@ -139,6 +179,8 @@ class Report(Base):
     # Constraints
     __table_args__ = (
         UniqueConstraint('reporter_id', 'reported_id', name='unique_report'),
+        Index('ix_reports_status', status),
+        Index('ix_reports_reported_id', reported_id),
     )
 
     # Relationships
@@ -162,4 +204,38 @@ class DailyLimit(Base):
     )
 
     # Relationships
-    user = relationship("User") 
\ No newline at end of file
+    user = relationship("User") 
+
+class RecommendationQueue(Base):
+    """Precomputed ranked match candidates waiting to be shown to a user."""
+    __tablename__ = "recommendation_queues"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    candidate_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    position = Column(Integer, nullable=False)
+    score = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint('user_id', 'candidate_id', name='unique_recommendation'),
+        Index('ix_recommendation_queues_user_position', 'user_id', 'position'),
+        Index('ix_recommendation_queues_candidate_id', 'candidate_id'),
+    )
+
+    # Relationships
+    user = relationship("User", foreign_keys=[user_id])
+    candidate = relationship("User", foreign_keys=[candidate_id])
+
+class SeenFilter(Base):
+    """Serialized Bloom filter of users a user has already seen."""
+    __tablename__ = "seen_filters"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    data = Column(LargeBinary, nullable=False)
+    item_count = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    user = relationship("User")
\ No newline at end of file
@@ -0,0 +1,157 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+from prometheus_client import Gauge, Histogram
+
+from .database import MAX_OVERFLOW, POOL_SIZE, Database, get_database
+
+# Database methods that are run in the thread pool and awaited
+CRUD_METHODS = frozenset({
+    'get_user', 'get_user_by_telegram_id', 'get_user_by_username', 'create_user', 'update_user', 'delete_user',
+    'get_matches', 'get_matches_page', 'create_match', 'update_match',
+    'get_confessions', 'get_confessions_page', 'create_confession', 'update_confession',
+    'get_reports', 'get_reports_page', 'get_report', 'create_report', 'update_report'
+})
+
+# Number of recent wait times kept for stats()
+WAIT_SAMPLES = 1000
+
+# Prometheus metrics
+DB_QUEUE_DEPTH = Gauge(
+    'db_offload_queue_depth',
+    'Database calls waiting for a worker thread'
+)
+
+DB_WAIT_SECONDS = Histogram(
+    'db_offload_wait_seconds',
+    'Time database calls wait for a worker thread'
+)
+
+class ThreadedDatabase:
+    """Awaitable wrapper running ``Database`` CRUD methods in a bounded thread pool.
+
+    The pool has one worker per pooled connection, so calls beyond that wait
+    in the executor queue instead of blocking the event loop on a connection.
+    The bound only holds if every blocking use of the sync engine runs here,
+    so background jobs go through ``run_blocking`` rather than the loop's
+    default executor. Other attributes are passed through to the wrapped
+    database unchanged.
+    """
+
+    def __init__(self, database: Database, max_workers: int = POOL_SIZE + MAX_OVERFLOW):
+        """Initialize the wrapper.
+
+        Args:
+            database: Synchronous database to wrap
+            max_workers: Worker threads, by default the connection pool's capacity
+        """
+        self.database = database
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='db')
+        self._queued = 0
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.database, name)
+        if name not in CRUD_METHODS:
+            return attribute
+
+        @wraps(attribute)
+        async def offloaded(*args, **kwargs):
+            return await self.run(attribute, *args, **kwargs)
+        return offloaded
+
+    async def run(self, function: Callable, *args, **kwargs) -> Any:
+        """Run a blocking call in the thread pool.
+
+        Args:
+            function: Blocking callable
+            *args: Positional arguments for the callable
+            **kwargs: Keyword arguments for the callable
+
+        Returns:
+            The callable's result
+        """
+        submitted = time.monotonic()
+        self._enqueue()
+
+        def call():
+            self._dequeue(time.monotonic() - submitted)
+            return function(*args, **kwargs)
+
+        future = self.executor.submit(call)
+        # A call cancelled while still queued never reaches call()
+        future.add_done_callback(lambda done: done.cancelled() and self._dequeue())
+        return await asyncio.wrap_future(future)
+
+    def _enqueue(self) -> None:
+        with self._lock:
+            self._queued += 1
+        DB_QUEUE_DEPTH.inc()
+
+    def _dequeue(self, wait: Optional[float] = None) -> None:
+        with self._lock:
+            self._queued -= 1
+            if wait is not None:
+                self._waits.append(wait)
+        DB_QUEUE_DEPTH.dec()
+        if wait is not None:
+            DB_WAIT_SECONDS.observe(wait)
+
+    def stats(self) -> Dict[str, float]:
+        """Get queue depth and recent wait times.
+
+        Returns:
+            Dictionary with the current queue depth, the worker count and the
+            mean, 95th percentile and maximum of recent wait times in seconds
+        """
+        with self._lock:
+            queued = self._queued
+            waits = sorted(self._waits)
+        return {
+            'queue_depth': queued,
+            'workers': self.max_workers,
+            'wait_mean': sum(waits) / len(waits) if waits else 0.0,
+            'wait_p95': waits[int((len(waits) - 1) * 0.95)] if waits else 0.0,
+            'wait_max': waits[-1] if waits else 0.0
+        }
+
+    def shutdown(self) -> None:
+        """Wait for running calls and stop the worker threads."""
+        self.executor.shutdown(wait=True)
+
+# Process-wide thread pool, started on first use
+_threaded_db: Optional[ThreadedDatabase] = None
+
+def get_threaded_db() -> ThreadedDatabase:
+    """Get the thread pool over the process-wide database, starting it on first use."""
+    global _threaded_db
+    if _threaded_db is None:
+        _threaded_db = ThreadedDatabase(get_database())
+    return _threaded_db
+
+async def run_blocking(function: Callable, *args, **kwargs) -> Any:
+    """Run a blocking call that uses the process-wide sync engine in its thread pool.
+
+    Args:
+        function: Blocking callable
+        *args: Positional arguments for the callable
+        **kwargs: Keyword arguments for the callable
+
+    Returns:
+        The callable's result
+    """
+    return await get_threaded_db().run(function, *args, **kwargs)
+
+def shutdown_threaded_db() -> None:
+    """Stop the process-wide thread pool, if it was started."""
+    global _threaded_db
+    if _threaded_db is not None:
+        _threaded_db.shutdown()
+        _threaded_db = None
@@ -10,7 +10,6 @@ from config import (
     OFFICIAL_CHANNEL, CONFESSION_CHANNEL, ERROR_MESSAGES, 
     ADMIN_IDS, MESSAGES
 )
-from database.database import get_session
 from database.models import User, Match, Confession
 from .keyboards import (
     get_verification_keyboard, get_main_menu_keyboard,
@@ -172,23 +171,18 @@ async def post_confession(bot: Bot, confession: Confession) -> None:
     except Exception as e:
         logger.error(f"Error posting confession: {e}")
 
-async def announce_match(bot: Bot, user1: User, user2_id: int) -> None:
+async def announce_match(bot: Bot, user1: User, user2: User) -> None:
     """Announce a new match in the official channel."""
     try:
-        with get_session() as session:
-            user2 = session.query(User).get(user2_id)
-            if not user2:
-                return
-
-            await bot.send_message(
-                chat_id=OFFICIAL_CHANNEL,
-                text=(
-                    "💝 New Match!\n\n"
-                    f"🎓 {user1.university}\n"
-                    f"👥 {user1.first_name} + {user2.first_name}\n\n"
-                    "Wishing you the best of luck! 💫"
-                )
+        await bot.send_message(
+            chat_id=OFFICIAL_CHANNEL,
+            text=(
+                "💝 New Match!\n\n"
+                f"🎓 {user1.university.value}\n"
+                f"👥 {user1.first_name} + {user2.first_name}\n\n"
+                "Wishing you the best of luck! 💫"
             )
+        )
     except Exception as e:
         logger.error(f"Error announcing match: {e}")
 
@@ -3,6 +3,7 @@ from aiogram.types import (
     ReplyKeyboardMarkup, KeyboardButton
 )
 from config import ETHIOPIAN_UNIVERSITIES
+from database.models import University
 
 def get_profile_edit_keyboard() -> InlineKeyboardMarkup:
     """Create keyboard for profile editing options."""
@@ -26,10 +27,10 @@ def get_profile_edit_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 def get_university_keyboard() -> InlineKeyboardMarkup:
-    """Create keyboard with university options."""
+    """Create keyboard with the universities a profile can store."""
     keyboard = [
-        [InlineKeyboardButton(text=university, callback_data=f"university:{university}")]
-        for university in ETHIOPIAN_UNIVERSITIES
+        [InlineKeyboardButton(text=university.value, callback_data=f"university:{university.name}")]
+        for university in University
     ]
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
@@ -105,6 +106,16 @@ def get_report_keyboard(user_id: int) -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
+def get_report_action_keyboard(report_id: int) -> InlineKeyboardMarkup:
+    """Create keyboard for moderating a report."""
+    keyboard = [
+        [
+            InlineKeyboardButton(text="✅ Approve", callback_data=f"report_{report_id}_approve"),
+            InlineKeyboardButton(text="❌ Reject", callback_data=f"report_{report_id}_reject")
+        ]
+    ]
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
+
 def get_verification_keyboard() -> InlineKeyboardMarkup:
     """Create keyboard for channel verification."""
     keyboard = [
@@ -114,6 +125,15 @@ def get_verification_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
+def get_more_keyboard(callback_data: str) -> InlineKeyboardMarkup:
+    """Create keyboard for loading the next page of a list."""
+    keyboard = [
+        [
+            InlineKeyboardButton(text="⬇️ More", callback_data=callback_data)
+        ]
+    ]
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
+
 def get_admin_keyboard() -> InlineKeyboardMarkup:
     """Create keyboard for admin actions."""
     keyboard = [
@@ -2,18 +2,40 @@ from aiogram import types, F
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+from collections import defaultdict
 from datetime import datetime, timedelta
+import asyncio
 import random
 import logging
-from typing import Optional, List
+import weakref
+from typing import Dict, Iterator, Optional, List, Set, Tuple
+
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import (
     DAILY_MATCH_LIMIT, MATCH_COOLDOWN_HOURS,
     ERROR_MESSAGES, MIN_AGE, MAX_AGE,
-    MATCH_SCORE_WEIGHTS
+    MATCH_SCORE_WEIGHTS, RANKING_BACKEND,
+    MATCH_DIVERSITY, DIVERSITY_POOL_FACTOR
 )
 from database.database import get_session
-from database.models import User, Match, Gender
+from database.limits import daily_limits
+from database.offload import run_blocking
+from database.models import User, Match, MatchStatus, Profile
+from matching.decisions import decision_buffer
+from matching.diversity import diversify
+from matching.engagement import engagement_of
+from matching.features import feature_cache
+from matching.index import candidate_index, hobby_index
+from matching.likes import like_index
+from matching.profiles import ProfileCard, profile_cache
+from matching.queues import recommendation_queues
+from matching.score_cache import score_cache
+from matching.scoring import TopK, bio_similarity
+from matching.seen import SeenSet, seen_sets
+from matching.sql_ranking import rank_in_database
 from .states import MatchStates
 from .keyboards import (
     get_match_keyboard, get_unmatch_keyboard,
@@ -23,95 +45,352 @@ from .channel import announce_match
 
 logger = logging.getLogger(__name__)
 
-async def start_matching(message: types.Message, state: FSMContext):
+# Number of indexed candidates hydrated per query
+CANDIDATE_LOAD_BATCH_SIZE = 500
+# Upper bound on candidates scored per /match
+MAX_SCORED_CANDIDATES = 2000
+# Number of top-ranked candidates per match feed page
+MATCHES_PER_SESSION = 10
+# Remaining buffered candidates that trigger prefetching the next page
+MATCH_PREFETCH_THRESHOLD = 3
+# Maximum number of "liked you" candidates shown ahead of the ranked feed
+LIKED_YOU_FEED_SIZE = 50
+
+# Per-chat locks for match feed state and chats with a prefetch in flight
+_feed_locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
+_prefetching: Set[int] = set()
+# Running mutual-match notification jobs, keyed by the matched pair
+_notifications: Dict[frozenset, asyncio.Task] = {}
+
+async def start_matching(message: types.Message, state: FSMContext, session: AsyncSession):
     """Start the matching process."""
     try:
-        with get_session() as session:
-            user = session.query(User).filter_by(telegram_id=message.from_user.id).first()
-            if not user:
-                await message.answer(ERROR_MESSAGES['profile_required'])
-                return
+        user = await session.scalar(select(User).filter_by(telegram_id=message.from_user.id))
+        if not user:
+            await message.answer(ERROR_MESSAGES['profile_required'])
+            return
 
-            # Check daily match limit
-            today = datetime.utcnow().date()
-            matches_today = session.query(Match).filter(
-                Match.user_id == user.id,
-                Match.created_at >= today
-            ).count()
+        # Check daily match limit
+        if await daily_limits.count(user.id, 'match') >= DAILY_MATCH_LIMIT:
+            await message.answer(
+                f"You've reached your daily match limit of {DAILY_MATCH_LIMIT}. "
+                "Please try again tomorrow!"
+            )
+            return
 
-            if matches_today >= DAILY_MATCH_LIMIT:
-                await message.answer(
-                    f"You've reached your daily match limit of {DAILY_MATCH_LIMIT}. "
-                    "Please try again tomorrow!"
-                )
-                return
+        # Release the update's connection before ranking, so one /match never
+        # holds two: ranking is CPU-bound and runs in a worker with its own session
+        await session.commit()
 
-            # Get potential matches
-            potential_matches = get_potential_matches(session, user)
-            if not potential_matches:
-                await message.answer(
-                    "No potential matches found at the moment. Please try again later!"
-                )
-                return
+        # People who already liked the user come first, then the ranked feed
+        likers = await like_index.likers(user.id)
+        liked_you, match_ids, keyset = await run_blocking(load_feed_start, message.from_user.id, likers)
+        match_ids = liked_you + match_ids
+        if not match_ids:
+            await message.answer(
+                "No potential matches found at the moment. Please try again later!"
+            )
+            return
 
-            # Store matches in state
-            await state.update_data(potential_matches=potential_matches)
-            await state.set_state(MatchStates.viewing_matches)
+        # Store candidate IDs in state; profiles are loaded one at a time
+        await state.update_data(
+            user_id=user.id,
+            liked_you=liked_you,
+            match_ids=match_ids,
+            match_cursor=0,
+            match_keyset=keyset,
+            feed_exhausted=False
+        )
+        await state.set_state(MatchStates.viewing_matches)
 
-            # Show first match
-            await show_next_match(message, state)
+        # Show first match
+        await show_next_match(message, state, session)
     except Exception as e:
         logger.error(f"Error in start_matching: {e}")
         await message.answer(ERROR_MESSAGES['database_error'])
         await state.clear()
 
-def get_potential_matches(session, user: User) -> List[User]:
-    """Get potential matches for a user based on preferences and compatibility."""
-    try:
-        # Get users who haven't been matched with before
-        excluded_users = session.query(Match.matched_user_id).filter(
-            Match.user_id == user.id
-        ).subquery()
-
-        # Get users who haven't matched with the current user
-        excluded_by = session.query(Match.user_id).filter(
-            Match.matched_user_id == user.id
-        ).subquery()
-
-        # Base query for potential matches
-        query = session.query(User).filter(
-            User.id != user.id,
-            User.id.notin_(excluded_users),
-            User.id.notin_(excluded_by),
-            User.gender != user.gender  # Match with opposite gender
+def fetch_match_page(
+    session,
+    user: User,
+    keyset: Optional[Dict],
+    likers: Set[int]
+) -> Tuple[List[int], Optional[Dict]]:
+    """Get the next page of the match feed after a keyset cursor.
+
+    Precomputed queue entries are used when available; otherwise the page
+    is picked from a freshly ranked pool. Queue pages leave the cursor
+    alone, since the queue is ranked separately. Profiles of the page are
+    cached so the cards are ready before they are shown.
+
+    Args:
+        session: SQLAlchemy session
+        user: Requesting user
+        keyset: Cursor returned with the previous page: ``after``, the
+            ``[score, user_id]`` of the lowest-ranked candidate already
+            ranked, and ``carry``, the ``[user_id, score]`` pairs of ranked
+            candidates not shown yet
+        likers: IDs of users with a pending like for the user, who are
+            shown in the "liked you" feed instead
+
+    Returns:
+        Candidate IDs of the page and the cursor after it
+    """
+    after = tuple(keyset['after']) if keyset and keyset['after'] else None
+    carry = [tuple(entry) for entry in keyset['carry']] if keyset else []
+    seen = seen_sets.get(session, user.id)
+    while True:
+        queued = recommendation_queues.pop(session, user.id, MATCHES_PER_SESSION)
+        unseen = ~seen.contains_many(np.array([candidate_id for candidate_id, _ in queued], dtype=np.int64))
+        ranked = [entry for entry, keep in zip(queued, unseen) if keep]
+        loaded = {}
+        if not queued:
+            # Candidates of the pool not picked for this page stay in the
+            # cursor, so none ranked above it are skipped
+            pool, after = rank_feed_pool(session, user, after, carry, seen)
+            if not pool:
+                return [], {'after': list(after) if after else None, 'carry': []}
+            page = diversify(pool, MATCHES_PER_SESSION, MATCH_DIVERSITY, MATCH_SCORE_WEIGHTS)
+            picked = {match.id for match, _ in page}
+            carry = [(match.id, score) for match, score in pool if match.id not in picked]
+            loaded = {match.id: match for match, _ in page}
+            ranked = [(match.id, score) for match, score in page]
+        keyset = {'after': list(after) if after else None, 'carry': [list(entry) for entry in carry]}
+
+        # Exact check only for the candidates about to be shown
+        page_ids = filter_unmatched(session, user, [candidate_id for candidate_id, _ in ranked], likers)
+        if page_ids:
+            missing = [candidate_id for candidate_id in page_ids if candidate_id not in loaded]
+            if missing:
+                profile_cache.put_many(session.query(User).filter(User.id.in_(missing)))
+            profile_cache.put_many(loaded[candidate_id] for candidate_id in page_ids if candidate_id in loaded)
+            return page_ids, keyset
+
+def rank_feed_pool(
+    session,
+    user: User,
+    after: Optional[Tuple[float, int]],
+    carry: List[Tuple[int, float]],
+    seen: SeenSet
+) -> Tuple[List[Tuple[User, float]], Optional[Tuple[float, int]]]:
+    """Rank the next feed pool: candidates carried over plus fresh ones below the keyset.
+
+    Fresh candidates only fill the pool up to its usual size, so the number
+    carried from page to page stays bounded.
+
+    Args:
+        session: SQLAlchemy session
+        user: Requesting user
+        after: ``(score, user_id)`` of the lowest-ranked candidate already ranked
+        carry: ``(user_id, score)`` pairs of ranked candidates not shown yet
+        seen: Seen set of the user
+
+    Returns:
+        ``(candidate, score)`` pairs in rank order and the keyset after the pool
+    """
+    pool = []
+    carry_ids = np.array([candidate_id for candidate_id, _ in carry], dtype=np.int64)
+    carry_ids = carry_ids[~seen.contains_many(carry_ids)].tolist()
+    if carry_ids:
+        scores = dict(carry)
+        pool = [(match, scores[match.id]) for match in session.query(User).filter(User.id.in_(carry_ids))]
+
+    fresh = rank_match_pool(session, user, diversity_pool_size(MATCHES_PER_SESSION) - len(pool), after)
+    if fresh:
+        last_match, last_score = fresh[-1]
+        after = (last_score, last_match.id)
+    pool.extend(fresh)
+    pool.sort(key=lambda entry: (entry[1], -entry[0].id), reverse=True)
+    return pool, after
+
+def filter_unmatched(session, user: User, candidate_ids: List[int], likers: Set[int]) -> List[int]:
+    """Drop candidates the user already acted on or who are in the user's "liked you" feed."""
+    matched = {
+        receiver_id for receiver_id, in session.query(Match.receiver_id).filter(
+            Match.sender_id == user.id,
+            Match.receiver_id.in_(candidate_ids)
         )
+    }
+    matched.update(likers)
+    return [candidate_id for candidate_id in candidate_ids if candidate_id not in matched]
+
+def rank_liked_you(session, user: User, likers: Set[int]) -> List[int]:
+    """Rank the users with a pending like for the user that the user has not acted on yet.
+
+    Args:
+        session: SQLAlchemy session
+        user: Requesting user
+        likers: IDs of users with a pending like for the user
+
+    Returns:
+        Candidate IDs in rank order
+    """
+    liker_ids = np.array(sorted(likers), dtype=np.int64)
+    if not len(liker_ids):
+        return []
+    seen = seen_sets.get(session, user.id)
+    liker_ids = liker_ids[~seen.contains_many(liker_ids)][:MAX_SCORED_CANDIDATES].tolist()
+    if not liker_ids:
+        return []
 
-        # Apply filters based on preferences
-        if user.preferred_age_min:
-            query = query.filter(User.age >= user.preferred_age_min)
-        if user.preferred_age_max:
-            query = query.filter(User.age <= user.preferred_age_max)
-        if user.preferred_university:
-            query = query.filter(User.university == user.preferred_university)
-
-        # Get all potential matches
-        potential_matches = query.all()
-
-        # Calculate match scores and sort
-        scored_matches = []
-        for match in potential_matches:
-            score = calculate_match_score(user, match)
-            scored_matches.append((match, score))
-
-        # Sort by score in descending order
-        scored_matches.sort(key=lambda x: x[1], reverse=True)
+    likers = session.query(User).filter(User.id.in_(liker_ids)).all()
+    top_likers = TopK(LIKED_YOU_FEED_SIZE)
+    top_likers.push(likers, score_cache.score(user, likers, MATCH_SCORE_WEIGHTS), [liker.id for liker in likers])
+    ranked = top_likers.items()
+    profile_cache.put_many(ranked)
+    return [liker.id for liker in ranked]
+
+def load_match_page(telegram_id: int, keyset: Optional[Dict], likers: Set[int]) -> Tuple[List[int], Optional[Dict]]:
+    """Fetch the next match feed page in its own session, for use off the event loop."""
+    with get_session() as session:
+        user = session.query(User).filter_by(telegram_id=telegram_id).first()
+        if not user:
+            return [], keyset
+        return fetch_match_page(session, user, keyset, likers)
+
+def load_feed_start(telegram_id: int, likers: Set[int]) -> Tuple[List[int], List[int], Optional[Dict]]:
+    """Rank the "liked you" feed and the first match feed page in one session, for use off the event loop."""
+    with get_session() as session:
+        user = session.query(User).filter_by(telegram_id=telegram_id).first()
+        if not user:
+            return [], [], None
+        liked_you = rank_liked_you(session, user, likers)
+        match_ids, keyset = fetch_match_page(session, user, None, likers)
+        return liked_you, match_ids, keyset
+
+def get_potential_matches(session, user: User, limit: int = MATCHES_PER_SESSION) -> List[User]:
+    """Get potential matches for a user based on preferences and compatibility."""
+    return [match for match, _ in rank_potential_matches(session, user, limit)]
+
+def diversity_pool_size(limit: int) -> int:
+    """Number of ranked candidates the diversity stage picks ``limit`` from."""
+    return limit * DIVERSITY_POOL_FACTOR if MATCH_DIVERSITY > 0 else limit
+
+def rank_potential_matches(
+    session,
+    user: User,
+    limit: int = MATCHES_PER_SESSION,
+    after: Optional[Tuple[float, int]] = None
+) -> List[Tuple[User, float]]:
+    """Rank potential matches, optionally starting below a ``(score, user_id)`` keyset."""
+    # Rank a wider pool so the diversity stage has alternatives to pick from
+    ranked = rank_match_pool(session, user, diversity_pool_size(limit), after)
+
+    # Re-rank for diversity, then truncate to the page size
+    return diversify(ranked, limit, MATCH_DIVERSITY, MATCH_SCORE_WEIGHTS)
+
+def rank_match_pool(
+    session,
+    user: User,
+    size: int,
+    after: Optional[Tuple[float, int]] = None
+) -> List[Tuple[User, float]]:
+    """Rank the best ``size`` potential matches in score order, below an optional keyset."""
+    try:
+        seen = seen_sets.get(session, user.id)
+        if RANKING_BACKEND == 'sql':
+            return rank_in_database(session, user, size, MATCH_SCORE_WEIGHTS, after, seen)
 
-        # Return top matches
-        return [match for match, _ in scored_matches[:10]]
+        if not candidate_index.ready:
+            batches = query_potential_matches(session, user, seen)
+        else:
+            batches = load_indexed_candidates(session, user, seen)
+
+        # Score candidates batch by batch, keeping only the best IDs in a bounded heap;
+        # rows are released once reduced to feature arrays, and only the winners are reloaded
+        top_matches = TopK(size, after)
+        for candidate_ids, scores in score_cache.score_batches(user, batches, MATCH_SCORE_WEIGHTS):
+            top_matches.push(candidate_ids, scores, candidate_ids)
+        return load_ranked(session, top_matches.scored())
     except Exception as e:
-        logger.error(f"Error in get_potential_matches: {e}")
+        logger.error(f"Error in rank_match_pool: {e}")
         return []
 
+def load_ranked(session, ranked: List[Tuple[int, float]]) -> List[Tuple[User, float]]:
+    """Load the users of ranked ``(user_id, score)`` pairs, keeping rank order."""
+    users = {user.id: user for user in session.query(User).filter(User.id.in_([user_id for user_id, _ in ranked]))}
+    return [(users[user_id], score) for user_id, score in ranked if user_id in users]
+
+def query_potential_matches(session, user: User, seen: SeenSet) -> Iterator[List[User]]:
+    """Stream potential matches straight from the database in batches."""
+    # Base query for potential matches
+    query = session.query(User).join(User.profile).filter(
+        User.id != user.id,
+        Profile.is_visible.is_(True),
+        Profile.gender != user.gender  # Match with opposite gender
+    )
+
+    # Apply filters based on preferences
+    if user.preferred_age_min:
+        query = query.filter(Profile.age >= user.preferred_age_min)
+    if user.preferred_age_max:
+        query = query.filter(Profile.age <= user.preferred_age_max)
+    if user.preferred_university:
+        query = query.filter(Profile.university == user.preferred_university)
+
+    # Drop users already seen, one batch at a time
+    batch = []
+    for match in query.yield_per(CANDIDATE_LOAD_BATCH_SIZE):
+        batch.append(match)
+        if len(batch) >= CANDIDATE_LOAD_BATCH_SIZE:
+            yield drop_seen(batch, seen)
+            batch = []
+    if batch:
+        yield drop_seen(batch, seen)
+
+def drop_seen(candidates: List[User], seen: SeenSet) -> List[User]:
+    """Remove candidates recorded in a seen set."""
+    already_seen = seen.contains_many(np.array([match.id for match in candidates], dtype=np.int64))
+    return [match for match, was_seen in zip(candidates, already_seen) if not was_seen]
+
+def retrieve_candidate_ids(user: User, seen: SeenSet) -> List[int]:
+    """Pick the indexed candidates worth scoring, strongest hobby overlap first."""
+    candidate_ids = np.fromiter(
+        candidate_index.candidates(
+            user.gender,
+            university=user.preferred_university,
+            age_min=user.preferred_age_min,
+            age_max=user.preferred_age_max
+        ),
+        dtype=np.int64
+    )
+    allowed = candidate_ids[
+        (candidate_ids != user.id) & ~seen.contains_many(candidate_ids)
+    ].tolist()
+    if len(allowed) <= MAX_SCORED_CANDIDATES:
+        return allowed
+
+    # Group candidates by number of shared hobbies, counting a similar bio as one more
+    allowed_ids = set(allowed)
+    overlap = hobby_index.overlap_counts(feature_cache.get(user).hobby_ids, allowed_ids)
+    for candidate_id in bio_similarity.similar(user) & allowed_ids:
+        overlap[candidate_id] = overlap.get(candidate_id, 0) + 1
+    by_overlap = defaultdict(list)
+    for candidate_id, common in overlap.items():
+        by_overlap[common].append(candidate_id)
+
+    # Take the strongest overlap groups until the scoring budget is filled
+    selected = []
+    for common in sorted(by_overlap, reverse=True):
+        selected.extend(by_overlap[common])
+        if len(selected) >= MAX_SCORED_CANDIDATES:
+            return selected[:MAX_SCORED_CANDIDATES]
+
+    for candidate_id in allowed:
+        if candidate_id not in overlap:
+            selected.append(candidate_id)
+            if len(selected) >= MAX_SCORED_CANDIDATES:
+                break
+    return selected
+
+def load_indexed_candidates(session, user: User, seen: SeenSet) -> Iterator[List[User]]:
+    """Stream potential matches retrieved from the in-memory indexes in batches."""
+    candidate_ids = retrieve_candidate_ids(user, seen)
+
+    for start in range(0, len(candidate_ids), CANDIDATE_LOAD_BATCH_SIZE):
+        batch = candidate_ids[start:start + CANDIDATE_LOAD_BATCH_SIZE]
+        yield session.query(User).filter(User.id.in_(batch)).all()
+
 def calculate_match_score(user1: User, user2: User) -> float:
     """Calculate compatibility score between two users."""
     try:
@@ -130,43 +409,56 @@ def calculate_match_score(user1: User, user2: User) -> float:
         if user1.university == user2.university:
             score += MATCH_SCORE_WEIGHTS['university']
 
-        # Bio similarity (simple word matching)
-        if user1.bio and user2.bio:
-            common_words = set(user1.bio.lower().split()) & set(user2.bio.lower().split())
-            if common_words:
-                score += MATCH_SCORE_WEIGHTS['bio'] * (len(common_words) / 10)
+        # Bio similarity (pluggable backend)
+        bio_score = bio_similarity.pair(user1, user2)
+        if bio_score:
+            score += MATCH_SCORE_WEIGHTS['bio'] * bio_score
 
         # Hobbies similarity
-        if user1.hobbies and user2.hobbies:
-            common_hobbies = set(user1.hobbies.lower().split(',')) & set(user2.hobbies.lower().split(','))
-            if common_hobbies:
-                score += MATCH_SCORE_WEIGHTS['hobbies'] * (len(common_hobbies) / 5)
+        common_hobbies = len(set(feature_cache.get(user1).hobby_ids).intersection(
+            feature_cache.get(user2).hobby_ids
+        ))
+        if common_hobbies:
+            score += MATCH_SCORE_WEIGHTS['hobbies'] * (common_hobbies / 5)
+
+        # Candidate engagement
+        score += MATCH_SCORE_WEIGHTS['engagement'] * engagement_of(user2)
 
         return score
     except Exception as e:
         logger.error(f"Error in calculate_match_score: {e}")
         return 0.0
 
-async def show_next_match(message: types.Message, state: FSMContext):
+async def show_next_match(message: types.Message, state: FSMContext, session: AsyncSession):
     """Show the next potential match."""
     try:
-        data = await state.get_data()
-        potential_matches = data.get('potential_matches', [])
-        
-        if not potential_matches:
-            await message.answer(
-                "No more potential matches found. Try again later!",
-                reply_markup=get_main_menu_keyboard()
-            )
-            await state.clear()
-            return
+        async with get_feed_lock(message.chat.id):
+            data = await state.get_data()
+            match_ids = data.get('match_ids', [])
+            cursor = data.get('match_cursor', 0)
+
+            # Advance to the next candidate whose profile still exists
+            match = None
+            while match is None and cursor < len(match_ids):
+                match = await profile_cache.get(match_ids[cursor], session)
+                cursor += 1
+
+            if match is None:
+                await message.answer(
+                    "No more potential matches found. Try again later!",
+                    reply_markup=get_main_menu_keyboard()
+                )
+                await state.clear()
+                return
 
-        # Get next match
-        match = potential_matches.pop(0)
-        await state.update_data(potential_matches=potential_matches)
+            await state.update_data(match_cursor=cursor)
+
+        # Prefetch the next page while the user looks at this card
+        if len(match_ids) - cursor < MATCH_PREFETCH_THRESHOLD and not data.get('feed_exhausted'):
+            schedule_match_prefetch(message.chat.id, state)
 
         # Format match profile
-        profile_text = format_match_profile(match)
+        profile_text = format_match_profile(match, liked_you=match.id in data.get('liked_you', ()))
         
         # Send match profile with photo
         if match.photo_id:
@@ -185,112 +477,160 @@ async def show_next_match(message: types.Message, state: FSMContext):
         await message.answer(ERROR_MESSAGES['database_error'])
         await state.clear()
 
-async def process_match_choice(callback: types.CallbackQuery, state: FSMContext):
+def get_feed_lock(chat_id: int) -> asyncio.Lock:
+    """Get the lock serializing match feed state updates for a chat."""
+    lock = _feed_locks.get(chat_id)
+    if lock is None:
+        lock = _feed_locks[chat_id] = asyncio.Lock()
+    return lock
+
+def schedule_match_prefetch(chat_id: int, state: FSMContext) -> None:
+    """Start fetching the next match feed page in the background."""
+    if chat_id in _prefetching:
+        return
+    _prefetching.add(chat_id)
+    asyncio.create_task(prefetch_match_page(chat_id, state))
+
+async def prefetch_match_page(chat_id: int, state: FSMContext):
+    """Append the next ranked page to the match feed buffer."""
+    try:
+        data = await state.get_data()
+        likers = await like_index.likers(data['user_id'])
+        page_ids, keyset = await run_blocking(load_match_page, chat_id, data.get('match_keyset'), likers)
+
+        async with get_feed_lock(chat_id):
+            data = await state.get_data()
+            if 'match_ids' not in data:
+                return  # Matching session ended meanwhile
+            cursor = data.get('match_cursor', 0)
+            # Queue and ranked pages may both hold a candidate not decided on yet
+            buffered = set(data['match_ids'])
+            await state.update_data(
+                match_ids=data['match_ids'][cursor:] + [
+                    candidate_id for candidate_id in page_ids if candidate_id not in buffered
+                ],
+                match_cursor=0,
+                match_keyset=keyset,
+                feed_exhausted=not page_ids
+            )
+    except Exception as e:
+        logger.error(f"Error in prefetch_match_page: {e}")
+    finally:
+        _prefetching.discard(chat_id)
+
+async def process_match_choice(callback: types.CallbackQuery, state: FSMContext, session: AsyncSession):
     """Process user's choice (like/skip) for a match."""
     try:
         action, user_id = callback.data.split(':')
         user_id = int(user_id)
 
-        with get_session() as session:
-            current_user = session.query(User).filter_by(telegram_id=callback.from_user.id).first()
+        data = await state.get_data()
+        current_user_id = data.get('user_id')
+        if current_user_id is None:
+            current_user = await session.scalar(select(User).filter_by(telegram_id=callback.from_user.id))
             if not current_user:
                 await callback.message.answer(ERROR_MESSAGES['profile_required'])
                 return
+            current_user_id = current_user.id
+            await state.update_data(user_id=current_user_id)
 
-            if action == 'like':
-                # Check if it's a mutual match
-                existing_match = session.query(Match).filter(
-                    Match.user_id == user_id,
-                    Match.matched_user_id == current_user.id,
-                    Match.status == 'liked'
-                ).first()
-
-                if existing_match:
-                    # It's a mutual match!
-                    existing_match.status = 'matched'
-                    match = Match(
-                        user_id=current_user.id,
-                        matched_user_id=user_id,
-                        status='matched'
-                    )
-                    session.add(match)
-
-                    # Notify both users
-                    await notify_mutual_match(callback.bot, current_user, user_id)
-                    await announce_match(callback.bot, current_user, user_id)
-                else:
-                    # Create new match
-                    match = Match(
-                        user_id=current_user.id,
-                        matched_user_id=user_id,
-                        status='liked'
-                    )
-                    session.add(match)
-
-                await callback.message.answer("❤️ You've liked this profile!")
-            else:  # skip
-                await callback.message.answer("⏭️ Skipped this profile.")
-
-            # Show next match
-            await show_next_match(callback.message, state)
-            await callback.answer()
+        if action == 'like':
+            if not await daily_limits.try_consume(current_user_id, 'match', DAILY_MATCH_LIMIT):
+                await callback.message.answer(
+                    f"You've reached your daily match limit of {DAILY_MATCH_LIMIT}. "
+                    "Please try again tomorrow!"
+                )
+                await state.clear()
+                await callback.answer()
+                return
+
+            # Mutual matches are detected in memory; the rows are written behind
+            if await decision_buffer.like(current_user_id, user_id):
+                users = await load_users(session, [current_user_id, user_id])
+                if current_user_id in users and user_id in users:
+                    schedule_match_notification(callback.bot, users[current_user_id], users[user_id])
+
+            await callback.message.answer("❤️ You've liked this profile!")
+        else:  # skip
+            decision_buffer.skip(current_user_id, user_id)
+            await callback.message.answer("⏭️ Skipped this profile.")
+
+        # Show next match
+        await show_next_match(callback.message, state, session)
+        await callback.answer()
     except Exception as e:
         logger.error(f"Error in process_match_choice: {e}")
         await callback.message.answer(ERROR_MESSAGES['database_error'])
         await state.clear()
 
-async def notify_mutual_match(bot, user: User, matched_user_id: int):
-    """Notify users of a mutual match."""
+def schedule_match_notification(bot, user: User, matched_user: User) -> None:
+    """Run the mutual-match notifications in the background, once per pair."""
+    pair = frozenset((user.id, matched_user.id))
+    if pair in _notifications:
+        return
+    task = asyncio.create_task(notify_mutual_match(bot, user, matched_user))
+    _notifications[pair] = task
+    task.add_done_callback(lambda _: _notifications.pop(pair, None))
+
+async def load_users(session: AsyncSession, user_ids: List[int]) -> Dict[int, User]:
+    """Load users by ID in one query."""
+    users = await session.scalars(select(User).where(User.id.in_(user_ids)))
+    return {user.id: user for user in users}
+
+async def notify_mutual_match(bot, user: User, matched_user: User):
+    """Notify both users of a mutual match and announce it in the official channel."""
     try:
-        with get_session() as session:
-            matched_user = session.query(User).get(matched_user_id)
-            if not matched_user:
-                return
-
-            # Notify first user
-            await bot.send_message(
+        results = await asyncio.gather(
+            bot.send_message(
                 chat_id=user.telegram_id,
                 text=f"🎉 It's a match! You and {matched_user.first_name} have liked each other!",
-                reply_markup=get_unmatch_keyboard(matched_user_id)
-            )
-
-            # Notify second user
-            await bot.send_message(
+                reply_markup=get_unmatch_keyboard(matched_user.id)
+            ),
+            bot.send_message(
                 chat_id=matched_user.telegram_id,
                 text=f"🎉 It's a match! You and {user.first_name} have liked each other!",
                 reply_markup=get_unmatch_keyboard(user.id)
-            )
+            ),
+            announce_match(bot, user, matched_user),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error sending mutual match notification: {result}")
     except Exception as e:
         logger.error(f"Error in notify_mutual_match: {e}")
 
-async def process_unmatch(callback: types.CallbackQuery):
+async def process_unmatch(callback: types.CallbackQuery, session: AsyncSession):
     """Process unmatch request."""
     try:
         user_id = int(callback.data.split(':')[1])
-        
-        with get_session() as session:
-            # Update both match records
-            session.query(Match).filter(
-                (Match.user_id == callback.from_user.id) & (Match.matched_user_id == user_id) |
-                (Match.user_id == user_id) & (Match.matched_user_id == callback.from_user.id)
-            ).update({'status': 'unmatched'})
-
-            await callback.message.answer(
-                "You've unmatched with this user.",
-                reply_markup=get_main_menu_keyboard()
-            )
-            await callback.answer()
+
+        # Buffered decisions must land before their status is changed
+        await decision_buffer.flush()
+
+        # Update both match records
+        await session.execute(update(Match).where(
+            (Match.sender_id == callback.from_user.id) & (Match.receiver_id == user_id) |
+            (Match.sender_id == user_id) & (Match.receiver_id == callback.from_user.id)
+        ).values(status=MatchStatus.UNMATCHED))
+
+        await callback.message.answer(
+            "You've unmatched with this user.",
+            reply_markup=get_main_menu_keyboard()
+        )
+        await callback.answer()
     except Exception as e:
         logger.error(f"Error in process_unmatch: {e}")
         await callback.message.answer(ERROR_MESSAGES['database_error'])
 
-def format_match_profile(user: User) -> str:
+def format_match_profile(user: ProfileCard, liked_you: bool = False) -> str:
     """Format user profile for matching display."""
+    header = "💌 Liked You" if liked_you else "👤 Potential Match"
     return (
-        f"👤 Potential Match\n\n"
+        f"{header}\n\n"
         f"Name: {user.first_name} {user.last_name or ''}\n"
         f"Age: {user.age}\n"
-        f"University: {user.university}\n"
+        f"University: {user.university.value}\n"
         f"Bio: {user.bio}\n"
         f"Hobbies: {user.hobbies}"
     )
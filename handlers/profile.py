@@ -5,8 +5,19 @@ from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from datetime import datetime
 import logging
 
-from database.database import get_session
-from database.models import User, Gender
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models import Gender, Profile, University, User
+from matching.decisions import decision_buffer
+from matching.features import feature_cache
+from matching.index import candidate_index, hobby_index
+from matching.likes import like_index
+from matching.profiles import profile_cache
+from matching.queues import recommendation_queues
+from matching.score_cache import profile_versions
+from matching.scoring import bio_similarity
+from matching.seen import seen_sets
 from config import (
     MIN_AGE, MAX_AGE, MAX_BIO_LENGTH, MAX_HOBBIES_LENGTH,
     ERROR_MESSAGES
@@ -19,24 +30,23 @@ from .states import ProfileStates, EditProfileStates
 
 logger = logging.getLogger(__name__)
 
-async def start_profile(message: types.Message, state: FSMContext):
+async def start_profile(message: types.Message, state: FSMContext, session: AsyncSession):
     """Start the profile creation process."""
     try:
-        with get_session() as session:
-            # Check if profile already exists
-            existing_user = session.query(User).filter_by(telegram_id=message.from_user.id).first()
-            if existing_user:
-                await message.answer(
-                    "You already have a profile. Use /edit to modify it.",
-                    reply_markup=get_profile_edit_keyboard()
-                )
-                return
-
-            # Start profile creation
+        # Check if profile already exists
+        existing_user = await session.scalar(select(User).filter_by(telegram_id=message.from_user.id))
+        if existing_user:
             await message.answer(
-                f"Let's create your profile! First, how old are you? (Between {MIN_AGE} and {MAX_AGE})"
+                "You already have a profile. Use /edit to modify it.",
+                reply_markup=get_profile_edit_keyboard()
             )
-            await state.set_state(ProfileStates.waiting_for_age)
+            return
+
+        # Start profile creation
+        await message.answer(
+            f"Let's create your profile! First, how old are you? (Between {MIN_AGE} and {MAX_AGE})"
+        )
+        await state.set_state(ProfileStates.waiting_for_age)
     except Exception as e:
         logger.error(f"Error in start_profile: {e}")
         await message.answer(ERROR_MESSAGES['database_error'])
@@ -87,6 +97,10 @@ async def process_university(callback: types.CallbackQuery, state: FSMContext):
     """Process user's university selection."""
     try:
         university = callback.data.split(':')[1]
+        if university not in University.__members__:
+            await callback.answer(ERROR_MESSAGES['invalid_university'])
+            return
+
         await state.update_data(university=university)
         await callback.message.answer(
             f"Tell us about yourself (max {MAX_BIO_LENGTH} characters):"
@@ -132,7 +146,7 @@ async def process_hobbies(message: types.Message, state: FSMContext):
         await message.answer(ERROR_MESSAGES['invalid_input'])
         await state.clear()
 
-async def process_photo(message: types.Message, state: FSMContext):
+async def process_photo(message: types.Message, state: FSMContext, session: AsyncSession):
     """Process user's photo input."""
     try:
         if not message.photo:
@@ -142,20 +156,27 @@ async def process_photo(message: types.Message, state: FSMContext):
         photo_id = message.photo[-1].file_id
         data = await state.get_data()
         
-        with get_session() as session:
-            user = User(
-                telegram_id=message.from_user.id,
-                username=message.from_user.username,
-                first_name=message.from_user.first_name,
-                last_name=message.from_user.last_name,
+        user = User(
+            telegram_id=message.from_user.id,
+            username=message.from_user.username,
+            first_name=message.from_user.first_name,
+            last_name=message.from_user.last_name,
+            profile=Profile(
                 age=data['age'],
-                gender=data['gender'],
-                university=data['university'],
+                gender=Gender(data['gender']),
+                university=University[data['university']],
                 bio=data['bio'],
                 hobbies=data['hobbies'],
                 photo_id=photo_id
             )
-            session.add(user)
+        )
+        session.add(user)
+        await session.flush()
+
+        candidate_index.upsert_user(user)
+        hobby_index.update(user.id, feature_cache.put_user(user).hobby_ids)
+        bio_similarity.update(user)
+        recommendation_queues.mark_stale(user.id)
 
         await message.answer(
             "✅ Your profile has been created!",
@@ -167,45 +188,43 @@ async def process_photo(message: types.Message, state: FSMContext):
         await message.answer(ERROR_MESSAGES['database_error'])
         await state.clear()
 
-async def view_profile(message: types.Message):
+async def view_profile(message: types.Message, session: AsyncSession):
     """View user's profile."""
     try:
-        with get_session() as session:
-            user = session.query(User).filter_by(telegram_id=message.from_user.id).first()
-            if not user:
-                await message.answer(ERROR_MESSAGES['profile_required'])
-                return
+        user = await session.scalar(select(User).filter_by(telegram_id=message.from_user.id))
+        if not user:
+            await message.answer(ERROR_MESSAGES['profile_required'])
+            return
 
-            profile_text = format_profile(user)
-            if user.photo_id:
-                await message.answer_photo(
-                    photo=user.photo_id,
-                    caption=profile_text,
-                    reply_markup=get_profile_edit_keyboard()
-                )
-            else:
-                await message.answer(
-                    text=profile_text,
-                    reply_markup=get_profile_edit_keyboard()
-                )
+        profile_text = format_profile(user)
+        if user.photo_id:
+            await message.answer_photo(
+                photo=user.photo_id,
+                caption=profile_text,
+                reply_markup=get_profile_edit_keyboard()
+            )
+        else:
+            await message.answer(
+                text=profile_text,
+                reply_markup=get_profile_edit_keyboard()
+            )
     except Exception as e:
         logger.error(f"Error in view_profile: {e}")
         await message.answer(ERROR_MESSAGES['database_error'])
 
-async def start_profile_edit(message: types.Message, state: FSMContext):
+async def start_profile_edit(message: types.Message, state: FSMContext, session: AsyncSession):
     """Start the profile editing process."""
     try:
-        with get_session() as session:
-            user = session.query(User).filter_by(telegram_id=message.from_user.id).first()
-            if not user:
-                await message.answer(ERROR_MESSAGES['profile_required'])
-                return
+        user = await session.scalar(select(User).filter_by(telegram_id=message.from_user.id))
+        if not user:
+            await message.answer(ERROR_MESSAGES['profile_required'])
+            return
 
-            await message.answer(
-                "What would you like to edit?",
-                reply_markup=get_profile_edit_keyboard()
-            )
-            await state.set_state(EditProfileStates.waiting_for_field)
+        await message.answer(
+            "What would you like to edit?",
+            reply_markup=get_profile_edit_keyboard()
+        )
+        await state.set_state(EditProfileStates.waiting_for_field)
     except Exception as e:
         logger.error(f"Error in start_profile_edit: {e}")
         await message.answer(ERROR_MESSAGES['database_error'])
@@ -265,37 +284,47 @@ async def process_edit_field(callback: types.CallbackQuery, state: FSMContext):
         await callback.message.answer(ERROR_MESSAGES['invalid_input'])
         await state.clear()
 
-async def save_edit(message: types.Message, state: FSMContext):
+async def save_edit(message: types.Message, state: FSMContext, session: AsyncSession):
     """Save edited profile field."""
     try:
         data = await state.get_data()
         field = data['edit_field']
         value = message.text
 
-        with get_session() as session:
-            user = session.query(User).filter_by(telegram_id=message.from_user.id).first()
-            if not user:
-                await message.answer(ERROR_MESSAGES['profile_required'])
+        user = await session.scalar(select(User).filter_by(telegram_id=message.from_user.id))
+        if not user:
+            await message.answer(ERROR_MESSAGES['profile_required'])
+            return
+
+        if field == 'age':
+            age = int(value)
+            if not MIN_AGE <= age <= MAX_AGE:
+                await message.answer(ERROR_MESSAGES['invalid_age'])
                 return
+            user.age = age
+        elif field == 'bio':
+            if len(value) > MAX_BIO_LENGTH:
+                await message.answer(ERROR_MESSAGES['bio_too_long'])
+                return
+            user.bio = value
+        elif field == 'hobbies':
+            if len(value) > MAX_HOBBIES_LENGTH:
+                await message.answer(ERROR_MESSAGES['hobbies_too_long'])
+                return
+            user.hobbies = value
+
+        user.updated_at = datetime.utcnow()
+        await session.flush()
 
-            if field == 'age':
-                age = int(value)
-                if not MIN_AGE <= age <= MAX_AGE:
-                    await message.answer(ERROR_MESSAGES['invalid_age'])
-                    return
-                user.age = age
-            elif field == 'bio':
-                if len(value) > MAX_BIO_LENGTH:
-                    await message.answer(ERROR_MESSAGES['bio_too_long'])
-                    return
-                user.bio = value
-            elif field == 'hobbies':
-                if len(value) > MAX_HOBBIES_LENGTH:
-                    await message.answer(ERROR_MESSAGES['hobbies_too_long'])
-                    return
-                user.hobbies = value
-
-            user.updated_at = datetime.utcnow()
+        profile_versions.bump(user.id)
+        profile_cache.invalidate(user.id)
+        recommendation_queues.mark_stale(user.id)
+        await session.run_sync(recommendation_queues.invalidate_candidate, user.id)
+        if field == 'age':
+            candidate_index.upsert_user(user)
+        else:
+            hobby_index.update(user.id, feature_cache.put_user(user).hobby_ids)
+            bio_similarity.update(user)
 
         await message.answer(
             "✅ Profile updated successfully!",
@@ -309,7 +338,7 @@ async def save_edit(message: types.Message, state: FSMContext):
         await message.answer(ERROR_MESSAGES['database_error'])
         await state.clear()
 
-async def save_photo_edit(message: types.Message, state: FSMContext):
+async def save_photo_edit(message: types.Message, state: FSMContext, session: AsyncSession):
     """Save edited profile photo."""
     try:
         if not message.photo:
@@ -318,14 +347,16 @@ async def save_photo_edit(message: types.Message, state: FSMContext):
 
         photo_id = message.photo[-1].file_id
         
-        with get_session() as session:
-            user = session.query(User).filter_by(telegram_id=message.from_user.id).first()
-            if not user:
-                await message.answer(ERROR_MESSAGES['profile_required'])
-                return
+        user = await session.scalar(select(User).filter_by(telegram_id=message.from_user.id))
+        if not user:
+            await message.answer(ERROR_MESSAGES['profile_required'])
+            return
 
-            user.photo_id = photo_id
-            user.updated_at = datetime.utcnow()
+        user.photo_id = photo_id
+        user.updated_at = datetime.utcnow()
+        await session.flush()
+
+        profile_cache.invalidate(user.id)
 
         await message.answer(
             "✅ Profile photo updated successfully!",
@@ -337,7 +368,7 @@ async def save_photo_edit(message: types.Message, state: FSMContext):
         await message.answer(ERROR_MESSAGES['database_error'])
         await state.clear()
 
-async def save_gender_edit(callback: types.CallbackQuery, state: FSMContext):
+async def save_gender_edit(callback: types.CallbackQuery, state: FSMContext, session: AsyncSession):
     """Save edited gender."""
     try:
         gender = callback.data.split(':')[1]
@@ -345,14 +376,19 @@ async def save_gender_edit(callback: types.CallbackQuery, state: FSMContext):
             await callback.answer(ERROR_MESSAGES['invalid_gender'])
             return
 
-        with get_session() as session:
-            user = session.query(User).filter_by(telegram_id=callback.from_user.id).first()
-            if not user:
-                await callback.message.answer(ERROR_MESSAGES['profile_required'])
-                return
+        user = await session.scalar(select(User).filter_by(telegram_id=callback.from_user.id))
+        if not user:
+            await callback.message.answer(ERROR_MESSAGES['profile_required'])
+            return
 
-            user.gender = gender
-            user.updated_at = datetime.utcnow()
+        user.gender = Gender(gender)
+        user.updated_at = datetime.utcnow()
+        await session.flush()
+
+        candidate_index.upsert_user(user)
+        profile_cache.invalidate(user.id)
+        recommendation_queues.mark_stale(user.id)
+        await session.run_sync(recommendation_queues.invalidate_candidate, user.id)
 
         await callback.message.answer(
             "✅ Gender updated successfully!",
@@ -365,19 +401,28 @@ async def save_gender_edit(callback: types.CallbackQuery, state: FSMContext):
         await callback.message.answer(ERROR_MESSAGES['database_error'])
         await state.clear()
 
-async def save_university_edit(callback: types.CallbackQuery, state: FSMContext):
+async def save_university_edit(callback: types.CallbackQuery, state: FSMContext, session: AsyncSession):
     """Save edited university."""
     try:
         university = callback.data.split(':')[1]
+        if university not in University.__members__:
+            await callback.answer(ERROR_MESSAGES['invalid_university'])
+            return
         
-        with get_session() as session:
-            user = session.query(User).filter_by(telegram_id=callback.from_user.id).first()
-            if not user:
-                await callback.message.answer(ERROR_MESSAGES['profile_required'])
-                return
+        user = await session.scalar(select(User).filter_by(telegram_id=callback.from_user.id))
+        if not user:
+            await callback.message.answer(ERROR_MESSAGES['profile_required'])
+            return
+
+        user.university = University[university]
+        user.updated_at = datetime.utcnow()
+        await session.flush()
 
-            user.university = university
-            user.updated_at = datetime.utcnow()
+        profile_versions.bump(user.id)
+        candidate_index.upsert_user(user)
+        profile_cache.invalidate(user.id)
+        recommendation_queues.mark_stale(user.id)
+        await session.run_sync(recommendation_queues.invalidate_candidate, user.id)
 
         await callback.message.answer(
             "✅ University updated successfully!",
@@ -390,7 +435,7 @@ async def save_university_edit(callback: types.CallbackQuery, state: FSMContext)
         await callback.message.answer(ERROR_MESSAGES['database_error'])
         await state.clear()
 
-async def delete_profile(callback: types.CallbackQuery, state: FSMContext):
+async def delete_profile(callback: types.CallbackQuery, state: FSMContext, session: AsyncSession):
     """Delete user's profile."""
     try:
         if callback.data != "confirm_delete":
@@ -401,10 +446,22 @@ async def delete_profile(callback: types.CallbackQuery, state: FSMContext):
             await state.clear()
             return
 
-        with get_session() as session:
-            user = session.query(User).filter_by(telegram_id=callback.from_user.id).first()
-            if user:
-                session.delete(user)
+        user = await session.scalar(select(User).filter_by(telegram_id=callback.from_user.id))
+        if user:
+            decision_buffer.discard_user(user.id)
+            await session.run_sync(recommendation_queues.discard_user, user.id)
+            await session.run_sync(seen_sets.discard_user, user.id)
+            await session.delete(user)
+            await session.flush()
+
+        if user:
+            candidate_index.remove(user.id)
+            hobby_index.remove(user.id)
+            feature_cache.evict(user.id)
+            profile_cache.invalidate(user.id)
+            bio_similarity.remove(user.id)
+            await like_index.discard_user(user.id)
+            profile_versions.bump(user.id)
 
         await callback.message.answer(
             "Your profile has been deleted.",
@@ -424,7 +481,7 @@ def format_profile(user: User) -> str:
         f"Name: {user.first_name} {user.last_name or ''}\n"
         f"Age: {user.age}\n"
         f"Gender: {user.gender.value}\n"
-        f"University: {user.university}\n"
+        f"University: {user.university.value}\n"
         f"Bio: {user.bio}\n"
         f"Hobbies: {user.hobbies}\n\n"
         f"Last updated: {user.updated_at.strftime('%Y-%m-%d %H:%M')}"
@@ -1,4 +1,4 @@
-from aiogram import Router, F
+from aiogram import Dispatcher, Router, F
 from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
@@ -7,16 +7,23 @@ import logging
 from typing import Optional
 
 from config import (
-    ENABLE_REPORTS, ERROR_MESSAGE,
-    REPORT_SUBMITTED
+    ENABLE_REPORTS, ERROR_MESSAGES,
+    MESSAGES, ADMIN_IDS
 )
-from database.database import Database
+from database.models import ReportStatus
+from database.offload import get_threaded_db
 from handlers.states import ReportStates
-from handlers.keyboards import get_report_keyboard, get_admin_keyboard
+from handlers.keyboards import (
+    get_main_menu_keyboard, get_more_keyboard,
+    get_report_action_keyboard
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Pending reports shown per page of the admin report list
+REPORTS_PAGE_SIZE = 10
+
 # Create router
 router = Router()
 
@@ -34,7 +41,7 @@ async def start_report(message: Message, state: FSMContext):
             return
 
         # Check if user has a profile
-        db = Database()
+        db = get_threaded_db()
         user = await db.get_user_by_telegram_id(message.from_user.id)
         if not user:
             await message.answer(
@@ -43,17 +50,17 @@ async def start_report(message: Message, state: FSMContext):
             return
 
         # Set state
+        await state.update_data(reporter_id=user["id"])
         await state.set_state(ReportStates.waiting_for_user)
 
         # Send instructions
         await message.answer(
-            "Please send the username or ID of the user you want to report.",
-            reply_markup=get_report_keyboard()
+            "Please send the username or ID of the user you want to report."
         )
 
     except Exception as e:
         logger.error(f"Error starting report: {e}")
-        await message.answer(ERROR_MESSAGE.format(error=str(e)))
+        await message.answer(ERROR_MESSAGES['report_error'])
 
 @router.message(ReportStates.waiting_for_user)
 async def process_reported_user(message: Message, state: FSMContext):
@@ -65,31 +72,39 @@ async def process_reported_user(message: Message, state: FSMContext):
     """
     try:
         # Get reported user
-        reported_user = message.text.strip()
+        reported_user = (message.text or "").strip()
         if not reported_user:
             await message.answer("Please provide a valid username or ID.")
             return
 
+        db = get_threaded_db()
+        if reported_user.isdigit():
+            reported = await db.get_user_by_telegram_id(int(reported_user))
+        else:
+            reported = await db.get_user_by_username(reported_user.lstrip("@"))
+        if not reported:
+            await message.answer("No user found with that username or ID.")
+            return
+
         # Check if user is reporting themselves
-        if reported_user == str(message.from_user.id) or reported_user == f"@{message.from_user.username}":
+        if reported["telegram_id"] == message.from_user.id:
             await message.answer("You cannot report yourself.")
             return
 
         # Store reported user
-        await state.update_data(reported_user=reported_user)
+        await state.update_data(reported_id=reported["id"], reported_user=reported_user)
 
         # Set state
         await state.set_state(ReportStates.waiting_for_reason)
 
         # Send instructions
         await message.answer(
-            "Please provide the reason for your report.",
-            reply_markup=get_report_keyboard()
+            "Please provide the reason for your report."
         )
 
     except Exception as e:
         logger.error(f"Error processing reported user: {e}")
-        await message.answer(ERROR_MESSAGE.format(error=str(e)))
+        await message.answer(ERROR_MESSAGES['report_error'])
 
 @router.message(ReportStates.waiting_for_reason)
 async def process_report_reason(message: Message, state: FSMContext):
@@ -103,19 +118,19 @@ async def process_report_reason(message: Message, state: FSMContext):
         # Get report data
         data = await state.get_data()
         reported_user = data.get("reported_user")
-        reason = message.text.strip()
+        reason = (message.text or "").strip()
 
         if not reason:
             await message.answer("Please provide a valid reason.")
             return
 
         # Create report
-        db = Database()
+        db = get_threaded_db()
         report_data = {
-            "reporter_id": message.from_user.id,
-            "reported_user": reported_user,
+            "reporter_id": data["reporter_id"],
+            "reported_id": data["reported_id"],
             "reason": reason,
-            "status": "pending"
+            "status": ReportStatus.PENDING
         }
         report = await db.create_report(report_data)
 
@@ -124,7 +139,7 @@ async def process_report_reason(message: Message, state: FSMContext):
             return
 
         # Notify admins
-        for admin_id in config.ADMIN_IDS:
+        for admin_id in ADMIN_IDS:
             try:
                 await message.bot.send_message(
                     admin_id,
@@ -133,7 +148,7 @@ async def process_report_reason(message: Message, state: FSMContext):
                     f"Reported User: {reported_user}\n"
                     f"Reason: {reason}\n\n"
                     f"Report ID: {report['id']}",
-                    reply_markup=get_admin_keyboard(report['id'])
+                    reply_markup=get_report_action_keyboard(report['id'])
                 )
             except Exception as e:
                 logger.error(f"Error notifying admin {admin_id}: {e}")
@@ -143,13 +158,13 @@ async def process_report_reason(message: Message, state: FSMContext):
 
         # Send confirmation
         await message.answer(
-            REPORT_SUBMITTED,
+            MESSAGES['report_submitted'],
             reply_markup=get_main_menu_keyboard()
         )
 
     except Exception as e:
         logger.error(f"Error processing report reason: {e}")
-        await message.answer(ERROR_MESSAGE.format(error=str(e)))
+        await message.answer(ERROR_MESSAGES['report_error'])
 
 @router.callback_query(F.data.startswith("report_"))
 async def handle_report_action(callback: CallbackQuery, state: FSMContext):
@@ -161,7 +176,7 @@ async def handle_report_action(callback: CallbackQuery, state: FSMContext):
     """
     try:
         # Check if user is admin
-        if callback.from_user.id not in config.ADMIN_IDS:
+        if callback.from_user.id not in ADMIN_IDS:
             await callback.answer("You don't have permission to perform this action.")
             return
 
@@ -170,7 +185,7 @@ async def handle_report_action(callback: CallbackQuery, state: FSMContext):
         action = callback.data.split("_")[2]
 
         # Get report
-        db = Database()
+        db = get_threaded_db()
         report = await db.get_report(report_id)
         if not report:
             await callback.answer("Report not found.")
@@ -178,10 +193,10 @@ async def handle_report_action(callback: CallbackQuery, state: FSMContext):
 
         # Update report status
         if action == "approve":
-            status = "reviewed"
+            status = ReportStatus.APPROVED
             message = "Report approved"
         elif action == "reject":
-            status = "resolved"
+            status = ReportStatus.REJECTED
             message = "Report rejected"
         else:
             await callback.answer("Invalid action.")
@@ -195,12 +210,14 @@ async def handle_report_action(callback: CallbackQuery, state: FSMContext):
 
         # Notify reporter
         try:
-            await callback.bot.send_message(
-                report["reporter_id"],
-                f"Your report has been {status}.\n\n"
-                f"Report ID: {report_id}\n"
-                f"Status: {status}"
-            )
+            reporter = await db.get_user(report["reporter_id"])
+            if reporter:
+                await callback.bot.send_message(
+                    reporter["telegram_id"],
+                    f"Your report has been {status.value}.\n\n"
+                    f"Report ID: {report_id}\n"
+                    f"Status: {status.value}"
+                )
         except Exception as e:
             logger.error(f"Error notifying reporter: {e}")
 
@@ -209,7 +226,83 @@ async def handle_report_action(callback: CallbackQuery, state: FSMContext):
 
     except Exception as e:
         logger.error(f"Error handling report action: {e}")
-        await callback.answer(ERROR_MESSAGE.format(error=str(e)))
+        await callback.answer(ERROR_MESSAGES['report_error'])
+
+async def show_reports_page(message: Message, state: FSMContext, cursor: Optional[str] = None) -> None:
+    """Send one page of pending reports, newest first, and keep the next cursor in the FSM data.
+
+    Args:
+        message: Message to answer
+        state: FSM context
+        cursor: Cursor of the page to send, or None for the first page
+    """
+    reports, next_cursor = await get_threaded_db().get_reports_page(
+        status=ReportStatus.PENDING, cursor=cursor, limit=REPORTS_PAGE_SIZE
+    )
+    await state.update_data(reports_cursor=next_cursor)
+
+    if not reports and not cursor:
+        await message.answer("No pending reports.")
+        return
+
+    await message.answer("\n\n".join(
+        f"Report #{report['id']}\n"
+        f"Reporter: {report['reporter_id']}\n"
+        f"Reported User: {report['reported_id']}\n"
+        f"Reason: {report['reason']}"
+        for report in reports
+    ))
+    if next_cursor:
+        await message.answer(
+            "Load older reports?",
+            reply_markup=get_more_keyboard("reports_more")
+        )
+
+@router.callback_query(F.data == "view_reports")
+async def view_reports(callback: CallbackQuery, state: FSMContext):
+    """List pending reports to an admin, one page at a time.
+    
+    Args:
+        callback: Callback query
+        state: FSM context
+    """
+    try:
+        if callback.from_user.id not in ADMIN_IDS:
+            await callback.answer("You don't have permission to perform this action.")
+            return
+
+        await show_reports_page(callback.message, state)
+        await callback.answer()
+
+    except Exception as e:
+        logger.error(f"Error viewing reports: {e}")
+        await callback.answer(ERROR_MESSAGES['report_error'])
+
+@router.callback_query(F.data == "reports_more")
+async def more_reports(callback: CallbackQuery, state: FSMContext):
+    """Show the next page of pending reports.
+    
+    Args:
+        callback: Callback query
+        state: FSM context
+    """
+    try:
+        if callback.from_user.id not in ADMIN_IDS:
+            await callback.answer("You don't have permission to perform this action.")
+            return
+
+        cursor = (await state.get_data()).get("reports_cursor")
+        if not cursor:
+            await callback.answer("No more reports.")
+            return
+
+        await callback.message.edit_reply_markup(reply_markup=None)
+        await show_reports_page(callback.message, state, cursor)
+        await callback.answer()
+
+    except Exception as e:
+        logger.error(f"Error showing more reports: {e}")
+        await callback.answer(ERROR_MESSAGES['report_error'])
 
 def register_handlers(dp: Dispatcher):
     """Register report handlers.
@@ -36,5 +36,6 @@ class ChannelStates(StatesGroup):
 
 class ReportStates(StatesGroup):
     """States for reporting process."""
+    waiting_for_user = State()
     waiting_for_reason = State()
     waiting_for_confirmation = State() 
\ No newline at end of file
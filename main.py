@@ -8,6 +8,7 @@ from aiogram.enums import ParseMode
 from aiogram.filters import Command
 from aiogram.types import Update, Message
 from aiogram.utils.exceptions import TelegramAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import (
     BOT_TOKEN, REDIS_URL, LOG_LEVEL, LOG_FORMAT,
@@ -16,8 +17,16 @@ from config import (
     BOT_USERNAME, WEBHOOK_URL, WEBHOOK_PATH,
     MESSAGES, ERROR_MESSAGES, LOG_FILE
 )
+from database.connection import async_db
 from database.database import init_db, close_db, get_session
+from database.limits import daily_limits
+from database.offload import get_threaded_db, shutdown_threaded_db
 from database.models import User
+from matching.decisions import decision_buffer
+from matching.index import candidate_index, hobby_index
+from matching.likes import like_index, pending_likes
+from matching.queues import recommendation_queues
+from matching.scoring import bio_similarity, scoring_pool
 from handlers import (
     profile, match, confession, channel, report,
     states, keyboards,
@@ -29,7 +38,7 @@ from handlers import (
 from handlers.profile import register_profile_handlers
 from handlers.confession import register_confession_handlers
 from handlers.channel import register_channel_handlers, check_channel_membership
-from handlers.match import register_match_handlers
+from handlers.match import register_match_handlers, rank_potential_matches
 from handlers.states import (
     ProfileStates, EditProfileStates, ConfessionStates,
     ChannelStates, MatchStates
@@ -102,24 +111,23 @@ async def setup_bot(dp: Dispatcher, db: Database):
         logger.error(f"Error setting up bot: {e}")
         raise
 
-async def start_command(message: Message) -> None:
+async def start_command(message: Message, session: AsyncSession) -> None:
     """Handle /start command."""
     try:
-        with get_session() as session:
-            user = session.query(User).get(message.from_user.id)
-            if not user:
-                user = User(
-                    id=message.from_user.id,
-                    username=message.from_user.username,
-                    first_name=message.from_user.first_name,
-                    last_name=message.from_user.last_name,
-                    created_at=message.date
-                )
-                session.add(user)
-                session.commit()
-                await message.answer(MESSAGES['welcome_new'])
-            else:
-                await message.answer(MESSAGES['welcome_back'])
+        user = await session.get(User, message.from_user.id)
+        if not user:
+            user = User(
+                id=message.from_user.id,
+                username=message.from_user.username,
+                first_name=message.from_user.first_name,
+                last_name=message.from_user.last_name,
+                created_at=message.date
+            )
+            session.add(user)
+            await session.flush()
+            await message.answer(MESSAGES['welcome_new'])
+        else:
+            await message.answer(MESSAGES['welcome_back'])
     except Exception as e:
         logger.error(f"Error in start_command: {e}")
         await message.answer(ERROR_MESSAGES['database_error'])
@@ -149,8 +157,17 @@ async def error_handler(update: Update, exception: Exception) -> None:
 async def main() -> None:
     """Main function."""
     try:
-        # Initialize database
+        # Initialize database and the thread pool running blocking database calls
         await init_db()
+        get_threaded_db()
+
+        # Build in-memory matching indexes
+        with get_session() as session:
+            candidate_index.build(session)
+            hobby_index.build(session)
+            bio_similarity.build(session)
+            likes = pending_likes(session)
+        await like_index.build(likes)
         
         # Set up bot
         await setup_commands()
@@ -160,9 +177,23 @@ async def main() -> None:
         # Register error handler
         dp.errors.register(error_handler)
         
+        # Start background recommendation queue refresh
+        recommendation_queues.start(rank_potential_matches)
+        
+        # Seed daily limit counters and start flushing them to the database
+        await daily_limits.start()
+        
+        # Start writing buffered like/skip decisions
+        decision_buffer.start()
+        
         # Start polling
         logger.info("Starting bot...")
-        await dp.start_polling(bot)
+        try:
+            await dp.start_polling(bot)
+        finally:
+            await decision_buffer.stop()
+            await daily_limits.stop()
+            await async_db.dispose()
     except Exception as e:
         logger.error(f"Error in main: {e}")
         sys.exit(1)
@@ -176,4 +207,7 @@ if __name__ == "__main__":
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
     finally:
+        decision_buffer.drain()
+        scoring_pool.shutdown()
+        shutdown_threaded_db()
         close_db() 
\ No newline at end of file
@@ -0,0 +1 @@
+"""Matching engine package initialization."""
@@ -0,0 +1,250 @@
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DataError, IntegrityError
+
+from config import DECISION_FLUSH_INTERVAL_MS, DECISION_FLUSH_SIZE
+from database.database import get_session
+from database.offload import run_blocking
+from database.models import Match, MatchStatus
+from .engagement import apply_reactions
+from .likes import LikeIndex, like_index
+from .seen import seen_sets
+
+logger = logging.getLogger(__name__)
+
+# (action, user_id, target_id) with action one of 'like', 'match' or 'skip'
+Decision = Tuple[str, int, int]
+
+class DecisionBuffer:
+    """Write-behind buffer for like and skip decisions.
+
+    Decisions are applied to the like index and the deciding user's seen
+    set immediately and written to the database in batches, either every
+    ``flush_interval_ms`` or as soon as ``flush_size`` decisions are pending.
+    """
+
+    def __init__(
+        self,
+        likes: LikeIndex = like_index,
+        flush_interval_ms: int = DECISION_FLUSH_INTERVAL_MS,
+        flush_size: int = DECISION_FLUSH_SIZE
+    ):
+        """Initialize an empty buffer.
+
+        Args:
+            likes: Like index used for mutual-match detection
+            flush_interval_ms: Milliseconds between flushes
+            flush_size: Pending decisions that trigger an early flush
+        """
+        self.likes = likes
+        self.flush_interval = flush_interval_ms / 1000
+        self.flush_size = flush_size
+        self._events: List[Decision] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    async def like(self, user_id: int, liked_id: int) -> bool:
+        """Record a like.
+
+        Args:
+            user_id: ID of the user who liked
+            liked_id: ID of the liked user
+
+        Returns:
+            True if the like completes a mutual match
+        """
+        mutual = await self.likes.like(user_id, liked_id)
+        self._append(('match' if mutual else 'like', user_id, liked_id))
+        return mutual
+
+    def skip(self, user_id: int, skipped_id: int) -> None:
+        """Record a skip.
+
+        Args:
+            user_id: ID of the user who skipped
+            skipped_id: ID of the skipped user
+        """
+        self._append(('skip', user_id, skipped_id))
+
+    def discard_user(self, user_id: int) -> None:
+        """Drop pending decisions from or about a user.
+
+        Args:
+            user_id: User ID
+        """
+        with self._lock:
+            self._events = [event for event in self._events if user_id not in event[1:]]
+
+    def _append(self, event: Decision) -> None:
+        seen_sets.mark(event[1], (event[2],))
+        with self._lock:
+            self._events.append(event)
+            full = len(self._events) >= self.flush_size
+        if full and self._wakeup is not None:
+            self._wakeup.set()
+
+    def flush_events(self) -> int:
+        """Write all pending decisions in one transaction.
+
+        Likes of a pair that already has a match row are ignored. If the
+        database rejects the batch, the decisions are retried one by one and
+        those it rejects are dropped. Decisions are put back at the head of
+        the buffer if the write fails for any other reason.
+
+        Returns:
+            Number of decisions written
+        """
+        with self._flush_lock:
+            with self._lock:
+                events, self._events = self._events, []
+            if not events:
+                return 0
+            try:
+                self._write(events)
+            except (IntegrityError, DataError):
+                return self._write_each(events)
+            except Exception:
+                with self._lock:
+                    self._events[:0] = events
+                raise
+            return len(events)
+
+    def _write_each(self, events: List[Decision]) -> int:
+        written = 0
+        for position, event in enumerate(events):
+            try:
+                self._write([event])
+                written += 1
+            except (IntegrityError, DataError) as e:
+                logger.error(f"Dropping match decision {event} the database rejected: {e}")
+            except Exception:
+                with self._lock:
+                    self._events[:0] = events[position:]
+                raise
+        return written
+
+    def _write(self, events: List[Decision]) -> None:
+        statuses: Dict[Tuple[int, int], MatchStatus] = {}
+        promoted: List[Tuple[int, int]] = []
+        seen: Dict[int, Set[int]] = defaultdict(set)
+        reactions: Dict[int, Dict[str, int]] = defaultdict(lambda: {'likes': 0, 'skips': 0})
+
+        for action, user_id, target_id in events:
+            seen[user_id].add(target_id)
+            if action == 'skip':
+                reactions[target_id]['skips'] += 1
+                continue
+            reactions[target_id]['likes'] += 1
+
+            # The liked user still gets to see the liker, in their "liked you" feed
+            if action == 'like':
+                statuses[(user_id, target_id)] = MatchStatus.PENDING
+            else:
+                statuses[(user_id, target_id)] = MatchStatus.ACCEPTED
+                if (target_id, user_id) in statuses:
+                    statuses[(target_id, user_id)] = MatchStatus.ACCEPTED
+                else:
+                    promoted.append((target_id, user_id))
+                # A like stored before the like index knew of it is promoted too
+                promoted.append((user_id, target_id))
+
+        with get_session() as session:
+            if statuses:
+                insert_matches(session, [
+                    {'sender_id': user_id, 'receiver_id': target_id, 'status': status}
+                    for (user_id, target_id), status in statuses.items()
+                ])
+            if promoted:
+                session.query(Match).filter(
+                    Match.status == MatchStatus.PENDING,
+                    tuple_(Match.sender_id, Match.receiver_id).in_(promoted)
+                ).update({'status': MatchStatus.ACCEPTED}, synchronize_session=False)
+            apply_reactions(session, reactions)
+            for user_id, seen_ids in seen.items():
+                seen_sets.add(session, user_id, seen_ids)
+
+    async def flush(self) -> int:
+        """Write pending decisions in a worker thread.
+
+        Returns:
+            Number of decisions written
+        """
+        return await run_blocking(self.flush_events)
+
+    def drain(self) -> None:
+        """Synchronously write whatever is still pending, e.g. at interpreter exit."""
+        try:
+            written = self.flush_events()
+            if written:
+                logger.info(f"Drained {written} pending match decisions")
+        except Exception as e:
+            logger.error(f"Error draining match decisions, {len(self)} lost: {e}")
+
+    async def run(self) -> None:
+        """Flush decisions periodically or whenever the buffer fills up."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing match decisions: {e}")
+
+    def start(self) -> None:
+        """Start the background flush job on the running event loop."""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Stop the background flush job and write any pending decisions."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Error flushing match decisions on shutdown: {e}")
+
+def insert_matches(session, rows: List[Dict]) -> None:
+    """Insert match rows, skipping pairs that already have one.
+
+    Args:
+        session: SQLAlchemy session
+        rows: Column mappings with ``sender_id``, ``receiver_id`` and ``status``
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        session.execute(
+            insert(Match).on_conflict_do_nothing(index_elements=['sender_id', 'receiver_id']),
+            rows
+        )
+        return
+
+    existing = set(session.execute(select(Match.sender_id, Match.receiver_id).where(
+        tuple_(Match.sender_id, Match.receiver_id).in_([(row['sender_id'], row['receiver_id']) for row in rows])
+    )).all())
+    rows = [row for row in rows if (row['sender_id'], row['receiver_id']) not in existing]
+    if rows:
+        session.bulk_insert_mappings(Match, rows)
+
+decision_buffer = DecisionBuffer()
@@ -0,0 +1,99 @@
+import logging
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .scoring import CandidateFeatures, overlap_counts
+
+logger = logging.getLogger(__name__)
+
+def _jaccard(indptr: np.ndarray, indices: np.ndarray, position: int) -> np.ndarray:
+    """Jaccard similarity of one CSR row's token set with every row's."""
+    tokens = indices[indptr[position]:indptr[position + 1]]
+    sizes = np.diff(indptr)
+    common = overlap_counts(indptr, indices, tokens)
+    union = sizes + len(tokens) - common
+    return np.divide(common, union, out=np.zeros(len(sizes), dtype=np.float64), where=union > 0)
+
+def profile_similarity(features: CandidateFeatures, position: int, weights: Dict[str, float]) -> np.ndarray:
+    """Similarity in [0, 1] between one candidate and every candidate of a batch.
+
+    Uses the same features and term weights as the match score: age
+    closeness, same university, and bio and hobby token overlap.
+
+    Args:
+        features: Candidate feature arrays
+        position: Position of the candidate to compare
+        weights: Score weights keyed by term name
+
+    Returns:
+        Array of similarities aligned with the batch
+    """
+    age_diff = np.abs(features.ages - features.ages[position])
+    similarity = weights['age'] * np.where(age_diff <= 2, 1.0, np.where(age_diff <= 5, 0.7, 0.3))
+    similarity += weights['university'] * (features.universities == features.universities[position])
+    similarity += weights['bio'] * _jaccard(features.bio_indptr, features.bio_indices, position)
+    similarity += weights['hobbies'] * _jaccard(features.hobby_indptr, features.hobby_indices, position)
+    return similarity / (weights['age'] + weights['university'] + weights['bio'] + weights['hobbies'])
+
+def mmr_order(
+    scores: np.ndarray,
+    features: CandidateFeatures,
+    k: int,
+    diversity: float,
+    weights: Dict[str, float]
+) -> List[int]:
+    """Select k candidates by maximal marginal relevance.
+
+    Each step picks the candidate maximizing
+    ``(1 - diversity) * relevance - diversity * max similarity to those picked``,
+    with relevance the score rescaled to [0, 1]. Only the newly picked
+    candidate's similarities are computed per step, so the cost is O(N * k).
+
+    Args:
+        scores: Match scores of the candidates, in rank order
+        features: Candidate feature arrays aligned with ``scores``
+        k: Number of candidates to select
+        diversity: Trade-off between 0 (pure score order) and 1 (pure novelty)
+        weights: Score weights keyed by term name, used for similarity
+
+    Returns:
+        Positions of the selected candidates in selection order
+    """
+    spread = scores.max() - scores.min() if len(scores) else 0.0
+    relevance = (scores - scores.min()) / spread if spread > 0 else np.ones(len(scores))
+
+    max_similarity = np.zeros(len(scores), dtype=np.float64)
+    available = np.ones(len(scores), dtype=bool)
+    selected: List[int] = []
+    for _ in range(min(k, len(scores))):
+        marginal = (1 - diversity) * relevance - diversity * max_similarity
+        marginal[~available] = -np.inf
+        position = int(np.argmax(marginal))  # ties go to the better-ranked candidate
+        selected.append(position)
+        available[position] = False
+        max_similarity = np.maximum(max_similarity, profile_similarity(features, position, weights))
+    return selected
+
+def diversify(
+    ranked: Sequence[Tuple[Any, float]],
+    k: int,
+    diversity: float,
+    weights: Dict[str, float]
+) -> List[Tuple[Any, float]]:
+    """Re-rank the top of a ranked candidate list for diversity.
+
+    Args:
+        ranked: ``(candidate, score)`` pairs in rank order
+        k: Number of candidates to keep
+        diversity: Trade-off between 0 (pure score order) and 1 (pure novelty)
+        weights: Score weights keyed by term name
+
+    Returns:
+        Up to k ``(candidate, score)`` pairs in display order
+    """
+    if diversity <= 0 or len(ranked) <= 1:
+        return list(ranked[:k])
+    scores = np.array([score for _, score in ranked], dtype=np.float64)
+    features = CandidateFeatures.from_users([candidate for candidate, _ in ranked])
+    return [ranked[position] for position in mmr_order(scores, features, k, diversity, weights)]
@@ -0,0 +1,57 @@
+import logging
+from typing import Dict
+
+from sqlalchemy import Float, bindparam, cast, func, update
+
+from config import ENGAGEMENT_PRIOR_LIKES, ENGAGEMENT_PRIOR_SKIPS
+from database.models import User
+
+logger = logging.getLogger(__name__)
+
+def engagement_score(likes: int, skips: int) -> float:
+    """Bayesian like rate: the share of likes, smoothed towards the prior.
+
+    Args:
+        likes: Likes received
+        skips: Skips received
+
+    Returns:
+        Smoothed like rate between 0 and 1
+    """
+    return (likes + ENGAGEMENT_PRIOR_LIKES) / (likes + skips + ENGAGEMENT_PRIOR_LIKES + ENGAGEMENT_PRIOR_SKIPS)
+
+# Engagement of users nobody has reacted to yet
+PRIOR_ENGAGEMENT = engagement_score(0, 0)
+
+def engagement_of(user) -> float:
+    """Get a user's engagement score, falling back to the prior."""
+    score = getattr(user, 'engagement_score', None)
+    return PRIOR_ENGAGEMENT if score is None else score
+
+def apply_reactions(session, reactions: Dict[int, Dict[str, int]]) -> None:
+    """Add likes and skips to users' counters and refresh their engagement scores.
+
+    Each user is updated in place from their stored counters, so the cost
+    is constant per reacted-to user regardless of match history.
+
+    Args:
+        session: SQLAlchemy session
+        reactions: Per user ID, the ``likes`` and ``skips`` to add
+    """
+    if not reactions:
+        return
+
+    users = User.__table__
+    likes = func.coalesce(users.c.likes_received, 0) + bindparam('new_likes')
+    skips = func.coalesce(users.c.skips_received, 0) + bindparam('new_skips')
+    statement = update(users).where(users.c.id == bindparam('target_id')).values(
+        likes_received=likes,
+        skips_received=skips,
+        engagement_score=(cast(likes, Float) + ENGAGEMENT_PRIOR_LIKES) / (
+            cast(likes + skips, Float) + ENGAGEMENT_PRIOR_LIKES + ENGAGEMENT_PRIOR_SKIPS
+        )
+    )
+    session.connection().execute(statement, [
+        {'target_id': user_id, 'new_likes': counts['likes'], 'new_skips': counts['skips']}
+        for user_id, counts in reactions.items()
+    ])
@@ -0,0 +1,169 @@
+import hashlib
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Set
+
+from config import FEATURE_CACHE_MAX_BYTES
+
+# Token IDs are below 2**31, as MinHash permutations require
+TOKEN_ID_BITS = 31
+
+def tokenize_bio(bio: Optional[str]) -> Set[str]:
+    """Split a bio into the lowercase word set used for scoring."""
+    if not bio:
+        return set()
+    return set(bio.lower().split())
+
+def tokenize_hobbies(hobbies: Optional[str]) -> Set[str]:
+    """Split a comma-separated hobby list into the set used for scoring."""
+    if not hobbies:
+        return set()
+    return set(hobbies.lower().split(','))
+
+class TokenVocabulary:
+    """Maps tokens to stable integer IDs by hashing them into a fixed ID space.
+
+    No per-token state is kept, so memory does not grow with the number of
+    distinct words and ``FEATURE_CACHE_MAX_BYTES`` bounds all feature memory.
+    IDs are the same in every process. Two tokens collide with probability
+    2**-31, which only shifts overlap counts for profiles sharing them.
+    """
+
+    def __init__(self, bits: int = TOKEN_ID_BITS):
+        """Initialize the ID space.
+
+        Args:
+            bits: Width of token IDs in bits, at most 64
+        """
+        self._mask = (1 << bits) - 1
+
+    def intern(self, token: str) -> int:
+        """Get the ID for a token.
+
+        Args:
+            token: Token to intern
+
+        Returns:
+            Integer token ID
+        """
+        digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') & self._mask
+
+    def intern_all(self, tokens: Iterable[str]) -> List[int]:
+        """Get sorted IDs for a collection of tokens.
+
+        Args:
+            tokens: Tokens to intern
+
+        Returns:
+            Sorted list of token IDs
+        """
+        return sorted(self.intern(token) for token in tokens)
+
+vocabulary = TokenVocabulary()
+
+class ProfileFeatures:
+    """Interned bio and hobby token IDs of one profile, as sorted arrays."""
+
+    __slots__ = ('bio_ids', 'hobby_ids')
+
+    def __init__(self, bio_ids: Iterable[int], hobby_ids: Iterable[int]):
+        self.bio_ids = array('l', bio_ids)
+        self.hobby_ids = array('l', hobby_ids)
+
+    @classmethod
+    def from_text(cls, bio: Optional[str], hobbies: Optional[str]) -> "ProfileFeatures":
+        """Tokenize and intern a bio and hobby list."""
+        return cls(
+            vocabulary.intern_all(tokenize_bio(bio)),
+            vocabulary.intern_all(tokenize_hobbies(hobbies))
+        )
+
+    @property
+    def size(self) -> int:
+        """Approximate memory footprint in bytes."""
+        return sys.getsizeof(self.bio_ids) + sys.getsizeof(self.hobby_ids)
+
+class FeatureCache:
+    """LRU cache of profile features per user, bounded by approximate memory use."""
+
+    # Rough per-entry overhead of the key, slot object and LRU bookkeeping
+    ENTRY_OVERHEAD = 160
+
+    def __init__(self, max_bytes: int = FEATURE_CACHE_MAX_BYTES):
+        """Initialize an empty cache.
+
+        Args:
+            max_bytes: Memory cap in bytes
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[int, ProfileFeatures]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Approximate memory used by cached entries in bytes."""
+        return self._bytes
+
+    def put(self, user_id: int, bio: Optional[str], hobbies: Optional[str]) -> ProfileFeatures:
+        """Tokenize a profile and store its features.
+
+        Args:
+            user_id: User ID
+            bio: Profile bio
+            hobbies: Comma-separated hobbies
+
+        Returns:
+            Cached profile features
+        """
+        features = ProfileFeatures.from_text(bio, hobbies)
+        with self._lock:
+            self._remove(user_id)
+            self._entries[user_id] = features
+            self._bytes += features.size + self.ENTRY_OVERHEAD
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size + self.ENTRY_OVERHEAD
+        return features
+
+    def put_user(self, user) -> ProfileFeatures:
+        """Store features of a user object carrying ``bio`` and ``hobbies``."""
+        return self.put(user.id, user.bio, user.hobbies)
+
+    def get(self, user) -> ProfileFeatures:
+        """Get features of a user, tokenizing and caching them on a miss.
+
+        Args:
+            user: User object carrying ``id``, ``bio`` and ``hobbies``
+
+        Returns:
+            Profile features
+        """
+        with self._lock:
+            features = self._entries.get(user.id)
+            if features is not None:
+                self._entries.move_to_end(user.id)
+                return features
+        return self.put_user(user)
+
+    def evict(self, user_id: int) -> None:
+        """Drop a user's cached features.
+
+        Args:
+            user_id: User ID
+        """
+        with self._lock:
+            self._remove(user_id)
+
+    def _remove(self, user_id: int) -> None:
+        features = self._entries.pop(user_id, None)
+        if features is not None:
+            self._bytes -= features.size + self.ENTRY_OVERHEAD
+
+feature_cache = FeatureCache()
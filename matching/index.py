@@ -0,0 +1,219 @@
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Collection, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+from database.models import Profile
+from .features import ProfileFeatures
+
+logger = logging.getLogger(__name__)
+
+def normalize_value(value: Any) -> Optional[str]:
+    """Normalize an enum member or raw string to its plain string value."""
+    if value is None:
+        return None
+    return getattr(value, 'value', value)
+
+class CandidateIndex:
+    """Per-process index of matchable users bucketed by (gender, university, age)."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        # gender -> university -> age -> user IDs
+        self._buckets: Dict[str, Dict[str, Dict[int, Set[int]]]] = defaultdict(
+            lambda: defaultdict(lambda: defaultdict(set))
+        )
+        self._entries: Dict[int, Tuple[str, str, int]] = {}
+        self._lock = threading.RLock()
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def build(self, session) -> None:
+        """Load all visible profiles into the index.
+
+        Args:
+            session: SQLAlchemy session
+        """
+        rows = session.query(
+            Profile.user_id, Profile.gender, Profile.university, Profile.age
+        ).filter(Profile.is_visible.is_(True)).yield_per(1000)
+
+        with self._lock:
+            self._buckets.clear()
+            self._entries.clear()
+            for user_id, gender, university, age in rows:
+                self._insert(user_id, gender, university, age)
+            self.ready = True
+        logger.info(f"Candidate index built with {len(self._entries)} profiles")
+
+    def upsert(self, user_id: int, gender: Any, university: Any, age: int) -> None:
+        """Add a user to the index or move them to their new bucket.
+
+        Args:
+            user_id: User ID
+            gender: Gender enum or value
+            university: University enum or name
+            age: User age
+        """
+        with self._lock:
+            self._discard(user_id)
+            self._insert(user_id, gender, university, age)
+
+    def upsert_user(self, user) -> None:
+        """Index a user object carrying ``gender``, ``university`` and ``age``."""
+        self.upsert(user.id, user.gender, user.university, user.age)
+
+    def remove(self, user_id: int) -> None:
+        """Drop a user from the index.
+
+        Args:
+            user_id: User ID
+        """
+        with self._lock:
+            self._discard(user_id)
+
+    def candidates(
+        self,
+        gender: Any,
+        university: Any = None,
+        age_min: Optional[int] = None,
+        age_max: Optional[int] = None
+    ) -> Iterator[int]:
+        """Yield IDs of users of another gender within the requested buckets.
+
+        Args:
+            gender: Gender of the requesting user, which is excluded
+            university: Only yield users of this university, if given
+            age_min: Minimum candidate age, inclusive
+            age_max: Maximum candidate age, inclusive
+
+        Yields:
+            Candidate user IDs
+        """
+        gender = normalize_value(gender)
+        university = normalize_value(university)
+
+        with self._lock:
+            buckets = []
+            for bucket_gender, universities in self._buckets.items():
+                if bucket_gender == gender:
+                    continue
+                if university:
+                    by_age = universities.get(university)
+                    selected = [by_age] if by_age else []
+                else:
+                    selected = list(universities.values())
+                for by_age in selected:
+                    for age, user_ids in by_age.items():
+                        if age_min is not None and age < age_min:
+                            continue
+                        if age_max is not None and age > age_max:
+                            continue
+                        buckets.append(tuple(user_ids))
+
+        for user_ids in buckets:
+            yield from user_ids
+
+    def _insert(self, user_id: int, gender: Any, university: Any, age: int) -> None:
+        key = (normalize_value(gender), normalize_value(university), int(age))
+        self._buckets[key[0]][key[1]][key[2]].add(user_id)
+        self._entries[user_id] = key
+
+    def _discard(self, user_id: int) -> None:
+        key = self._entries.pop(user_id, None)
+        if key is None:
+            return
+        gender, university, age = key
+        by_age = self._buckets[gender][university]
+        by_age[age].discard(user_id)
+        if not by_age[age]:
+            del by_age[age]
+            if not by_age:
+                del self._buckets[gender][university]
+
+class HobbyIndex:
+    """Inverted index from interned hobby token ID to the users listing it."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._postings: Dict[int, Set[int]] = defaultdict(set)
+        self._user_tokens: Dict[int, Tuple[int, ...]] = {}
+        self._lock = threading.RLock()
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._user_tokens)
+
+    def build(self, session) -> None:
+        """Load the hobbies of all visible profiles into the index.
+
+        Args:
+            session: SQLAlchemy session
+        """
+        rows = session.query(
+            Profile.user_id, Profile.hobbies
+        ).filter(Profile.is_visible.is_(True)).yield_per(1000)
+
+        with self._lock:
+            self._postings.clear()
+            self._user_tokens.clear()
+            for user_id, hobbies in rows:
+                self._insert(user_id, ProfileFeatures.from_text(None, hobbies).hobby_ids)
+            self.ready = True
+        logger.info(f"Hobby index built with {len(self._postings)} hobbies")
+
+    def update(self, user_id: int, hobby_ids: Iterable[int]) -> None:
+        """Replace the hobbies indexed for a user.
+
+        Args:
+            user_id: User ID
+            hobby_ids: Interned hobby token IDs
+        """
+        with self._lock:
+            self._discard(user_id)
+            self._insert(user_id, hobby_ids)
+
+    def remove(self, user_id: int) -> None:
+        """Drop a user from the index.
+
+        Args:
+            user_id: User ID
+        """
+        with self._lock:
+            self._discard(user_id)
+
+    def overlap_counts(self, hobby_ids: Iterable[int], allowed: Collection[int]) -> Dict[int, int]:
+        """Count shared hobbies for every allowed user listing at least one of them.
+
+        Args:
+            hobby_ids: Interned hobby token IDs of the requesting user
+            allowed: User IDs eligible as candidates
+
+        Returns:
+            Mapping of user ID to number of shared hobbies
+        """
+        counts: Dict[int, int] = defaultdict(int)
+        with self._lock:
+            for hobby_id in hobby_ids:
+                for user_id in self._postings.get(hobby_id, ()):
+                    if user_id in allowed:
+                        counts[user_id] += 1
+        return counts
+
+    def _insert(self, user_id: int, hobby_ids: Iterable[int]) -> None:
+        tokens = tuple(hobby_ids)
+        for hobby_id in tokens:
+            self._postings[hobby_id].add(user_id)
+        self._user_tokens[user_id] = tokens
+
+    def _discard(self, user_id: int) -> None:
+        for hobby_id in self._user_tokens.pop(user_id, ()):
+            postings = self._postings[hobby_id]
+            postings.discard(user_id)
+            if not postings:
+                del self._postings[hobby_id]
+
+candidate_index = CandidateIndex()
+hobby_index = HobbyIndex()
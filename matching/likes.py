@@ -0,0 +1,173 @@
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+from config import LIKE_INDEX_BACKEND, REDIS_URL
+from database.models import Match, MatchStatus
+
+logger = logging.getLogger(__name__)
+
+def pending_likes(session) -> List[Tuple[int, int]]:
+    """Read the ``(liker_id, liked_id)`` pairs of all pending likes.
+
+    Args:
+        session: SQLAlchemy session
+    """
+    return session.query(Match.sender_id, Match.receiver_id).filter(
+        Match.status == MatchStatus.PENDING
+    ).all()
+
+class LikeIndex:
+    """Per-process index of pending likes in both directions.
+
+    Answers "has this user already liked me?" without a query, so mutual
+    matches are detected the moment the second like arrives. The methods
+    are coroutines so the in-memory and Redis indexes are used the same
+    way; they are only called from the event loop.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._incoming: Dict[int, Set[int]] = defaultdict(set)  # liked -> likers
+        self._outgoing: Dict[int, Set[int]] = defaultdict(set)  # liker -> liked
+
+    async def build(self, likes: Iterable[Tuple[int, int]]) -> None:
+        """Replace the index with the given pending likes.
+
+        Args:
+            likes: ``(liker_id, liked_id)`` pairs, as read by ``pending_likes``
+        """
+        self._incoming.clear()
+        self._outgoing.clear()
+        for liker_id, liked_id in likes:
+            self._incoming[liked_id].add(liker_id)
+            self._outgoing[liker_id].add(liked_id)
+        logger.info(f"Like index built with {sum(map(len, self._incoming.values()))} pending likes")
+
+    async def like(self, liker_id: int, liked_id: int) -> bool:
+        """Record a like, consuming the reciprocal pending like if there is one.
+
+        Args:
+            liker_id: ID of the user who liked
+            liked_id: ID of the liked user
+
+        Returns:
+            True if the like completes a mutual match
+        """
+        if liked_id in self._incoming.get(liker_id, ()):
+            self._incoming[liker_id].discard(liked_id)
+            self._outgoing[liked_id].discard(liker_id)
+            return True
+        self._incoming[liked_id].add(liker_id)
+        self._outgoing[liker_id].add(liked_id)
+        return False
+
+    async def likers(self, user_id: int) -> Set[int]:
+        """Get the IDs of users with a pending like for a user."""
+        return set(self._incoming.get(user_id, ()))
+
+    async def discard_user(self, user_id: int) -> None:
+        """Remove every pending like from or to a user.
+
+        Args:
+            user_id: User ID
+        """
+        for liked_id in self._outgoing.pop(user_id, ()):
+            self._incoming[liked_id].discard(user_id)
+        for liker_id in self._incoming.pop(user_id, ()):
+            self._outgoing[liker_id].discard(user_id)
+
+class RedisLikeIndex:
+    """Like index kept in Redis sets so every worker sees the same pending likes."""
+
+    KEY_PREFIX = "likes"
+
+    LIKE = """
+        if redis.call('SISMEMBER', KEYS[1], ARGV[2]) == 1 then
+            redis.call('SREM', KEYS[1], ARGV[2])
+            redis.call('SREM', KEYS[4], ARGV[1])
+            return 1
+        end
+        redis.call('SADD', KEYS[2], ARGV[1])
+        redis.call('SADD', KEYS[3], ARGV[2])
+        return 0
+    """
+
+    def __init__(self, url: str):
+        """Connect to Redis.
+
+        Args:
+            url: Redis connection URL
+        """
+        # Imported here so the in-memory index works without the redis package
+        from redis import asyncio as aioredis
+
+        self.redis = aioredis.from_url(url)
+        self._like = self.redis.register_script(self.LIKE)
+
+    def _incoming_key(self, user_id: int) -> str:
+        return f"{self.KEY_PREFIX}:in:{user_id}"
+
+    def _outgoing_key(self, user_id: int) -> str:
+        return f"{self.KEY_PREFIX}:out:{user_id}"
+
+    async def build(self, likes: Iterable[Tuple[int, int]]) -> None:
+        """Replace the Redis sets with the given pending likes.
+
+        Args:
+            likes: ``(liker_id, liked_id)`` pairs, as read by ``pending_likes``
+        """
+        async with self.redis.pipeline(transaction=False) as pipe:
+            async for key in self.redis.scan_iter(f"{self.KEY_PREFIX}:*"):
+                pipe.delete(key)
+            count = 0
+            for liker_id, liked_id in likes:
+                pipe.sadd(self._incoming_key(liked_id), liker_id)
+                pipe.sadd(self._outgoing_key(liker_id), liked_id)
+                count += 1
+            await pipe.execute()
+        logger.info(f"Like index built with {count} pending likes")
+
+    async def like(self, liker_id: int, liked_id: int) -> bool:
+        """Atomically record a like, consuming the reciprocal pending like if there is one.
+
+        Args:
+            liker_id: ID of the user who liked
+            liked_id: ID of the liked user
+
+        Returns:
+            True if the like completes a mutual match
+        """
+        keys = [
+            self._incoming_key(liker_id), self._incoming_key(liked_id),
+            self._outgoing_key(liker_id), self._outgoing_key(liked_id)
+        ]
+        return bool(await self._like(keys=keys, args=[liker_id, liked_id]))
+
+    async def likers(self, user_id: int) -> Set[int]:
+        """Get the IDs of users with a pending like for a user."""
+        return {int(liker_id) for liker_id in await self.redis.smembers(self._incoming_key(user_id))}
+
+    async def discard_user(self, user_id: int) -> None:
+        """Remove every pending like from or to a user.
+
+        Args:
+            user_id: User ID
+        """
+        liked_ids = await self.redis.smembers(self._outgoing_key(user_id))
+        liker_ids = await self.redis.smembers(self._incoming_key(user_id))
+        async with self.redis.pipeline() as pipe:
+            for liked_id in liked_ids:
+                pipe.srem(self._incoming_key(int(liked_id)), user_id)
+            for liker_id in liker_ids:
+                pipe.srem(self._outgoing_key(int(liker_id)), user_id)
+            pipe.delete(self._incoming_key(user_id), self._outgoing_key(user_id))
+            await pipe.execute()
+
+def create_like_index():
+    """Create the like index selected by LIKE_INDEX_BACKEND."""
+    if LIKE_INDEX_BACKEND == 'redis':
+        return RedisLikeIndex(REDIS_URL)
+    return LikeIndex()
+
+like_index = create_like_index()
@@ -0,0 +1,178 @@
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .features import tokenize_bio, vocabulary
+
+logger = logging.getLogger(__name__)
+
+# Mersenne prime 2**31 - 1 keeps (a * x + b) within int64 for 31-bit token IDs
+MERSENNE_PRIME = (1 << 31) - 1
+
+STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from",
+    "i", "i'm", "im", "in", "is", "it", "me", "my", "of", "on", "or", "so",
+    "that", "the", "to", "too", "very", "was", "we", "with", "you", "your"
+})
+
+class MinHasher:
+    """Computes MinHash signatures over interned bio tokens."""
+
+    def __init__(self, num_perm: int = 32, seed: int = 1):
+        """Initialize hash permutations.
+
+        Args:
+            num_perm: Number of hash permutations (signature length)
+            seed: Random seed for the permutation coefficients
+        """
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self._a = rng.randint(1, MERSENNE_PRIME, size=num_perm).astype(np.int64)
+        self._b = rng.randint(0, MERSENNE_PRIME, size=num_perm).astype(np.int64)
+
+    def signature(self, bio: Optional[str]) -> Optional[np.ndarray]:
+        """Compute the MinHash signature of a bio.
+
+        Args:
+            bio: Profile bio
+
+        Returns:
+            Signature array, or None if the bio has no content words
+        """
+        token_ids = vocabulary.intern_all(tokenize_bio(bio) - STOP_WORDS)
+        if not token_ids:
+            return None
+        ids = np.asarray(token_ids, dtype=np.int64)[:, None]
+        hashes = (ids * self._a + self._b) % MERSENNE_PRIME
+        return hashes.min(axis=0).astype(np.uint32)
+
+def estimate_similarity(signature1: np.ndarray, signature2: np.ndarray) -> float:
+    """Estimate Jaccard similarity from two MinHash signatures."""
+    return float(np.mean(signature1 == signature2))
+
+class LSHIndex:
+    """Locality-sensitive hashing index over MinHash signatures."""
+
+    def __init__(self, bands: int, rows: int):
+        """Initialize an empty index.
+
+        Args:
+            bands: Number of signature bands
+            rows: Signature rows per band
+        """
+        self.bands = bands
+        self.rows = rows
+        self._buckets: Dict[Tuple[int, bytes], Set[int]] = defaultdict(set)
+        self._keys: Dict[int, Tuple[Tuple[int, bytes], ...]] = {}
+
+    def insert(self, user_id: int, signature: np.ndarray) -> None:
+        """Index a user's signature, replacing any previous one."""
+        self.remove(user_id)
+        keys = self._band_keys(signature)
+        for key in keys:
+            self._buckets[key].add(user_id)
+        self._keys[user_id] = keys
+
+    def remove(self, user_id: int) -> None:
+        """Drop a user from the index."""
+        for key in self._keys.pop(user_id, ()):
+            bucket = self._buckets[key]
+            bucket.discard(user_id)
+            if not bucket:
+                del self._buckets[key]
+
+    def query(self, signature: np.ndarray) -> Set[int]:
+        """Get users sharing at least one band with the signature."""
+        matches: Set[int] = set()
+        for key in self._band_keys(signature):
+            matches.update(self._buckets.get(key, ()))
+        return matches
+
+    def _band_keys(self, signature: np.ndarray) -> Tuple[Tuple[int, bytes], ...]:
+        return tuple(
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        )
+
+class MinHashStore:
+    """Per-user MinHash signatures with an LSH index for candidate lookup."""
+
+    def __init__(self, bands: int = 8, rows: int = 4, seed: int = 1):
+        """Initialize an empty store.
+
+        Args:
+            bands: Number of LSH bands
+            rows: Signature rows per band
+            seed: Random seed for the permutation coefficients
+        """
+        self.hasher = MinHasher(num_perm=bands * rows, seed=seed)
+        self.lsh = LSHIndex(bands, rows)
+        self._signatures: Dict[int, Optional[np.ndarray]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def build(self, rows: Iterable[Tuple[int, Optional[str]]]) -> None:
+        """Load signatures for ``(user_id, bio)`` rows."""
+        with self._lock:
+            for user_id, bio in rows:
+                self.update(user_id, bio)
+        logger.info(f"MinHash store built with {len(self._signatures)} bios")
+
+    def update(self, user_id: int, bio: Optional[str]) -> Optional[np.ndarray]:
+        """Compute and store the signature of a user's bio.
+
+        Args:
+            user_id: User ID
+            bio: Profile bio
+
+        Returns:
+            Signature array, or None for an empty bio
+        """
+        signature = self.hasher.signature(bio)
+        with self._lock:
+            self._signatures[user_id] = signature
+            if signature is None:
+                self.lsh.remove(user_id)
+            else:
+                self.lsh.insert(user_id, signature)
+        return signature
+
+    def remove(self, user_id: int) -> None:
+        """Drop a user's signature."""
+        with self._lock:
+            self._signatures.pop(user_id, None)
+            self.lsh.remove(user_id)
+
+    def get(self, user) -> Optional[np.ndarray]:
+        """Get a user's signature, computing it on a miss."""
+        if user.id in self._signatures:
+            return self._signatures[user.id]
+        return self.update(user.id, user.bio)
+
+    def similar(self, user) -> Set[int]:
+        """Get IDs of users whose bios collide with this user's in LSH."""
+        signature = self.get(user)
+        if signature is None:
+            return set()
+        with self._lock:
+            matches = self.lsh.query(signature)
+        matches.discard(user.id)
+        return matches
+
+    def similarities(self, user, candidates: Sequence) -> np.ndarray:
+        """Estimate bio Jaccard similarity between a user and each candidate."""
+        result = np.zeros(len(candidates), dtype=np.float64)
+        signature = self.get(user)
+        if signature is None or not len(candidates):
+            return result
+
+        present = [i for i, candidate in enumerate(candidates) if self.get(candidate) is not None]
+        if present:
+            matrix = np.vstack([self.get(candidates[i]) for i in present])
+            result[present] = (matrix == signature).mean(axis=1)
+        return result
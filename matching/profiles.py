@@ -0,0 +1,89 @@
+import logging
+import threading
+from typing import Iterable, NamedTuple, Optional
+
+from cachetools import LRUCache
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import PROFILE_CACHE_SIZE
+from database.models import User
+
+logger = logging.getLogger(__name__)
+
+class ProfileCard(NamedTuple):
+    """Display fields of a candidate profile."""
+    id: int
+    first_name: Optional[str]
+    last_name: Optional[str]
+    age: Optional[int]
+    university: Optional[str]
+    bio: Optional[str]
+    hobbies: Optional[str]
+    photo_id: Optional[str]
+
+    @classmethod
+    def from_user(cls, user) -> "ProfileCard":
+        """Snapshot the display fields of a user object."""
+        return cls(
+            id=user.id,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            age=user.age,
+            university=user.university,
+            bio=user.bio,
+            hobbies=user.hobbies,
+            photo_id=user.photo_id
+        )
+
+class ProfileCache:
+    """LRU cache of profile cards used to show match candidates one at a time."""
+
+    def __init__(self, maxsize: int = PROFILE_CACHE_SIZE):
+        """Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of cached profiles
+        """
+        self._cards = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def put(self, user) -> ProfileCard:
+        """Cache the profile card of a loaded user."""
+        card = ProfileCard.from_user(user)
+        with self._lock:
+            self._cards[card.id] = card
+        return card
+
+    def put_many(self, users: Iterable) -> None:
+        """Cache the profile cards of several loaded users."""
+        for user in users:
+            self.put(user)
+
+    async def get(self, user_id: int, session: AsyncSession) -> Optional[ProfileCard]:
+        """Get a profile card, loading it through the update's session on a miss.
+
+        Args:
+            user_id: User ID
+            session: Async database session of the current update
+
+        Returns:
+            Profile card, or None if the user no longer exists
+        """
+        with self._lock:
+            card = self._cards.get(user_id)
+        if card is not None:
+            return card
+
+        user = await session.get(User, user_id)
+        return self.put(user) if user else None
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a cached profile card after the profile changes.
+
+        Args:
+            user_id: User ID
+        """
+        with self._lock:
+            self._cards.pop(user_id, None)
+
+profile_cache = ProfileCache()
@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import threading
+from typing import Callable, List, Optional, Set, Tuple
+
+from sqlalchemy import or_
+
+from config import (
+    RECOMMENDATION_QUEUE_SIZE, RECOMMENDATION_QUEUE_LOW_WATERMARK,
+    RECOMMENDATION_REFRESH_INTERVAL
+)
+from database.database import get_session
+from database.offload import run_blocking
+from database.models import RecommendationQueue, User
+
+logger = logging.getLogger(__name__)
+
+# Ranker signature: (session, user, limit) -> ranked (candidate, score) pairs
+Ranker = Callable[..., List[Tuple[User, float]]]
+
+class RecommendationQueues:
+    """Per-user queues of ranked candidate IDs, precomputed off the update path."""
+
+    def __init__(
+        self,
+        queue_size: int = RECOMMENDATION_QUEUE_SIZE,
+        low_watermark: int = RECOMMENDATION_QUEUE_LOW_WATERMARK,
+        interval: float = RECOMMENDATION_REFRESH_INTERVAL
+    ):
+        """Initialize queue settings.
+
+        Args:
+            queue_size: Number of candidates computed per refresh
+            low_watermark: Remaining queue length that triggers a refresh
+            interval: Seconds between background refresh passes
+        """
+        self.queue_size = queue_size
+        self.low_watermark = low_watermark
+        self.interval = interval
+        self._stale: Set[int] = set()
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def mark_stale(self, user_id: int) -> None:
+        """Schedule a user's queue for recomputation.
+
+        Args:
+            user_id: User ID
+        """
+        with self._lock:
+            self._stale.add(user_id)
+
+    def invalidate_candidate(self, session, candidate_id: int) -> None:
+        """Drop a changed candidate from every queue and recompute those queues.
+
+        Args:
+            session: SQLAlchemy session
+            candidate_id: ID of the user whose profile changed
+        """
+        entries = session.query(RecommendationQueue).filter(
+            RecommendationQueue.candidate_id == candidate_id
+        )
+        user_ids = [user_id for user_id, in entries.with_entities(RecommendationQueue.user_id)]
+        entries.delete(synchronize_session=False)
+        with self._lock:
+            self._stale.update(user_ids)
+
+    def pop(self, session, user_id: int, limit: int) -> List[Tuple[int, float]]:
+        """Take the next candidates off a user's queue.
+
+        Args:
+            session: SQLAlchemy session
+            user_id: User ID
+            limit: Maximum number of candidates to take
+
+        Returns:
+            ``(candidate_id, score)`` pairs in rank order
+        """
+        rows = session.query(
+            RecommendationQueue.id, RecommendationQueue.candidate_id, RecommendationQueue.score
+        ).filter(
+            RecommendationQueue.user_id == user_id
+        ).order_by(
+            RecommendationQueue.position
+        ).limit(limit + self.low_watermark).all()
+
+        taken = rows[:limit]
+        if taken:
+            session.query(RecommendationQueue).filter(
+                RecommendationQueue.id.in_([row.id for row in taken])
+            ).delete(synchronize_session=False)
+
+        if len(rows) - len(taken) < self.low_watermark:
+            self.mark_stale(user_id)
+        return [(row.candidate_id, row.score) for row in taken]
+
+    def discard_user(self, session, user_id: int) -> None:
+        """Remove a user's own queue and every queue entry pointing at them.
+
+        Args:
+            session: SQLAlchemy session
+            user_id: User ID
+        """
+        session.query(RecommendationQueue).filter(
+            or_(
+                RecommendationQueue.user_id == user_id,
+                RecommendationQueue.candidate_id == user_id
+            )
+        ).delete(synchronize_session=False)
+        with self._lock:
+            self._stale.discard(user_id)
+
+    def refresh(self, session, user: User, ranker: Ranker) -> int:
+        """Recompute a user's queue.
+
+        Args:
+            session: SQLAlchemy session
+            user: User whose queue is rebuilt
+            ranker: Ranking function
+
+        Returns:
+            Number of queued candidates
+        """
+        candidates = ranker(session, user, self.queue_size)
+        session.query(RecommendationQueue).filter(
+            RecommendationQueue.user_id == user.id
+        ).delete(synchronize_session=False)
+        session.bulk_insert_mappings(RecommendationQueue, [
+            {'user_id': user.id, 'candidate_id': candidate.id, 'position': position, 'score': score}
+            for position, (candidate, score) in enumerate(candidates)
+        ])
+        return len(candidates)
+
+    def refresh_stale(self, ranker: Ranker) -> int:
+        """Recompute the queues of all users marked stale.
+
+        Args:
+            ranker: Ranking function
+
+        Returns:
+            Number of queues refreshed
+        """
+        with self._lock:
+            user_ids, self._stale = self._stale, set()
+
+        refreshed = 0
+        for user_id in user_ids:
+            try:
+                with get_session() as session:
+                    user = session.query(User).get(user_id)
+                    if user:
+                        self.refresh(session, user, ranker)
+                        refreshed += 1
+            except Exception as e:
+                logger.error(f"Error refreshing recommendation queue for user {user_id}: {e}")
+        return refreshed
+
+    async def run(self, ranker: Ranker) -> None:
+        """Refresh stale queues periodically in a worker thread.
+
+        Args:
+            ranker: Ranking function
+        """
+        while True:
+            await asyncio.sleep(self.interval)
+            if not self._stale:
+                continue
+            refreshed = await run_blocking(self.refresh_stale, ranker)
+            logger.info(f"Refreshed {refreshed} recommendation queues")
+
+    def start(self, ranker: Ranker) -> None:
+        """Start the background refresh job on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run(ranker))
+
+    async def stop(self) -> None:
+        """Cancel the background refresh job."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+recommendation_queues = RecommendationQueues()
@@ -0,0 +1,185 @@
+import logging
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from cachetools import TTLCache
+
+from config import CACHE_TTL, SCORE_CACHE_SIZE
+from .engagement import engagement_of
+from .scoring import (
+    CandidateFeatures, bio_similarity, score_candidates, score_user_features, scoring_pool
+)
+
+logger = logging.getLogger(__name__)
+
+class ProfileVersions:
+    """Per-user profile version counters, bumped whenever a scored field changes."""
+
+    def __init__(self):
+        """Initialize with every profile at version 0."""
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> int:
+        """Get the current profile version of a user."""
+        return self._versions.get(user_id, 0)
+
+    def bump(self, user_id: int) -> int:
+        """Advance a user's profile version so cached scores involving them go stale.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            New profile version
+        """
+        with self._lock:
+            version = self._versions.get(user_id, 0) + 1
+            self._versions[user_id] = version
+        return version
+
+profile_versions = ProfileVersions()
+
+class ScoreCache:
+    """Bounded cache of pairwise match scores with LRU and TTL eviction.
+
+    Entries are keyed by both user IDs and both profile versions, so an edit
+    to either profile makes its cached scores unreachable. Only the content
+    terms are cached; the engagement term changes with every reaction and is
+    added on each read. Scores are cached for a single weight set, the one
+    passed by the ranking pipeline.
+    """
+
+    def __init__(self, maxsize: int = SCORE_CACHE_SIZE, ttl: int = CACHE_TTL):
+        """Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of cached scores
+            ttl: Seconds a cached score stays valid
+        """
+        self._scores = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def score(self, user, candidates: Sequence, weights: Dict[str, float]) -> np.ndarray:
+        """Score candidates for a user, computing only the pairs not cached.
+
+        Args:
+            user: Requesting user
+            candidates: Candidate users
+            weights: Score weights keyed by term name
+
+        Returns:
+            Array of scores aligned with ``candidates``
+        """
+        user_version = profile_versions.get(user.id)
+        keys = [
+            (user.id, candidate.id, user_version, profile_versions.get(candidate.id))
+            for candidate in candidates
+        ]
+        with self._lock:
+            cached = [self._scores.get(key) for key in keys]
+
+        scores = np.array([0.0 if score is None else score for score in cached], dtype=np.float64)
+        missing = [position for position, score in enumerate(cached) if score is None]
+        if missing:
+            content_weights = dict(weights, engagement=0.0)
+            fresh = score_candidates(user, [candidates[position] for position in missing], content_weights)
+            scores[missing] = fresh
+            with self._lock:
+                for position, score in zip(missing, fresh.tolist()):
+                    self._scores[keys[position]] = score
+
+        engagement_weight = weights.get('engagement', 0.0)
+        if engagement_weight:
+            scores += engagement_weight * np.array([engagement_of(candidate) for candidate in candidates])
+        return scores
+
+    def score_batches(
+        self,
+        user,
+        batches: Iterable[Sequence],
+        weights: Dict[str, float],
+        coalesce_size: Optional[int] = None
+    ) -> Iterator[Tuple[List[int], np.ndarray]]:
+        """Score a stream of candidate batches by candidate ID.
+
+        Cached scores are yielded per batch. Candidates not cached are
+        reduced to feature arrays, which are merged across batches up to
+        ``coalesce_size`` candidates before scoring, so the candidate
+        objects themselves can be released batch by batch.
+
+        Args:
+            user: Requesting user
+            batches: Batches of candidate users
+            weights: Score weights keyed by term name
+            coalesce_size: Candidates scored together, by default the
+                scoring pool threshold when the pool is enabled
+
+        Yields:
+            Candidate IDs and their scores
+        """
+        if coalesce_size is None:
+            coalesce_size = scoring_pool.threshold if scoring_pool.enabled else 1
+        content_weights = dict(weights, engagement=0.0)
+        engagement_weight = weights.get('engagement', 0.0)
+        user_version = profile_versions.get(user.id)
+
+        pending_keys: List[Tuple[int, int, int, int]] = []
+        pending_engagement: List[float] = []
+        pending_features: List[CandidateFeatures] = []
+        pending_bio: List[np.ndarray] = []
+        for candidates in batches:
+            keys = [
+                (user.id, candidate.id, user_version, profile_versions.get(candidate.id))
+                for candidate in candidates
+            ]
+            with self._lock:
+                cached = [self._scores.get(key) for key in keys]
+
+            hits = [position for position, score in enumerate(cached) if score is not None]
+            if hits:
+                scores = np.array([cached[position] for position in hits], dtype=np.float64)
+                scores += engagement_weight * np.array([engagement_of(candidates[position]) for position in hits])
+                yield [candidates[position].id for position in hits], scores
+
+            missing = [candidates[position] for position, score in enumerate(cached) if score is None]
+            if missing:
+                features = CandidateFeatures.from_users(missing)
+                pending_keys.extend(keys[position] for position, score in enumerate(cached) if score is None)
+                pending_engagement.extend(engagement_of(candidate) for candidate in missing)
+                pending_features.append(features)
+                pending_bio.append(bio_similarity.batch(user, missing, features))
+
+            if len(pending_keys) >= coalesce_size:
+                yield self._score_pending(
+                    user, pending_keys, pending_engagement, pending_features, pending_bio,
+                    content_weights, engagement_weight
+                )
+                pending_keys, pending_engagement, pending_features, pending_bio = [], [], [], []
+
+        if pending_keys:
+            yield self._score_pending(
+                user, pending_keys, pending_engagement, pending_features, pending_bio,
+                content_weights, engagement_weight
+            )
+
+    def _score_pending(
+        self,
+        user,
+        keys: List[Tuple[int, int, int, int]],
+        engagement: List[float],
+        features: List[CandidateFeatures],
+        bio_scores: List[np.ndarray],
+        content_weights: Dict[str, float],
+        engagement_weight: float
+    ) -> Tuple[List[int], np.ndarray]:
+        fresh = score_user_features(
+            user, np.concatenate(bio_scores), CandidateFeatures.concat(features), content_weights
+        )
+        with self._lock:
+            for key, score in zip(keys, fresh.tolist()):
+                self._scores[key] = score
+        return [key[1] for key in keys], fresh + engagement_weight * np.asarray(engagement, dtype=np.float64)
+
+score_cache = ScoreCache()
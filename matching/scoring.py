@@ -0,0 +1,448 @@
+import heapq
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from config import BIO_SIMILARITY_BACKEND, SCORING_POOL_THRESHOLD, SCORING_POOL_WORKERS
+from database.models import Profile
+from .engagement import engagement_of
+from .features import feature_cache, vocabulary
+from .index import normalize_value
+from .minhash import MinHashStore, estimate_similarity
+
+logger = logging.getLogger(__name__)
+
+# University code of users without a university; equal to itself like None
+NO_UNIVERSITY = -1
+
+def university_code(university: Optional[str]) -> int:
+    """Intern a university name as an integer code for array comparisons."""
+    if university is None:
+        return NO_UNIVERSITY
+    return vocabulary.intern(university)
+
+class CandidateFeatures:
+    """Column-oriented feature arrays for a batch of candidates.
+
+    Universities are interned integer codes, engagement holds each
+    candidate's smoothed like rate and token sets are stored in
+    CSR layout: the token IDs of candidate ``i`` are
+    ``indices[indptr[i]:indptr[i + 1]]``. Only plain numeric arrays are
+    held, so batches pickle compactly for worker processes.
+    """
+
+    def __init__(
+        self,
+        ages: np.ndarray,
+        universities: np.ndarray,
+        engagement: np.ndarray,
+        bio_indptr: np.ndarray,
+        bio_indices: np.ndarray,
+        hobby_indptr: np.ndarray,
+        hobby_indices: np.ndarray
+    ):
+        self.ages = ages
+        self.universities = universities
+        self.engagement = engagement
+        self.bio_indptr = bio_indptr
+        self.bio_indices = bio_indices
+        self.hobby_indptr = hobby_indptr
+        self.hobby_indices = hobby_indices
+
+    def __len__(self) -> int:
+        return len(self.ages)
+
+    def slice(self, start: int, stop: int) -> "CandidateFeatures":
+        """Get the features of candidates ``start`` to ``stop`` as a new batch."""
+        bio_start, bio_stop = self.bio_indptr[start], self.bio_indptr[stop]
+        hobby_start, hobby_stop = self.hobby_indptr[start], self.hobby_indptr[stop]
+        return CandidateFeatures(
+            ages=self.ages[start:stop],
+            universities=self.universities[start:stop],
+            engagement=self.engagement[start:stop],
+            bio_indptr=self.bio_indptr[start:stop + 1] - bio_start,
+            bio_indices=self.bio_indices[bio_start:bio_stop],
+            hobby_indptr=self.hobby_indptr[start:stop + 1] - hobby_start,
+            hobby_indices=self.hobby_indices[hobby_start:hobby_stop]
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence["CandidateFeatures"]) -> "CandidateFeatures":
+        """Join feature batches into one, keeping candidate order."""
+        if len(batches) == 1:
+            return batches[0]
+        return cls(
+            ages=np.concatenate([batch.ages for batch in batches]),
+            universities=np.concatenate([batch.universities for batch in batches]),
+            engagement=np.concatenate([batch.engagement for batch in batches]),
+            bio_indptr=_concat_indptr([batch.bio_indptr for batch in batches]),
+            bio_indices=np.concatenate([batch.bio_indices for batch in batches]),
+            hobby_indptr=_concat_indptr([batch.hobby_indptr for batch in batches]),
+            hobby_indices=np.concatenate([batch.hobby_indices for batch in batches])
+        )
+
+    @classmethod
+    def from_token_ids(
+        cls,
+        ages: Sequence[int],
+        universities: Sequence[Optional[str]],
+        engagement: Sequence[float],
+        bio_ids: Sequence[Sequence[int]],
+        hobby_ids: Sequence[Sequence[int]]
+    ) -> "CandidateFeatures":
+        """Build feature arrays from per-candidate token ID lists."""
+        bio_indptr, bio_indices = _to_csr(bio_ids)
+        hobby_indptr, hobby_indices = _to_csr(hobby_ids)
+        return cls(
+            ages=np.asarray(ages, dtype=np.int64),
+            universities=np.fromiter(
+                (university_code(university) for university in universities),
+                dtype=np.int64,
+                count=len(universities)
+            ),
+            engagement=np.asarray(engagement, dtype=np.float64),
+            bio_indptr=bio_indptr,
+            bio_indices=bio_indices,
+            hobby_indptr=hobby_indptr,
+            hobby_indices=hobby_indices
+        )
+
+    @classmethod
+    def from_users(cls, users: Sequence) -> "CandidateFeatures":
+        """Build feature arrays from user objects via the feature cache."""
+        profiles = [feature_cache.get(user) for user in users]
+        return cls.from_token_ids(
+            ages=[user.age for user in users],
+            universities=[normalize_value(user.university) for user in users],
+            engagement=[engagement_of(user) for user in users],
+            bio_ids=[profile.bio_ids for profile in profiles],
+            hobby_ids=[profile.hobby_ids for profile in profiles]
+        )
+
+def _to_csr(rows: Sequence[Sequence[int]]):
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(row) for row in rows], out=indptr[1:])
+    indices = np.fromiter(
+        (token_id for row in rows for token_id in row),
+        dtype=np.int64,
+        count=int(indptr[-1])
+    )
+    return indptr, indices
+
+def _concat_indptr(indptrs: Sequence[np.ndarray]) -> np.ndarray:
+    offsets = np.cumsum([0] + [int(indptr[-1]) for indptr in indptrs[:-1]])
+    return np.concatenate([indptrs[0][:1]] + [indptr[1:] + offset for indptr, offset in zip(indptrs, offsets)])
+
+def overlap_counts(indptr: np.ndarray, indices: np.ndarray, query_ids: Sequence[int]) -> np.ndarray:
+    """Count, per CSR row, how many token IDs also appear in ``query_ids``."""
+    hits = np.isin(indices, np.asarray(query_ids, dtype=np.int64))
+    cumulative = np.concatenate(([0], np.cumsum(hits)))
+    return cumulative[indptr[1:]] - cumulative[indptr[:-1]]
+
+def score_features(
+    age: int,
+    university: int,
+    hobby_ids: Sequence[int],
+    bio_similarity: np.ndarray,
+    features: CandidateFeatures,
+    weights: Dict[str, float]
+) -> np.ndarray:
+    """Score a batch of candidates against one user's features.
+
+    Mirrors ``handlers.match.calculate_match_score`` term for term.
+
+    Args:
+        age: Age of the requesting user
+        university: University code of the requesting user
+        hobby_ids: Hobby token IDs of the requesting user
+        bio_similarity: Bio similarity of each candidate, before weighting
+        features: Candidate feature arrays
+        weights: Score weights keyed by term name
+
+    Returns:
+        Array of scores aligned with the candidates
+    """
+    scores = np.zeros(len(features), dtype=np.float64)
+    if not len(features):
+        return scores
+
+    # Age compatibility
+    age_diff = np.abs(features.ages - age)
+    scores += weights['age'] * np.where(age_diff <= 2, 1.0, np.where(age_diff <= 5, 0.7, 0.3))
+
+    # University compatibility
+    scores += np.where(features.universities == university, weights['university'], 0.0)
+
+    # Bio similarity
+    scores += weights['bio'] * bio_similarity
+
+    # Hobbies similarity
+    if len(hobby_ids):
+        hobby_common = overlap_counts(features.hobby_indptr, features.hobby_indices, hobby_ids)
+        scores += weights['hobbies'] * (hobby_common / 5)
+
+    # Candidate engagement
+    scores += weights.get('engagement', 0.0) * features.engagement
+
+    return scores
+
+def score_candidates(
+    user,
+    candidates: Sequence,
+    weights: Dict[str, float],
+    bio_backend=None
+) -> np.ndarray:
+    """Score all candidates for a user in one vectorized pass.
+
+    Batches of at least ``SCORING_POOL_THRESHOLD`` candidates are scored
+    by the worker process pool, if it is enabled.
+
+    Args:
+        user: Requesting user
+        candidates: Candidate users
+        weights: Score weights keyed by term name
+        bio_backend: Bio similarity backend, defaults to the configured one
+
+    Returns:
+        Array of scores aligned with ``candidates``
+    """
+    features = CandidateFeatures.from_users(candidates)
+    bio_backend = bio_backend or bio_similarity
+    return score_user_features(user, bio_backend.batch(user, candidates, features), features, weights)
+
+def score_user_features(
+    user,
+    bio_scores: np.ndarray,
+    features: CandidateFeatures,
+    weights: Dict[str, float]
+) -> np.ndarray:
+    """Score prepared candidate feature arrays for a user.
+
+    Args:
+        user: Requesting user
+        bio_scores: Bio similarity of each candidate, before weighting
+        features: Candidate feature arrays
+        weights: Score weights keyed by term name
+
+    Returns:
+        Array of scores aligned with the candidates
+    """
+    profile = feature_cache.get(user)
+    return scoring_pool.score(
+        user.age,
+        university_code(normalize_value(user.university)),
+        np.asarray(profile.hobby_ids, dtype=np.int64),
+        bio_scores,
+        features,
+        weights
+    )
+
+class ScoringPool:
+    """Process pool that scores large candidate batches outside the calling process.
+
+    Scoring holds the GIL for its whole duration, so large batches are split
+    into one chunk per worker. Smaller batches are scored inline, where the
+    pickling overhead would outweigh the gain. Disabled by default: the
+    vectorized scorer is cheap next to pickling its inputs, so run
+    ``python -m benchmarks.scoring_pool`` on the target machine before
+    enabling it.
+    """
+
+    def __init__(self, workers: int = SCORING_POOL_WORKERS, threshold: int = SCORING_POOL_THRESHOLD):
+        """Initialize pool settings; worker processes start on first use.
+
+        Args:
+            workers: Number of worker processes, 0 to always score inline
+            threshold: Minimum batch size scored by the pool
+        """
+        self.workers = workers
+        self.threshold = threshold
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any batch can be scored by worker processes."""
+        return self.workers > 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def score(
+        self,
+        age: int,
+        university: int,
+        hobby_ids: np.ndarray,
+        bio_similarity: np.ndarray,
+        features: CandidateFeatures,
+        weights: Dict[str, float]
+    ) -> np.ndarray:
+        """Score a batch of candidates, in worker processes when it is large.
+
+        Takes the same arguments as ``score_features``.
+
+        Returns:
+            Array of scores aligned with the candidates
+        """
+        if not self.enabled or len(features) < self.threshold:
+            return score_features(age, university, hobby_ids, bio_similarity, features, weights)
+
+        executor = self._get_executor()
+        bounds = np.linspace(0, len(features), self.workers + 1, dtype=np.int64).tolist()
+        futures = [
+            executor.submit(
+                score_features, age, university, hobby_ids,
+                bio_similarity[start:stop], features.slice(start, stop), weights
+            )
+            for start, stop in zip(bounds, bounds[1:]) if stop > start
+        ]
+        return np.concatenate([future.result() for future in futures])
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+scoring_pool = ScoringPool()
+
+class TopK:
+    """Bounded min-heap keeping the k best items by score, lowest ID first on ties.
+
+    When ``after`` holds the ``(score, id)`` of the last item of a previous
+    page, only items ranked strictly below it are kept, so successive pages
+    can be walked with a keyset cursor.
+    """
+
+    def __init__(self, k: int, after: Optional[Tuple[float, int]] = None):
+        """Initialize an empty selection.
+
+        Args:
+            k: Number of items to keep
+            after: Keyset cursor of the previous page, if any
+        """
+        self.k = k
+        self.after = after
+        self._heap: List[Tuple[float, int, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, items: Sequence, scores: np.ndarray, ids: Sequence[int]) -> None:
+        """Offer a scored batch of items.
+
+        Args:
+            items: Batch of items
+            scores: Scores aligned with ``items``
+            ids: Unique IDs aligned with ``items``, used to break ties
+        """
+        if self.k <= 0 or not len(items):
+            return
+
+        ids = np.asarray(ids, dtype=np.int64)
+        mask = np.ones(len(items), dtype=bool)
+        if self.after is not None:
+            after_score, after_id = self.after
+            mask &= (scores < after_score) | ((scores == after_score) & (ids > after_id))
+
+        # Only items reaching the current cut-off can enter a full heap
+        if len(self._heap) >= self.k:
+            mask &= scores >= self._heap[0][0]
+
+        for position in np.flatnonzero(mask).tolist():
+            entry = (float(scores[position]), -int(ids[position]), items[position])
+            if len(self._heap) < self.k:
+                heapq.heappush(self._heap, entry)
+            elif entry[:2] > self._heap[0][:2]:
+                heapq.heapreplace(self._heap, entry)
+
+    def scored(self) -> List[Tuple[Any, float]]:
+        """Get kept items with their scores in rank order."""
+        ranked = sorted(self._heap, key=lambda entry: entry[:2], reverse=True)
+        return [(item, score) for score, _, item in ranked]
+
+    def items(self) -> List[Any]:
+        """Get kept items in rank order."""
+        return [item for item, _ in self.scored()]
+
+class WordOverlapBioSimilarity:
+    """Bio similarity as the number of shared words, scaled by 1/10."""
+
+    def build(self, session) -> None:
+        """Nothing to precompute; token sets live in the feature cache."""
+
+    def update(self, user) -> None:
+        """Nothing to refresh; token sets live in the feature cache."""
+
+    def remove(self, user_id: int) -> None:
+        """Nothing to drop; token sets live in the feature cache."""
+
+    def similar(self, user) -> Set[int]:
+        """Candidate lookup by bio is not supported by this backend."""
+        return set()
+
+    def pair(self, user1, user2) -> float:
+        """Bio similarity between two users."""
+        common_words = set(feature_cache.get(user1).bio_ids).intersection(
+            feature_cache.get(user2).bio_ids
+        )
+        return len(common_words) / 10
+
+    def batch(self, user, candidates: Sequence, features: CandidateFeatures) -> np.ndarray:
+        """Bio similarity between a user and each candidate."""
+        bio_ids = feature_cache.get(user).bio_ids
+        if not len(bio_ids):
+            return np.zeros(len(features), dtype=np.float64)
+        return overlap_counts(features.bio_indptr, features.bio_indices, bio_ids) / 10
+
+class MinHashBioSimilarity:
+    """Bio similarity as MinHash-estimated Jaccard, with LSH candidate lookup."""
+
+    def __init__(self):
+        self.store = MinHashStore()
+
+    def build(self, session) -> None:
+        """Compute signatures for all visible profiles."""
+        self.store.build(
+            session.query(Profile.user_id, Profile.bio).filter(
+                Profile.is_visible.is_(True)
+            ).yield_per(1000)
+        )
+
+    def update(self, user) -> None:
+        """Recompute a user's signature after a profile save."""
+        self.store.update(user.id, user.bio)
+
+    def remove(self, user_id: int) -> None:
+        """Drop a user's signature."""
+        self.store.remove(user_id)
+
+    def similar(self, user) -> Set[int]:
+        """Get IDs of users with similar bios via LSH."""
+        return self.store.similar(user)
+
+    def pair(self, user1, user2) -> float:
+        """Bio similarity between two users."""
+        signature1 = self.store.get(user1)
+        signature2 = self.store.get(user2)
+        if signature1 is None or signature2 is None:
+            return 0.0
+        return estimate_similarity(signature1, signature2)
+
+    def batch(self, user, candidates: Sequence, features: CandidateFeatures) -> np.ndarray:
+        """Bio similarity between a user and each candidate."""
+        return self.store.similarities(user, candidates)
+
+BIO_SIMILARITY_BACKENDS = {
+    'overlap': WordOverlapBioSimilarity,
+    'minhash': MinHashBioSimilarity
+}
+
+bio_similarity = BIO_SIMILARITY_BACKENDS[BIO_SIMILARITY_BACKEND]()
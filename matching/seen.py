@@ -0,0 +1,228 @@
+import logging
+import math
+import struct
+import threading
+from typing import Iterable, List, Optional
+
+import numpy as np
+from cachetools import LRUCache
+
+from config import SEEN_FILTER_CACHE_SIZE, SEEN_FILTER_CAPACITY, SEEN_FILTER_ERROR_RATE
+from database.models import Match, SeenFilter
+
+logger = logging.getLogger(__name__)
+
+_LAYER_HEADER = struct.Struct("<III")  # num_bits, num_hashes, item_count
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer over an array of uint64 values."""
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+class BloomFilter:
+    """Fixed-size Bloom filter over integer IDs."""
+
+    def __init__(self, num_bits: int, num_hashes: int, bits: Optional[bytes] = None, count: int = 0):
+        """Initialize the filter.
+
+        Args:
+            num_bits: Size of the bit array
+            num_hashes: Number of hash functions
+            bits: Serialized bit array to restore, if any
+            count: Number of items already added
+        """
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.count = count
+        if bits is None:
+            self.bits = np.zeros((num_bits + 7) // 8, dtype=np.uint8)
+        else:
+            self.bits = np.frombuffer(bits, dtype=np.uint8).copy()
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float) -> "BloomFilter":
+        """Create a filter sized for a capacity and false-positive rate."""
+        num_bits = max(64, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        num_hashes = max(1, int(round(num_bits / capacity * math.log(2))))
+        return cls(num_bits, num_hashes)
+
+    @property
+    def capacity(self) -> int:
+        """Number of items the filter was sized for."""
+        return int(self.num_bits * math.log(2) / self.num_hashes)
+
+    def _positions(self, ids: np.ndarray) -> np.ndarray:
+        # Double hashing: h1 + i * h2 for i in range(num_hashes)
+        ids = ids.astype(np.uint64)
+        h1 = _mix64(ids)
+        h2 = _mix64(ids ^ np.uint64(0x5BD1E995)) | np.uint64(1)
+        steps = np.arange(self.num_hashes, dtype=np.uint64)
+        return ((h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.num_bits)).astype(np.int64)
+
+    def add_many(self, ids: Iterable[int]) -> None:
+        """Add IDs to the filter."""
+        ids = np.fromiter(ids, dtype=np.int64)
+        if not len(ids):
+            return
+        new = ~self.contains_many(ids)
+        positions = self._positions(ids).ravel()
+        np.bitwise_or.at(self.bits, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+        self.count += int(new.sum())
+
+    def contains_many(self, ids: np.ndarray) -> np.ndarray:
+        """Check which IDs may be in the filter; never returns false negatives."""
+        if not len(ids):
+            return np.zeros(0, dtype=bool)
+        positions = self._positions(np.asarray(ids))
+        hits = (self.bits[positions >> 3] >> (positions & 7).astype(np.uint8)) & 1
+        return hits.all(axis=1)
+
+class SeenSet:
+    """Scalable Bloom filter of user IDs a user has already liked or skipped.
+
+    A new, twice as large layer is added whenever the newest one is full,
+    keeping the false-positive rate bounded as the history grows.
+    """
+
+    def __init__(self, layers: Optional[List[BloomFilter]] = None):
+        self.layers = layers or []
+
+    def __len__(self) -> int:
+        return sum(layer.count for layer in self.layers)
+
+    def __contains__(self, user_id: int) -> bool:
+        return bool(self.contains_many(np.array([user_id], dtype=np.int64))[0])
+
+    def add_many(self, user_ids: Iterable[int]) -> None:
+        """Record user IDs as seen."""
+        user_ids = np.unique(np.fromiter(user_ids, dtype=np.int64))
+        user_ids = user_ids[~self.contains_many(user_ids)].tolist()
+        while user_ids:
+            if not self.layers or self.layers[-1].count >= self.layers[-1].capacity:
+                capacity = SEEN_FILTER_CAPACITY << len(self.layers)
+                self.layers.append(BloomFilter.for_capacity(capacity, SEEN_FILTER_ERROR_RATE))
+            layer = self.layers[-1]
+            room = max(1, layer.capacity - layer.count)
+            layer.add_many(user_ids[:room])
+            user_ids = user_ids[room:]
+
+    def contains_many(self, user_ids: np.ndarray) -> np.ndarray:
+        """Check which user IDs may have been seen."""
+        seen = np.zeros(len(user_ids), dtype=bool)
+        for layer in self.layers:
+            seen |= layer.contains_many(user_ids)
+        return seen
+
+    def to_bytes(self) -> bytes:
+        """Serialize all layers."""
+        return b"".join(
+            _LAYER_HEADER.pack(layer.num_bits, layer.num_hashes, layer.count) + layer.bits.tobytes()
+            for layer in self.layers
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SeenSet":
+        """Restore layers serialized by ``to_bytes``."""
+        layers = []
+        offset = 0
+        while offset < len(data):
+            num_bits, num_hashes, count = _LAYER_HEADER.unpack_from(data, offset)
+            offset += _LAYER_HEADER.size
+            size = (num_bits + 7) // 8
+            layers.append(BloomFilter(num_bits, num_hashes, data[offset:offset + size], count))
+            offset += size
+        return cls(layers)
+
+class SeenSetStore:
+    """Per-user seen sets cached in memory and persisted to ``seen_filters``."""
+
+    def __init__(self, cache_size: int = SEEN_FILTER_CACHE_SIZE):
+        """Initialize an empty store.
+
+        Args:
+            cache_size: Maximum number of seen sets kept in memory
+        """
+        self._cache = LRUCache(maxsize=cache_size)
+        self._lock = threading.RLock()
+
+    def get(self, session, user_id: int) -> SeenSet:
+        """Get a user's seen set, loading or bootstrapping it on a miss.
+
+        Args:
+            session: SQLAlchemy session
+            user_id: User ID
+
+        Returns:
+            Seen set of the user
+        """
+        with self._lock:
+            seen = self._cache.get(user_id)
+        if seen is not None:
+            return seen
+
+        row = session.get(SeenFilter, user_id)
+        if row is not None:
+            seen = SeenSet.from_bytes(row.data)
+        else:
+            seen = self._bootstrap(session, user_id)
+
+        with self._lock:
+            return self._cache.setdefault(user_id, seen)
+
+    def mark(self, user_id: int, seen_ids: Iterable[int]) -> None:
+        """Record user IDs as seen in a cached seen set without persisting it.
+
+        Sets that are not cached are left alone; ``add`` persists the IDs
+        once the decisions are written.
+
+        Args:
+            user_id: User ID
+            seen_ids: IDs of users to record
+        """
+        with self._lock:
+            seen = self._cache.get(user_id)
+            if seen is not None:
+                seen.add_many(seen_ids)
+
+    def add(self, session, user_id: int, seen_ids: Iterable[int]) -> None:
+        """Record user IDs as seen by a user and persist the filter.
+
+        Args:
+            session: SQLAlchemy session
+            user_id: User ID
+            seen_ids: IDs of users to record
+        """
+        seen = self.get(session, user_id)
+        with self._lock:
+            seen.add_many(seen_ids)
+            data = seen.to_bytes()
+            count = len(seen)
+        session.merge(SeenFilter(user_id=user_id, data=data, item_count=count))
+
+    def discard_user(self, session, user_id: int) -> None:
+        """Delete a user's seen set.
+
+        Args:
+            session: SQLAlchemy session
+            user_id: User ID
+        """
+        with self._lock:
+            self._cache.pop(user_id, None)
+        session.query(SeenFilter).filter(SeenFilter.user_id == user_id).delete(
+            synchronize_session=False
+        )
+
+    def _bootstrap(self, session, user_id: int) -> SeenSet:
+        """Build a seen set from the match history of a user without one."""
+        seen = SeenSet()
+        seen.add_many(
+            receiver_id for receiver_id, in session.query(Match.receiver_id).filter(
+                Match.sender_id == user_id
+            )
+        )
+        session.merge(SeenFilter(user_id=user_id, data=seen.to_bytes(), item_count=len(seen)))
+        return seen
+
+seen_sets = SeenSetStore()
@@ -0,0 +1,165 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import Float, and_, any_, case, cast, func, literal, or_
+
+from database.models import Profile, User
+from .engagement import PRIOR_ENGAGEMENT
+from .features import tokenize_bio, tokenize_hobbies
+from .scoring import WordOverlapBioSimilarity, score_candidates
+
+logger = logging.getLogger(__name__)
+
+def _token_overlap(tokens, column_tokens):
+    """SQL count of the given tokens that appear in an array expression."""
+    if not tokens:
+        return cast(literal(0), Float)
+    return cast(
+        sum(case((literal(token) == any_(column_tokens), 1), else_=0) for token in sorted(tokens)),
+        Float
+    )
+
+def match_score_expression(user: User, weights: Dict[str, float]):
+    """Build the SQL equivalent of ``calculate_match_score`` against ``profiles``.
+
+    The bio term always uses shared-word counting, regardless of the
+    configured bio similarity backend. With ``BIO_SIMILARITY_BACKEND``
+    set to ``minhash``, SQL scores and order therefore differ from the
+    Python ranking. Uses PostgreSQL array functions.
+
+    Args:
+        user: Requesting user
+        weights: Score weights keyed by term name
+
+    Returns:
+        SQL expression evaluating to each row's match score
+    """
+    def weight(name):
+        return cast(literal(weights[name]), Float)
+
+    age_diff = func.abs(Profile.age - user.age)
+    age_term = weight('age') * case(
+        (age_diff <= 2, cast(literal(1.0), Float)),
+        (age_diff <= 5, cast(literal(0.7), Float)),
+        else_=cast(literal(0.3), Float)
+    )
+    university_term = case(
+        (Profile.university == user.university, weight('university')),
+        else_=cast(literal(0.0), Float)
+    )
+
+    bio_words = func.regexp_split_to_array(func.lower(Profile.bio), r'\s+')
+    bio_term = weight('bio') * (_token_overlap(tokenize_bio(user.bio), bio_words) / cast(literal(10.0), Float))
+
+    hobby_list = func.string_to_array(func.lower(Profile.hobbies), ',')
+    hobby_term = weight('hobbies') * (_token_overlap(tokenize_hobbies(user.hobbies), hobby_list) / cast(literal(5.0), Float))
+
+    engagement_term = cast(literal(weights.get('engagement', 0.0)), Float) * func.coalesce(
+        User.engagement_score, cast(literal(PRIOR_ENGAGEMENT), Float)
+    )
+
+    return age_term + university_term + bio_term + hobby_term + engagement_term
+
+def rank_in_database(
+    session,
+    user: User,
+    limit: int,
+    weights: Dict[str, float],
+    after: Optional[Tuple[float, int]] = None,
+    seen=None
+) -> List[Tuple[User, float]]:
+    """Rank potential matches in the database and fetch only the top rows.
+
+    Scores follow ``match_score_expression``, so bios are compared by
+    shared words even when the MinHash backend is configured. Requires
+    PostgreSQL.
+
+    Args:
+        session: SQLAlchemy session
+        user: Requesting user
+        limit: Number of candidates to return
+        weights: Score weights keyed by term name
+        after: ``(score, user_id)`` keyset of the previous page, if any
+        seen: Seen set whose members are skipped, if any
+
+    Returns:
+        ``(candidate, score)`` pairs in rank order
+    """
+    score = match_score_expression(user, weights).label('score')
+    query = session.query(User, score).join(User.profile).filter(
+        User.id != user.id,
+        Profile.is_visible.is_(True),
+        Profile.gender != user.gender  # Match with opposite gender
+    )
+
+    # Apply filters based on preferences
+    if user.preferred_age_min:
+        query = query.filter(Profile.age >= user.preferred_age_min)
+    if user.preferred_age_max:
+        query = query.filter(Profile.age <= user.preferred_age_max)
+    if user.preferred_university:
+        query = query.filter(Profile.university == user.preferred_university)
+
+    # Seen candidates are dropped after the fetch, so keep paging until the page is full
+    ranked: List[Tuple[User, float]] = []
+    while len(ranked) < limit:
+        page_query = query
+        if after is not None:
+            after_score, after_id = after
+            page_query = page_query.filter(or_(
+                score.element < after_score,
+                and_(score.element == after_score, User.id > after_id)
+            ))
+        rows = page_query.order_by(score.desc(), User.id).limit(limit * 2).all()
+        if not rows:
+            break
+
+        if seen is not None:
+            unseen = ~seen.contains_many(np.array([match.id for match, _ in rows], dtype=np.int64))
+        else:
+            unseen = [True] * len(rows)
+        ranked.extend((match, match_score) for (match, match_score), keep in zip(rows, unseen) if keep)
+
+        last_match, last_score = rows[-1]
+        after = (last_score, last_match.id)
+
+    return ranked[:limit]
+
+def check_ranking_parity(
+    session,
+    user: User,
+    weights: Dict[str, float],
+    limit: int = 10,
+    tolerance: float = 1e-9
+) -> bool:
+    """Check database scores against the Python scorer for a user's top candidates.
+
+    The Python side uses word-overlap bio similarity, as the SQL does.
+    Exercised by ``tests/test_sql_ranking.py``.
+
+    Args:
+        session: SQLAlchemy session
+        user: Requesting user
+        weights: Score weights keyed by term name
+        limit: Number of top candidates to compare
+        tolerance: Allowed absolute score difference
+
+    Returns:
+        True if both scorers agree on every compared candidate
+    """
+    ranked = rank_in_database(session, user, limit, weights)
+    if not ranked:
+        return True
+
+    candidates = [match for match, _ in ranked]
+    database_scores = np.array([score for _, score in ranked], dtype=np.float64)
+    python_scores = score_candidates(user, candidates, weights, WordOverlapBioSimilarity())
+
+    mismatched = np.flatnonzero(np.abs(database_scores - python_scores) > tolerance)
+    for position in mismatched.tolist():
+        logger.warning(
+            f"Score mismatch for user {user.id} and candidate {candidates[position].id}: "
+            f"database {database_scores[position]}, python {python_scores[position]}"
+        )
+    return not len(mismatched)
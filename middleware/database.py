@@ -2,14 +2,18 @@ import logging
 from typing import Any, Awaitable, Callable, Dict
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from database.connection import get_session
+from database.connection import async_db
 
 logger = logging.getLogger(__name__)
 
 class DatabaseMiddleware(BaseMiddleware):
-    """Middleware for handling database sessions."""
+    """Middleware providing one database session per update.
+
+    The session is injected into handlers as ``session`` and committed once
+    the handler returns, or rolled back if it raises. A connection is only
+    checked out when the handler first queries.
+    """
 
     async def __call__(
         self,
@@ -19,8 +23,7 @@ class DatabaseMiddleware(BaseMiddleware):
     ) -> Any:
         """Handle database session for request."""
         try:
-            # Get database session
-            async for session in get_session():
+            async with async_db.get_session() as session:
                 # Add session to data
                 data["session"] = session
 
@@ -29,17 +32,11 @@ class DatabaseMiddleware(BaseMiddleware):
         except Exception as e:
             logger.error(f"Database middleware error: {e}")
             raise
-        finally:
-            # Ensure session is closed
-            if "session" in data:
-                await data["session"].close()
 
     async def close(self) -> None:
         """Cleanup middleware resources."""
         try:
-            # Close any remaining sessions
-            if hasattr(self, "_session"):
-                await self._session.close()
+            await async_db.dispose()
         except Exception as e:
             logger.error(f"Error closing database middleware: {e}")
-            raise 
\ No newline at end of file
+            raise
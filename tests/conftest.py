@@ -0,0 +1,103 @@
+import os
+
+# Placeholders so ``config`` imports outside a deployment; real values win
+for key, value in {
+    "BOT_TOKEN": "test",
+    "DATABASE_URL": "sqlite://",
+    "OFFICIAL_CHANNEL": "@test_official",
+    "CONFESSION_CHANNEL": "@test_confessions",
+    "ADMIN_IDS": "1"
+}.items():
+    os.environ.setdefault(key, value)
+
+import pytest  # noqa: E402
+import pytest_asyncio  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from database.models import Base  # noqa: E402
+
+class FakeState:
+    """In-memory stand-in for aiogram's FSMContext."""
+
+    def __init__(self, **data):
+        self.data = dict(data)
+        self.state = None
+
+    async def get_data(self):
+        return dict(self.data)
+
+    async def update_data(self, **data):
+        self.data.update(data)
+
+    async def set_state(self, state):
+        self.state = state
+
+    async def clear(self):
+        self.data.clear()
+        self.state = None
+
+class FakeBot:
+    """Bot recording the messages it sends as ``(chat_id, text)``."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, chat_id, text=None, reply_markup=None, **kwargs):
+        self.sent.append((chat_id, text))
+
+class FakeMessage:
+    """Message recording what a handler answers."""
+
+    def __init__(self, from_user_id: int = 1, text: str = None, photo=None, bot: FakeBot = None):
+        self.bot = bot or FakeBot()
+        self.from_user = FakeUser(from_user_id)
+        self.chat = FakeUser(from_user_id)
+        self.text = text
+        self.photo = photo
+        self.answers = []
+
+    async def answer(self, text=None, reply_markup=None, **kwargs):
+        self.answers.append(text)
+
+    async def answer_photo(self, photo=None, caption=None, reply_markup=None, **kwargs):
+        self.answers.append(caption)
+
+    async def edit_reply_markup(self, reply_markup=None):
+        pass
+
+class FakeUser:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.username = f"user{user_id}"
+        self.first_name = f"User{user_id}"
+        self.last_name = None
+
+    def mention_html(self):
+        return f"@{self.username}"
+
+class FakeCallback:
+    """Callback query carrying its data and a recording message."""
+
+    def __init__(self, data: str, from_user_id: int = 1, bot: FakeBot = None):
+        self.data = data
+        self.bot = bot or FakeBot()
+        self.from_user = FakeUser(from_user_id)
+        self.message = FakeMessage(from_user_id, bot=self.bot)
+        self.answers = []
+
+    async def answer(self, text=None, **kwargs):
+        self.answers.append(text)
+
+@pytest_asyncio.fixture
+async def async_engine():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+@pytest_asyncio.fixture
+async def async_session(async_engine):
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
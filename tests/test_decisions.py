@@ -0,0 +1,135 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from database.database import Database
+from database.models import Match, MatchStatus, User
+from matching import decisions
+from matching.decisions import DecisionBuffer
+from matching.likes import LikeIndex
+from matching.seen import SeenSetStore
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    database = Database(f"sqlite:///{tmp_path / 'decisions.db'}")
+    database.create_tables()
+    with database.get_session() as session:
+        session.add_all(User(id=user_id, telegram_id=100 + user_id) for user_id in range(1, 5))
+    monkeypatch.setattr(decisions, "get_session", database.get_session)
+    monkeypatch.setattr(decisions, "seen_sets", SeenSetStore())
+    yield database
+    database.engine.dispose()
+
+@pytest.fixture
+def buffer(database):
+    return DecisionBuffer(likes=LikeIndex(), flush_size=100)
+
+def stored_matches(database):
+    with database.get_session() as session:
+        return {(match.sender_id, match.receiver_id): match.status for match in session.query(Match)}
+
+def reactions(database):
+    with database.get_session() as session:
+        return {user.id: (user.likes_received, user.skips_received) for user in session.query(User)}
+
+@pytest.mark.asyncio
+async def test_mutual_like_in_one_flush_accepts_both_rows(database, buffer):
+    assert not await buffer.like(1, 2)
+    assert await buffer.like(2, 1)
+
+    assert buffer.flush_events() == 2
+
+    assert stored_matches(database) == {(1, 2): MatchStatus.ACCEPTED, (2, 1): MatchStatus.ACCEPTED}
+    assert reactions(database)[1] == (1, 0) and reactions(database)[2] == (1, 0)
+
+@pytest.mark.asyncio
+async def test_mutual_like_promotes_a_like_flushed_earlier(database, buffer):
+    await buffer.like(1, 2)
+    buffer.flush_events()
+    assert stored_matches(database) == {(1, 2): MatchStatus.PENDING}
+
+    assert await buffer.like(2, 1)
+    buffer.flush_events()
+
+    assert stored_matches(database) == {(1, 2): MatchStatus.ACCEPTED, (2, 1): MatchStatus.ACCEPTED}
+
+@pytest.mark.asyncio
+async def test_failed_flush_requeues_decisions_ahead_of_new_ones(database, buffer, monkeypatch):
+    await buffer.like(1, 2)
+    buffer.skip(1, 3)
+    write = buffer._write
+
+    def fail(events):
+        raise OperationalError("INSERT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(buffer, "_write", fail)
+    with pytest.raises(OperationalError):
+        buffer.flush_events()
+    await buffer.like(3, 4)
+
+    assert buffer._events == [('like', 1, 2), ('skip', 1, 3), ('like', 3, 4)]
+
+    monkeypatch.setattr(buffer, "_write", write)
+    assert buffer.flush_events() == 3
+    assert len(buffer) == 0
+    assert stored_matches(database) == {(1, 2): MatchStatus.PENDING, (3, 4): MatchStatus.PENDING}
+    assert reactions(database)[3] == (0, 1)
+
+@pytest.mark.asyncio
+async def test_rejected_decision_is_dropped_and_the_rest_written(database, buffer):
+    await buffer.like(1, 2)
+    buffer._events.append(('like', 3, None))  # receiver_id is NOT NULL
+    await buffer.like(3, 4)
+
+    assert buffer.flush_events() == 2
+
+    assert len(buffer) == 0
+    assert stored_matches(database) == {(1, 2): MatchStatus.PENDING, (3, 4): MatchStatus.PENDING}
+
+@pytest.mark.asyncio
+async def test_skip_does_not_overwrite_a_like(database, buffer):
+    await buffer.like(1, 2)
+    buffer.skip(1, 2)
+    buffer.flush_events()
+
+    assert stored_matches(database) == {(1, 2): MatchStatus.PENDING}
+    assert reactions(database)[2] == (1, 1)
+
+@pytest.mark.asyncio
+async def test_like_after_a_skip_is_stored(database, buffer):
+    buffer.skip(1, 2)
+    buffer.flush_events()
+    await buffer.like(1, 2)
+    buffer.flush_events()
+
+    assert stored_matches(database) == {(1, 2): MatchStatus.PENDING}
+    assert reactions(database)[2] == (1, 1)
+
+@pytest.mark.asyncio
+async def test_repeated_like_keeps_one_row(database, buffer):
+    await buffer.like(1, 2)
+    buffer.flush_events()
+    buffer._events.append(('like', 1, 2))
+
+    assert buffer.flush_events() == 1
+
+    assert stored_matches(database) == {(1, 2): MatchStatus.PENDING}
+
+@pytest.mark.asyncio
+async def test_discard_user_drops_pending_decisions(database, buffer):
+    await buffer.like(1, 2)
+    buffer.skip(3, 1)
+    await buffer.like(3, 4)
+
+    buffer.discard_user(1)
+
+    assert buffer._events == [('like', 3, 4)]
+
+@pytest.mark.asyncio
+async def test_stop_writes_pending_decisions(database, buffer):
+    buffer.start()
+    await buffer.like(1, 2)
+
+    await buffer.stop()
+
+    assert len(buffer) == 0
+    assert stored_matches(database) == {(1, 2): MatchStatus.PENDING}
@@ -0,0 +1,70 @@
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from config import MATCH_SCORE_WEIGHTS
+from matching.diversity import diversify, mmr_order
+from matching.features import feature_cache
+from matching.scoring import CandidateFeatures
+
+# Far above the IDs other tests use, since features are cached by user ID
+FIRST_ID = 10 ** 6
+HOBBIES = ["reading", "chess", "football", "music", "hiking", "coding", "dancing", "cooking"]
+UNIVERSITIES = ["AAU", "JU", "HU", "BDU"]
+
+def make_candidate(offset: int, age: int, university: str, hobbies: str, bio: str = ""):
+    return SimpleNamespace(
+        id=FIRST_ID + offset, age=age, university=university,
+        bio=bio, hobbies=hobbies, engagement_score=None
+    )
+
+@pytest.fixture
+def ranked():
+    rng = random.Random(11)
+    candidates = [
+        make_candidate(offset, rng.randint(18, 30), rng.choice(UNIVERSITIES), ",".join(rng.sample(HOBBIES, 3)))
+        for offset in range(40)
+    ]
+    scores = sorted((rng.uniform(0, 5) for _ in candidates), reverse=True)
+    yield list(zip(candidates, scores))
+    for offset in range(200):
+        feature_cache.evict(FIRST_ID + offset)
+
+def selection(ranked, k, diversity):
+    scores = np.array([score for _, score in ranked])
+    features = CandidateFeatures.from_users([candidate for candidate, _ in ranked])
+    return mmr_order(scores, features, k, diversity, MATCH_SCORE_WEIGHTS)
+
+@pytest.mark.parametrize("diversity", [0.3, 0.7, 1.0])
+def test_selection_is_deterministic(ranked, diversity):
+    first = selection(ranked, 10, diversity)
+
+    assert selection(ranked, 10, diversity) == first
+    assert diversify(ranked, 10, diversity, MATCH_SCORE_WEIGHTS) == [ranked[position] for position in first]
+    assert len(set(first)) == 10
+
+def test_pure_relevance_reproduces_score_order(ranked):
+    # A diversity of 0 is the MMR lambda of 1: relevance only
+    assert selection(ranked, 10, 0.0) == list(range(10))
+    assert diversify(ranked, 10, 0.0, MATCH_SCORE_WEIGHTS) == ranked[:10]
+
+def test_equal_scores_keep_rank_order(ranked):
+    tied = [(candidate, 1.0) for candidate, _ in ranked]
+
+    assert selection(tied, 10, 0.0) == list(range(10))
+
+def test_near_duplicates_are_pushed_down(ranked):
+    duplicate_a = make_candidate(100, 21, "AAU", "reading,chess,music", "books and coffee")
+    duplicate_b = make_candidate(101, 21, "AAU", "reading,chess,music", "books and coffee")
+    different = make_candidate(102, 27, "JU", "football,hiking", "mountains")
+    ranked[:] = [(duplicate_a, 3.0), (duplicate_b, 2.9), (different, 2.8)]
+
+    assert selection(ranked, 3, 0.0) == [0, 1, 2]
+    assert selection(ranked, 3, 0.5) == [0, 2, 1]
+
+def test_short_lists_are_returned_whole(ranked):
+    assert sorted(selection(ranked[:3], 10, 0.5)) == [0, 1, 2]
+    assert diversify(ranked[:1], 10, 0.5, MATCH_SCORE_WEIGHTS) == ranked[:1]
+    assert diversify([], 10, 0.5, MATCH_SCORE_WEIGHTS) == []
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+import pytest_asyncio
+
+from handlers import profile
+from matching.index import CandidateIndex, HobbyIndex
+from matching.scoring import MinHashBioSimilarity
+
+from conftest import FakeCallback, FakeMessage, FakeState
+from test_profile_handlers import create_profile
+
+@pytest_asyncio.fixture
+async def indexes(monkeypatch):
+    indexes = CandidateIndex(), HobbyIndex(), MinHashBioSimilarity()
+    for name, index in zip(("candidate_index", "hobby_index", "bio_similarity"), indexes):
+        monkeypatch.setattr(profile, name, index)
+    return indexes
+
+async def assert_matches_rebuild(session, indexes):
+    """Compare the incrementally maintained indexes with ones built from the database."""
+    candidates, hobbies, bios = indexes
+    rebuilt_candidates, rebuilt_hobbies, rebuilt_bios = CandidateIndex(), HobbyIndex(), MinHashBioSimilarity()
+    await session.run_sync(rebuilt_candidates.build)
+    await session.run_sync(rebuilt_hobbies.build)
+    await session.run_sync(rebuilt_bios.build)
+
+    assert candidates._entries == rebuilt_candidates._entries
+    assert sorted(candidates.candidates(None)) == sorted(rebuilt_candidates.candidates(None))
+    assert {user_id: set(tokens) for user_id, tokens in hobbies._user_tokens.items()} == {
+        user_id: set(tokens) for user_id, tokens in rebuilt_hobbies._user_tokens.items()
+    }
+    assert hobbies._postings == rebuilt_hobbies._postings
+    signatures, rebuilt_signatures = bios.store._signatures, rebuilt_bios.store._signatures
+    assert signatures.keys() == rebuilt_signatures.keys()
+    for user_id, signature in signatures.items():
+        assert np.array_equal(signature, rebuilt_signatures[user_id])
+
+@pytest.mark.asyncio
+async def test_profile_changes_keep_indexes_in_sync(async_session, indexes):
+    await create_profile(async_session, 1)
+    await create_profile(async_session, 2, gender="male", university="JU", bio="books and hiking", hobbies="hiking")
+    await create_profile(async_session, 3, gender="male", hobbies="chess,football")
+    await assert_matches_rebuild(async_session, indexes)
+
+    for field, value in (("age", "25"), ("bio", "coffee and long walks"), ("hobbies", "football,music")):
+        await profile.save_edit(FakeMessage(1, text=value), FakeState(edit_field=field), async_session)
+    await profile.save_gender_edit(FakeCallback("gender:female", 3), FakeState(), async_session)
+    await profile.save_university_edit(FakeCallback("university:HU", 2), FakeState(), async_session)
+    await async_session.commit()
+    await assert_matches_rebuild(async_session, indexes)
+
+    await profile.delete_profile(FakeCallback("confirm_delete", 2), FakeState(), async_session)
+    await async_session.commit()
+    await assert_matches_rebuild(async_session, indexes)
+    assert 2 not in indexes[0]._entries
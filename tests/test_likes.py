@@ -0,0 +1,43 @@
+import pytest
+
+from matching.decisions import DecisionBuffer
+from matching.likes import LikeIndex
+
+@pytest.mark.asyncio
+async def test_second_like_completes_the_match():
+    likes = LikeIndex()
+
+    assert not await likes.like(1, 2)
+    assert await likes.likers(2) == {1}
+    assert await likes.like(2, 1)
+    assert await likes.likers(1) == set() and await likes.likers(2) == set()
+
+@pytest.mark.asyncio
+async def test_build_replaces_the_pending_likes():
+    likes = LikeIndex()
+    await likes.like(5, 6)
+
+    await likes.build([(1, 3), (2, 3)])
+
+    assert await likes.likers(3) == {1, 2}
+    assert await likes.likers(6) == set()
+    assert await likes.like(3, 1)
+
+@pytest.mark.asyncio
+async def test_discard_user_drops_likes_in_both_directions():
+    likes = LikeIndex()
+    await likes.build([(1, 2), (2, 3), (3, 1)])
+
+    await likes.discard_user(2)
+
+    assert await likes.likers(2) == set() and await likes.likers(3) == set()
+    assert await likes.likers(1) == {3}
+    assert not await likes.like(2, 1)
+
+@pytest.mark.asyncio
+async def test_decision_buffer_records_mutual_matches():
+    buffer = DecisionBuffer(likes=LikeIndex())
+
+    assert not await buffer.like(1, 2)
+    assert await buffer.like(2, 1)
+    assert [event[0] for event in buffer._events] == ['like', 'match']
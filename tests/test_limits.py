@@ -0,0 +1,123 @@
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from database import limits
+from database.database import Database
+from database.limits import DailyLimitService, LocalCounterStore, counter_key
+from database.models import DailyLimit, User
+
+class Clock:
+    """Stand-in for ``time.monotonic`` that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(limits, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    database = Database(f"sqlite:///{tmp_path / 'limits.db'}")
+    database.create_tables()
+    with database.get_session() as session:
+        session.add_all(User(id=user_id, telegram_id=100 + user_id) for user_id in range(1, 4))
+    monkeypatch.setattr(limits, "get_session", database.get_session)
+    yield database
+    database.engine.dispose()
+
+@pytest.fixture
+def service(database):
+    return DailyLimitService(LocalCounterStore())
+
+def stored_limits(database):
+    with database.get_session() as session:
+        return {
+            (limit.user_id, limit.date): (limit.match_count, limit.confession_count)
+            for limit in session.query(DailyLimit)
+        }
+
+@pytest.mark.asyncio
+async def test_try_consume_stops_at_the_limit(service):
+    assert [await service.try_consume(1, 'match', 2) for _ in range(3)] == [True, True, False]
+
+    assert await service.count(1, 'match') == 2
+    assert await service.count(1, 'confession') == 0
+    assert await service.try_consume(2, 'match', 2)
+
+@pytest.mark.asyncio
+async def test_expired_counters_restart_and_are_swept(clock):
+    store = LocalCounterStore(sweep_interval=10)
+    assert await store.incr_if_below("a", 1, ttl=5) == (True, 1)
+    assert await store.incr_if_below("a", 1, ttl=5) == (False, 1)
+
+    clock.now += 6
+    assert await store.get_many(["a"]) == [0]
+    assert await store.incr_if_below("a", 1, ttl=5) == (True, 1)
+
+    clock.now += 6
+    assert len(store) == 1
+    await store.incr_if_below("b", 1, ttl=5)
+    assert len(store) == 1  # "a" swept, only "b" left
+
+@pytest.mark.asyncio
+async def test_set_at_least_never_lowers_a_counter(clock):
+    store = LocalCounterStore()
+    await store.set_at_least("a", 3, ttl=60)
+    await store.set_at_least("a", 1, ttl=60)
+
+    assert await store.get_many(["a", "b"]) == [3, 0]
+
+@pytest.mark.asyncio
+async def test_load_seeds_today_from_daily_limits(database, service):
+    today = limits._day_start()
+    with database.get_session() as session:
+        session.add(DailyLimit(user_id=1, date=today, match_count=3, confession_count=1))
+        session.add(DailyLimit(user_id=2, date=today - timedelta(days=1), match_count=5, confession_count=0))
+
+    await service.load()
+
+    assert await service.count(1, 'match') == 3
+    assert await service.count(1, 'confession') == 1
+    assert await service.count(2, 'match') == 0
+    assert not await service.try_consume(1, 'match', 3)
+
+@pytest.mark.asyncio
+async def test_flush_writes_changed_counters(database, service):
+    today = limits._day_start()
+    with database.get_session() as session:
+        session.add(DailyLimit(user_id=2, date=today, match_count=0, confession_count=4))
+    await service.try_consume(1, 'match', 5)
+    await service.try_consume(1, 'match', 5)
+    await service.try_consume(2, 'match', 5)
+
+    assert await service.flush() == 2
+
+    # Columns not counted in memory keep their stored value
+    assert stored_limits(database) == {(1, today): (2, 0), (2, today): (1, 4)}
+    assert await service.flush() == 0
+
+@pytest.mark.asyncio
+async def test_failed_flush_requeues_the_keys(database, service, monkeypatch):
+    today = limits._day_start()
+    await service.try_consume(1, 'confession', 5)
+    write = service._write
+
+    def fail(rows):
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(service, "_write", fail)
+    assert await service.flush() == 0
+    assert service._dirty == {counter_key('confession', 1, today)}
+    assert stored_limits(database) == {}
+
+    monkeypatch.setattr(service, "_write", write)
+    assert await service.flush() == 1
+    assert stored_limits(database) == {(1, today): (0, 1)}
@@ -0,0 +1,32 @@
+import pytest
+
+from handlers import match
+from handlers.states import MatchStates
+
+from conftest import FakeMessage, FakeState
+from test_profile_handlers import create_profile
+
+@pytest.mark.asyncio
+async def test_start_matching_ranks_in_one_worker_job(async_session, monkeypatch):
+    user = await create_profile(async_session)
+    jobs = []
+
+    async def run_blocking(function, *args):
+        # The update's own connection is released before the worker checks one out
+        jobs.append((function, args, async_session.in_transaction()))
+        return [7], [8, 9], {'after': [0.5, 9], 'carry': []}
+
+    async def show_next_match(message, state, session):
+        pass
+
+    monkeypatch.setattr(match, "run_blocking", run_blocking)
+    monkeypatch.setattr(match, "show_next_match", show_next_match)
+    state = FakeState()
+
+    await match.start_matching(FakeMessage(1), state, async_session)
+
+    assert jobs == [(match.load_feed_start, (1, set()), False)]
+    assert state.state == MatchStates.viewing_matches
+    assert state.data['user_id'] == user.id
+    assert (state.data['liked_you'], state.data['match_ids']) == ([7], [7, 8, 9])
+    assert state.data['match_keyset'] == {'after': [0.5, 9], 'carry': []}
@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from database.models import Base, Gender, Profile, University, User
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+def test_profile_fields_create_the_profile(session):
+    user = User(
+        telegram_id=1, username="abebe", first_name="Abebe",
+        age=21, gender=Gender.MALE, university=University.AAU,
+        bio="I like reading", hobbies="reading,chess", photo_id="photo"
+    )
+    session.add(user)
+    session.commit()
+
+    profile = session.query(Profile).one()
+    assert profile.user_id == user.id
+    assert (profile.age, profile.gender, profile.university) == (21, Gender.MALE, University.AAU)
+    assert (profile.bio, profile.hobbies, profile.photo_id) == ("I like reading", "reading,chess", "photo")
+
+def test_profile_fields_update_the_existing_profile(session):
+    user = User(telegram_id=1, profile=Profile(age=20, gender=Gender.FEMALE, university=University.JU))
+    session.add(user)
+    session.commit()
+
+    user.age = 22
+    user.preferred_university = University.HU
+    session.commit()
+
+    profile = session.query(Profile).one()
+    assert (profile.age, profile.preferred_university) == (22, University.HU)
+
+def test_deleting_the_user_deletes_the_profile(session):
+    user = User(telegram_id=1, profile=Profile(age=20, gender=Gender.FEMALE, university=University.JU))
+    session.add(user)
+    session.commit()
+
+    session.delete(user)
+    session.commit()
+
+    assert session.query(Profile).count() == 0
@@ -0,0 +1,130 @@
+import threading
+
+import pytest
+import pytest_asyncio
+
+from database.database import Database
+from database.models import ReportStatus
+from database import offload
+from database.offload import CRUD_METHODS, ThreadedDatabase
+from handlers import report
+
+from conftest import FakeBot, FakeCallback, FakeMessage, FakeState
+
+@pytest.fixture
+def database(tmp_path):
+    database = Database(f"sqlite:///{tmp_path / 'offload.db'}")
+    database.create_tables()
+    yield database
+    database.engine.dispose()
+
+@pytest_asyncio.fixture
+async def threaded(database):
+    threaded = ThreadedDatabase(database, max_workers=2)
+    yield threaded
+    threaded.shutdown()
+
+@pytest_asyncio.fixture
+async def users(threaded):
+    return [
+        await threaded.create_user({"telegram_id": 100 + i, "username": f"user{i}"})
+        for i in range(1, 4)
+    ]
+
+def test_crud_methods_exist():
+    assert not {name for name in CRUD_METHODS if not callable(getattr(Database, name, None))}
+
+@pytest.mark.asyncio
+async def test_calls_run_in_worker_threads(threaded):
+    threads = []
+
+    def record():
+        threads.append(threading.current_thread().name)
+
+    await threaded.run(record)
+
+    assert threads[0].startswith("db")
+    assert threaded.stats()["queue_depth"] == 0
+
+@pytest.mark.asyncio
+async def test_user_round_trip(threaded, users):
+    assert users[0]["id"] and users[0]["telegram_id"] == 101
+    assert (await threaded.get_user_by_telegram_id(101))["id"] == users[0]["id"]
+    assert (await threaded.get_user(users[1]["id"]))["username"] == "user2"
+    assert (await threaded.get_user_by_username("user3"))["id"] == users[2]["id"]
+
+    assert await threaded.update_user(101, {"first_name": "Abebe"})
+    assert (await threaded.get_user(users[0]["id"]))["first_name"] == "Abebe"
+
+    assert await threaded.delete_user(103)
+    assert await threaded.get_user_by_telegram_id(103) is None
+    assert not await threaded.delete_user(103)
+
+@pytest.mark.asyncio
+async def test_report_round_trip(threaded, users):
+    created = await threaded.create_report({
+        "reporter_id": users[0]["id"], "reported_id": users[1]["id"],
+        "reason": "spam", "status": ReportStatus.PENDING
+    })
+
+    assert (await threaded.get_report(created["id"]))["reason"] == "spam"
+    assert await threaded.update_report(created["id"], {"status": ReportStatus.APPROVED})
+    assert (await threaded.get_report(created["id"]))["status"] is ReportStatus.APPROVED
+    assert await threaded.get_report(created["id"] + 1) is None
+
+@pytest.mark.asyncio
+async def test_match_and_confession_round_trip(threaded, users):
+    match = await threaded.create_match({"sender_id": users[0]["id"], "receiver_id": users[1]["id"]})
+    assert await threaded.update_match(match["id"], {"receiver_id": users[2]["id"]})
+    assert [row["id"] for row in await threaded.get_matches(users[2]["id"])] == [match["id"]]
+
+    confession = await threaded.create_confession({"user_id": users[0]["id"], "content": "hi"})
+    assert await threaded.update_confession(confession["id"], {"content": "hello"})
+    assert [row["content"] for row in await threaded.get_confessions(users[0]["id"])] == ["hello"]
+
+@pytest.mark.asyncio
+async def test_report_flow(threaded, users, monkeypatch):
+    monkeypatch.setattr(offload, "_threaded_db", threaded)
+    monkeypatch.setattr(report, "ADMIN_IDS", [999])
+    bot = FakeBot()
+    state = FakeState()
+
+    await report.start_report(FakeMessage(101, text="/report", bot=bot), state)
+    await report.process_reported_user(FakeMessage(101, text="@user2", bot=bot), state)
+    confirmation = FakeMessage(101, text="Sends spam", bot=bot)
+    await report.process_report_reason(confirmation, state)
+
+    assert confirmation.answers == [report.MESSAGES['report_submitted']]
+    (pending,), _ = await threaded.get_reports_page(status=ReportStatus.PENDING)
+    assert (pending["reporter_id"], pending["reported_id"]) == (users[0]["id"], users[1]["id"])
+    assert bot.sent[0][0] == 999
+
+    callback = FakeCallback(f"report_{pending['id']}_approve", from_user_id=999, bot=bot)
+    await report.handle_report_action(callback, FakeState())
+
+    assert callback.answers == ["Report approved"]
+    assert (await threaded.get_report(pending["id"]))["status"] is ReportStatus.APPROVED
+    assert bot.sent[-1][0] == 101
+
+@pytest.mark.asyncio
+async def test_reporting_oneself_is_refused(threaded, users, monkeypatch):
+    monkeypatch.setattr(offload, "_threaded_db", threaded)
+    state = FakeState(reporter_id=users[0]["id"])
+    message = FakeMessage(101, text="101")
+
+    await report.process_reported_user(message, state)
+
+    assert message.answers == ["You cannot report yourself."]
+    assert "reported_id" not in state.data
+
+@pytest.mark.asyncio
+async def test_shared_pool_starts_on_first_use(database, monkeypatch):
+    monkeypatch.setattr(offload, "_threaded_db", None)
+    monkeypatch.setattr(offload, "get_database", lambda: database)
+
+    name = await offload.run_blocking(lambda: threading.current_thread().name)
+
+    assert name.startswith("db")
+    assert offload.get_threaded_db().database is database
+    offload.shutdown_threaded_db()
+    assert offload._threaded_db is None
@@ -0,0 +1,131 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+
+from database.database import AsyncDatabase, Database, decode_cursor, encode_cursor
+from database.models import Confession, ConfessionStatus, Match, MatchStatus, Report, ReportStatus, User
+
+START = datetime(2026, 1, 1, 12, 0)
+
+@pytest.fixture
+def database_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'pages.db'}"
+
+@pytest.fixture
+def database(database_url):
+    database = Database(database_url)
+    database.create_tables()
+    with database.get_session() as session:
+        session.add_all(User(id=user_id, telegram_id=100 + user_id) for user_id in range(1, 4))
+        # Pairs of confessions share created_at, so pages must break ties on id
+        session.add_all(
+            Confession(
+                id=confession_id, user_id=1, content=f"confession {confession_id}",
+                status=ConfessionStatus.APPROVED if confession_id % 2 else ConfessionStatus.PENDING,
+                created_at=START + timedelta(minutes=(confession_id - 1) // 2)
+            )
+            for confession_id in range(1, 8)
+        )
+        session.add(Confession(id=8, user_id=2, content="other user", created_at=START))
+        session.add_all([
+            Match(sender_id=1, receiver_id=2, status=MatchStatus.PENDING, created_at=START),
+            Match(sender_id=3, receiver_id=1, status=MatchStatus.ACCEPTED, created_at=START),
+            Match(sender_id=2, receiver_id=3, status=MatchStatus.PENDING, created_at=START),
+        ])
+        session.add_all([
+            Report(reporter_id=1, reported_id=2, reason="spam", status=ReportStatus.PENDING, created_at=START),
+            Report(reporter_id=3, reported_id=2, reason="rude", status=ReportStatus.APPROVED, created_at=START),
+        ])
+    yield database
+    database.engine.dispose()
+
+@pytest_asyncio.fixture
+async def async_database(database, database_url):
+    async_database = AsyncDatabase(database_url)
+    yield async_database
+    await async_database.dispose()
+
+def walk_pages(fetch, limit):
+    """Collect every page of a paginated getter, checking only the last has no cursor."""
+    pages, cursor = [], None
+    while True:
+        page, cursor = fetch(cursor=cursor, limit=limit)
+        pages.append([row['id'] for row in page])
+        if cursor is None:
+            return pages
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(START, 42)) == (START, 42)
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor",
+    base64.urlsafe_b64encode(b"[1, 2, 3]").decode(),
+    base64.urlsafe_b64encode(json.dumps(["yesterday", 1]).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps([START.isoformat(), "x"]).encode()).decode(),
+])
+def test_malformed_cursors_are_rejected(database, cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+    assert database.get_confessions_page(user_id=1, cursor=cursor) == ([], None)
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 7, 10])
+def test_pages_walk_ties_in_order(database, limit):
+    pages = walk_pages(lambda **page: database.get_confessions_page(user_id=1, **page), limit)
+
+    assert [row_id for page in pages for row_id in page] == [7, 6, 5, 4, 3, 2, 1]
+    # The look-ahead row means a full last page is not followed by an empty one
+    assert all(pages) and all(len(page) == limit for page in pages[:-1])
+
+def test_pages_apply_the_filters(database):
+    assert walk_pages(lambda **page: database.get_confessions_page(user_id=1, status="approved", **page), 2) == [
+        [7, 5], [3, 1]
+    ]
+    assert walk_pages(lambda **page: database.get_confessions_page(status=ConfessionStatus.PENDING, **page), 10) == [
+        [6, 4, 8, 2]
+    ]
+
+def test_match_pages_cover_both_directions(database):
+    page, cursor = database.get_matches_page(1)
+
+    assert {(match['sender_id'], match['receiver_id']) for match in page} == {(1, 2), (3, 1)}
+    assert cursor is None
+
+def test_report_pages_filter_on_the_reported_user(database):
+    page, _ = database.get_reports_page(reported_user_id=2, status="PENDING")
+
+    assert [report['reason'] for report in page] == ["spam"]
+
+def test_unknown_status_returns_nothing(database):
+    assert database.get_confessions(status="bogus") == []
+    assert database.get_confessions_page(status="bogus") == ([], None)
+    assert database.get_matches_page(1, status=ReportStatus.PENDING) == ([], None)
+
+@pytest.mark.asyncio
+async def test_async_pages_match_sync_pages(database, async_database):
+    cursor, pages = None, []
+    while True:
+        page, cursor = await async_database.get_confessions_page(user_id=1, cursor=cursor, limit=3)
+        pages.append([row['id'] for row in page])
+        if cursor is None:
+            break
+
+    assert pages == walk_pages(lambda **page: database.get_confessions_page(user_id=1, **page), 3)
+    assert await async_database.get_confessions_page(cursor="not a cursor") == ([], None)
+    assert await async_database.get_reports_page(status="bogus") == ([], None)
+
+@pytest.mark.asyncio
+async def test_streams_match_the_listings(database, async_database):
+    streamed = [row['id'] async for row in async_database.stream_confessions(user_id=1, batch_size=2)]
+
+    assert streamed == [confession['id'] for confession in database.get_confessions(user_id=1)]
+    assert len([row async for row in async_database.stream_matches(1)]) == 2
+    assert len([row async for row in async_database.stream_reports(reported_user_id=2)]) == 2
+
+@pytest.mark.asyncio
+async def test_streams_end_cleanly_on_invalid_filters(async_database):
+    assert [row async for row in async_database.stream_matches(1, status="bogus")] == []
+    assert [row async for row in async_database.stream_confessions(status="bogus")] == []
+    assert [row async for row in async_database.stream_reports(status="bogus")] == []
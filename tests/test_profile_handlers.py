@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from database.models import Gender, Profile, University, User
+from handlers import profile
+
+from conftest import FakeCallback, FakeMessage, FakeState
+
+PROFILE_DATA = dict(age=21, gender="female", university="AAU", bio="I love books", hobbies="reading,chess")
+
+async def create_profile(session, telegram_id: int = 1, **data) -> User:
+    state = FakeState(**dict(PROFILE_DATA, **data))
+    message = FakeMessage(telegram_id, photo=[SimpleNamespace(file_id=f"photo{telegram_id}")])
+    await profile.process_photo(message, state, session)
+    await session.commit()
+    assert message.answers == ["✅ Your profile has been created!"]
+    return await session.scalar(select(User).filter_by(telegram_id=telegram_id))
+
+@pytest.mark.asyncio
+async def test_process_photo_creates_the_profile(async_session):
+    user = await create_profile(async_session)
+
+    stored = await async_session.scalar(select(Profile).filter_by(user_id=user.id))
+    assert (stored.age, stored.gender, stored.university) == (21, Gender.FEMALE, University.AAU)
+    assert (stored.bio, stored.hobbies, stored.photo_id) == ("I love books", "reading,chess", "photo1")
+
+@pytest.mark.asyncio
+async def test_profile_shows_enum_values(async_session):
+    user = await create_profile(async_session)
+
+    text = profile.format_profile(user)
+    assert "Gender: female" in text
+    assert "University: Addis Ababa University" in text
+
+@pytest.mark.asyncio
+async def test_unknown_university_is_rejected():
+    callback = FakeCallback("university:Not A University")
+    state = FakeState()
+
+    await profile.process_university(callback, state)
+
+    assert callback.answers == [profile.ERROR_MESSAGES['invalid_university']]
+    assert 'university' not in state.data
+
+@pytest.mark.asyncio
+async def test_university_edit_stores_the_enum_member(async_session):
+    user = await create_profile(async_session)
+
+    callback = FakeCallback("university:JU")
+    await profile.save_university_edit(callback, FakeState(), async_session)
+    await async_session.commit()
+
+    await async_session.refresh(user.profile)
+    assert user.university is University.JU
+
+@pytest.mark.asyncio
+async def test_match_card_shows_enum_values(async_session):
+    from handlers.match import format_match_profile
+    from matching.profiles import ProfileCard
+
+    user = await create_profile(async_session)
+
+    assert "University: Addis Ababa University" in format_match_profile(ProfileCard.from_user(user))
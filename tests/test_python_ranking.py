@@ -0,0 +1,171 @@
+"""Parity of the Python ranking paths with the scalar scorer.
+
+Runs against SQLite, so unlike ``test_sql_ranking`` it needs no
+PostgreSQL database: the vectorized scorer, the process pool, the score
+cache and both candidate retrieval paths must agree with
+``calculate_match_score`` and with a brute-force ranking.
+"""
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from benchmarks.population import load_population
+from config import MATCH_SCORE_WEIGHTS
+from database.models import Base, Profile, User
+from handlers import match
+from matching.features import feature_cache
+from matching.index import CandidateIndex, HobbyIndex, normalize_value
+from matching.score_cache import ScoreCache
+from matching.scoring import (
+    CandidateFeatures, MinHashBioSimilarity, ScoringPool, WordOverlapBioSimilarity,
+    score_candidates, score_features, university_code
+)
+from matching.seen import SeenSetStore
+
+POPULATION_SIZE = 300
+SAMPLED_USERS = range(1, POPULATION_SIZE + 1, 37)
+TOLERANCE = 1e-9
+
+def evict_population():
+    # Features are cached by user ID, so rows of other test databases must not leak in
+    for user_id in range(1, POPULATION_SIZE + 1):
+        feature_cache.evict(user_id)
+
+@pytest.fixture(scope="module")
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    evict_population()
+    with Session(engine) as session:
+        load_population(session, POPULATION_SIZE, seed=5)
+        # Some candidates with reactions, so the engagement term is not constant
+        for user in session.query(User).filter(User.id % 7 == 0):
+            user.likes_received = user.id % 5
+            user.skips_received = user.id % 3
+            user.engagement_score = (user.likes_received + 1) / (user.likes_received + user.skips_received + 5)
+        session.commit()
+        yield session
+    evict_population()
+    engine.dispose()
+
+@pytest.fixture
+def ranker(monkeypatch):
+    """Route ``rank_match_pool`` through fresh seen sets, scores and indexes."""
+    monkeypatch.setattr(match, "seen_sets", SeenSetStore())
+    monkeypatch.setattr(match, "score_cache", ScoreCache())
+    monkeypatch.setattr(match, "candidate_index", CandidateIndex())
+    monkeypatch.setattr(match, "hobby_index", HobbyIndex())
+    monkeypatch.setattr(match, "bio_similarity", WordOverlapBioSimilarity())
+    monkeypatch.setattr(match, "RANKING_BACKEND", "python")
+    return match
+
+def eligible_candidates(session, user):
+    """Candidates passing the same filters as ``query_potential_matches``."""
+    query = session.query(User).join(User.profile).filter(
+        User.id != user.id,
+        Profile.is_visible.is_(True),
+        Profile.gender != user.gender
+    )
+    if user.preferred_age_min:
+        query = query.filter(Profile.age >= user.preferred_age_min)
+    if user.preferred_age_max:
+        query = query.filter(Profile.age <= user.preferred_age_max)
+    if user.preferred_university:
+        query = query.filter(Profile.university == user.preferred_university)
+    return query.all()
+
+def brute_force_ranking(user, candidates, limit):
+    """``(score, user_id)`` of the best candidates, best first and lowest ID on ties."""
+    scores = [match.calculate_match_score(user, candidate) for candidate in candidates]
+    return sorted(zip(scores, [candidate.id for candidate in candidates]),
+                  key=lambda entry: (-entry[0], entry[1]))[:limit]
+
+def assert_same_ranking(ranked, expected):
+    assert len(ranked) == len(expected)
+    np.testing.assert_allclose(
+        [score for _, score in ranked], [score for score, _ in expected], rtol=0, atol=TOLERANCE
+    )
+    # Equal scores may differ in the last bits between paths; IDs only need to agree off ties
+    for (candidate, score), (expected_score, expected_id) in zip(ranked, expected):
+        if candidate.id != expected_id:
+            assert any(
+                abs(other_score - score) <= TOLERANCE and other_id == candidate.id
+                for other_score, other_id in expected
+            )
+
+@pytest.mark.parametrize("user_id", SAMPLED_USERS)
+def test_vectorized_scores_match_scalar_scorer(session, user_id):
+    user = session.get(User, user_id)
+    candidates = eligible_candidates(session, user)
+
+    scores = score_candidates(user, candidates, MATCH_SCORE_WEIGHTS, WordOverlapBioSimilarity())
+
+    expected = [match.calculate_match_score(user, candidate) for candidate in candidates]
+    np.testing.assert_allclose(scores, expected, rtol=0, atol=TOLERANCE)
+
+def test_minhash_batch_matches_pairwise_similarity(session):
+    user = session.get(User, SAMPLED_USERS[1])
+    candidates = eligible_candidates(session, user)
+    backend = MinHashBioSimilarity()
+
+    batch = backend.batch(user, candidates, CandidateFeatures.from_users(candidates))
+
+    np.testing.assert_allclose(batch, [backend.pair(user, candidate) for candidate in candidates], rtol=0, atol=0)
+
+def test_pool_chunks_match_inline_scoring(session):
+    user = session.get(User, SAMPLED_USERS[2])
+    candidates = eligible_candidates(session, user)
+    features = CandidateFeatures.from_users(candidates)
+    args = (
+        user.age,
+        university_code(normalize_value(user.university)),
+        np.asarray(feature_cache.get(user).hobby_ids, dtype=np.int64),
+        WordOverlapBioSimilarity().batch(user, candidates, features),
+        features,
+        MATCH_SCORE_WEIGHTS
+    )
+    pool = ScoringPool(workers=2, threshold=1)
+    try:
+        pooled = pool.score(*args)
+    finally:
+        pool.shutdown()
+
+    np.testing.assert_array_equal(pooled, score_features(*args))
+
+def test_cached_scores_match_fresh_scores(session):
+    user = session.get(User, SAMPLED_USERS[3])
+    candidates = eligible_candidates(session, user)
+    cache = ScoreCache()
+    expected = score_candidates(user, candidates, MATCH_SCORE_WEIGHTS)
+
+    first = cache.score(user, candidates, MATCH_SCORE_WEIGHTS)
+    second = cache.score(user, candidates, MATCH_SCORE_WEIGHTS)
+    batched = np.concatenate([scores for _, scores in cache.score_batches(
+        user, [candidates[:100], candidates[100:]], MATCH_SCORE_WEIGHTS, coalesce_size=64
+    )])
+
+    for scores in (first, second, batched):
+        np.testing.assert_allclose(scores, expected, rtol=0, atol=TOLERANCE)
+
+@pytest.mark.parametrize("indexed", [False, True], ids=["query", "index"])
+@pytest.mark.parametrize("user_id", SAMPLED_USERS)
+def test_pool_matches_brute_force_ranking(session, ranker, user_id, indexed):
+    if indexed:
+        ranker.candidate_index.build(session)
+        ranker.hobby_index.build(session)
+    user = session.get(User, user_id)
+
+    ranked = ranker.rank_match_pool(session, user, 25)
+
+    assert_same_ranking(ranked, brute_force_ranking(user, eligible_candidates(session, user), 25))
+
+def test_keyset_pages_cover_the_ranking(session, ranker):
+    user = session.get(User, SAMPLED_USERS[1])
+    full = ranker.rank_match_pool(session, user, 40)
+
+    first = ranker.rank_match_pool(session, user, 20)
+    last_match, last_score = first[-1]
+    second = ranker.rank_match_pool(session, user, 20, after=(last_score, last_match.id))
+
+    assert [candidate.id for candidate, _ in first + second] == [candidate.id for candidate, _ in full]
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from config import SEEN_FILTER_CAPACITY, SEEN_FILTER_ERROR_RATE
+from database.models import Base, Match, SeenFilter, User
+from matching.seen import BloomFilter, SeenSet, SeenSetStore
+
+# IDs never added by the tests, for measuring false positives
+PROBE_IDS = np.arange(10 ** 6, 10 ** 6 + 50000, dtype=np.int64)
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(User(id=user_id, telegram_id=100 + user_id) for user_id in range(1, 5))
+        session.commit()
+        yield session
+    engine.dispose()
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter.for_capacity(SEEN_FILTER_CAPACITY, SEEN_FILTER_ERROR_RATE)
+    ids = np.arange(0, bloom.capacity * 13, 13, dtype=np.int64)
+
+    bloom.add_many(ids)
+
+    assert bloom.contains_many(ids).all()
+    assert bloom.count == len(ids)
+
+def test_bloom_filter_false_positive_rate_at_capacity():
+    bloom = BloomFilter.for_capacity(SEEN_FILTER_CAPACITY, SEEN_FILTER_ERROR_RATE)
+    bloom.add_many(range(bloom.capacity))
+
+    assert bloom.contains_many(PROBE_IDS).mean() <= 1.5 * SEEN_FILTER_ERROR_RATE
+
+def test_seen_set_grows_layers_without_false_negatives():
+    seen = SeenSet()
+    ids = np.arange(0, SEEN_FILTER_CAPACITY * 3 * 7, 7, dtype=np.int64)
+
+    seen.add_many(ids)
+
+    assert len(seen.layers) > 1
+    assert len(seen) == len(ids)
+    assert seen.contains_many(ids).all()
+    # Each layer adds at most its own error rate
+    assert seen.contains_many(PROBE_IDS).mean() <= len(seen.layers) * SEEN_FILTER_ERROR_RATE
+
+def test_seen_set_serialization_round_trip():
+    seen = SeenSet()
+    seen.add_many(range(0, SEEN_FILTER_CAPACITY * 2 * 3, 3))
+
+    restored = SeenSet.from_bytes(seen.to_bytes())
+
+    assert [(layer.num_bits, layer.num_hashes, layer.count) for layer in restored.layers] == [
+        (layer.num_bits, layer.num_hashes, layer.count) for layer in seen.layers
+    ]
+    np.testing.assert_array_equal(restored.contains_many(PROBE_IDS), seen.contains_many(PROBE_IDS))
+
+def test_store_persists_seen_sets_through_seen_filters(session):
+    SeenSetStore().add(session, 1, [2, 3])
+    session.commit()
+
+    row = session.get(SeenFilter, 1)
+    assert row.item_count == 2
+    seen = SeenSetStore().get(session, 1)
+    assert 2 in seen and 3 in seen and 4 not in seen
+
+def test_store_bootstraps_from_match_history(session):
+    session.add(Match(sender_id=1, receiver_id=3))
+    session.commit()
+
+    seen = SeenSetStore().get(session, 1)
+    session.commit()
+
+    assert 3 in seen and 2 not in seen
+    assert session.get(SeenFilter, 1).item_count == 1
+
+def test_store_discard_user_drops_the_filter(session):
+    store = SeenSetStore()
+    store.add(session, 1, [2])
+    session.commit()
+
+    store.discard_user(session, 1)
+    session.commit()
+
+    assert session.get(SeenFilter, 1) is None
+    assert 2 not in store.get(session, 1)